@@ -0,0 +1,42 @@
+"""Local stand-in for the ingest API, shared by the benchmark scripts."""
+
+import contextlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _IngestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.requests += 1
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def ingest_server(latency=0.0):
+    """Run a keep-alive capable HTTP server on localhost; yields its URL.
+
+    ``latency`` (seconds) is injected before every response.
+    """
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _IngestHandler)
+    srv.daemon_threads = True
+    srv.latency = latency
+    srv.requests = 0
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield srv, f"http://127.0.0.1:{srv.server_address[1]}/"
+    finally:
+        srv.shutdown()
+        srv.server_close()
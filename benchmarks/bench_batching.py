@@ -0,0 +1,42 @@
+"""Worker throughput with batching off (one POST per event) and on.
+
+Run with ``python benchmarks/bench_batching.py [N]``. The stand-in ingest
+server adds 1ms of latency per request to mimic a round trip.
+"""
+
+import queue
+import sys
+import time
+
+from _server import ingest_server
+
+from booboo._client import _SENTINEL, BoobooClient
+
+
+def bench(url, n, batch_size):
+    client = BoobooClient("bench", endpoint=url, batch_size=batch_size)
+    client._queue = queue.Queue()  # unbounded so the whole burst is queued
+    for i in range(n):
+        client._queue.put({"message": f"event {i}", "exception_type": "ValueError"})
+    client._queue.put(_SENTINEL)
+
+    start = time.perf_counter()
+    client._ensure_worker()
+    client._workers[0].join()
+    rate = n / (time.perf_counter() - start)
+    client.transport.close()
+    return rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with ingest_server(latency=0.001) as (_, url):
+        off = bench(url, n, batch_size=1)
+        on = bench(url, n, batch_size=50)
+    print(f"batching off           : {off:8.0f} events/s")
+    print(f"batching on (size 50)  : {on:8.0f} events/s")
+    print(f"speedup                : {on / off:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
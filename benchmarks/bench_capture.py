@@ -0,0 +1,82 @@
+"""Capture latency for a 50-frame chained exception.
+
+Compares the old path, which extracted the primary exception's frames twice
+(once for ``stacktrace``, once for chain entry 0), with the client building
+the event up front (``defer_capture=False``) and with the default split-phase
+capture, where the raising thread only takes a snapshot.
+
+Run with ``python benchmarks/bench_capture.py [N]``.
+"""
+
+import sys
+import time
+
+from booboo._client import BoobooClient
+from booboo._stacktrace import extract_exception_chain, extract_frames
+
+DEPTH = 50
+
+
+def _fail(n):
+    payload = {"user_id": n, "items": list(range(20))}  # noqa: F841 - captured local
+    if n == 0:
+        raise KeyError("missing")
+    _fail(n - 1)
+
+
+def _wrap(n):
+    if n == 0:
+        try:
+            _fail(DEPTH)
+        except KeyError as exc:
+            raise ValueError("wrapped") from exc
+    _wrap(n - 1)
+
+
+def make_exception():
+    try:
+        _wrap(DEPTH)
+    except ValueError as exc:
+        return exc
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    exc = make_exception()
+
+    def make_client(defer_capture):
+        client = BoobooClient("bench", endpoint="http://127.0.0.1:9/", defer_capture=defer_capture)
+        # Pretend the worker is running and discard what it would receive, so
+        # only the work done on the raising thread is measured.
+        client._ensure_worker = lambda: True
+        client._queue.put_nowait = lambda event: None
+        return client
+
+    eager = make_client(defer_capture=False)
+    deferred = make_client(defer_capture=True)
+
+    def old_path():
+        extract_frames(exc)
+        extract_exception_chain(exc)
+
+    results = [
+        ("frames extracted twice", timed(old_path, n)),
+        ("eager capture", timed(lambda: eager._capture_and_send(exc), n)),
+        ("deferred capture", timed(lambda: deferred._capture_and_send(exc), n)),
+    ]
+    for label, (p50, p99) in results:
+        print(f"{label:24s}: p50 {p50 * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
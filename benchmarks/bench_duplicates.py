@@ -0,0 +1,47 @@
+"""Per-duplicate capture cost for an error that repeats in a hot loop.
+
+Uses the 50-frame chained exception from ``bench_capture``. Compares a full
+capture per repeat with aggregation (snapshot + fingerprint per repeat) and
+with aggregation plus the fingerprint cache (traceback walk only).
+
+Run with ``python benchmarks/bench_duplicates.py [N]``.
+"""
+
+import sys
+import time
+
+from bench_capture import make_exception
+
+from booboo._client import BoobooClient
+
+
+def make_client(**kwargs):
+    client = BoobooClient("bench", endpoint="http://127.0.0.1:9/", **kwargs)
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = lambda event: None
+    return client
+
+
+def per_call(client, exc, n):
+    client._capture_and_send(exc)  # first occurrence opens the window
+    start = time.perf_counter()
+    for _ in range(n):
+        client._capture_and_send(exc)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    exc = make_exception()
+    cases = [
+        ("full capture", make_client(defer_capture=False)),
+        ("aggregation, no cache", make_client(aggregate_window=60, fingerprint_cache_size=0)),
+        ("aggregation + cache", make_client(aggregate_window=60)),
+    ]
+    for label, client in cases:
+        cost = per_call(client, exc, n)
+        print(f"{label:22s}: {cost * 1e6:9.1f} us per duplicate")
+
+
+if __name__ == "__main__":
+    main()
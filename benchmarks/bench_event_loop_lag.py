@@ -0,0 +1,100 @@
+"""Event-loop lag while an ASGI app raises a burst of errors.
+
+A ticker coroutine sleeps 1ms at a time and records how late it wakes up
+while concurrent requests fail. "before" captures the way the middleware
+used to (request extraction and full event build on the loop); "after" uses
+the ``_capture_asgi`` path, which renders locals for the innermost frames
+only.
+
+Run with ``python benchmarks/bench_event_loop_lag.py [ERRORS]``.
+"""
+
+import asyncio
+import sys
+import time
+
+from booboo._client import BoobooClient
+from booboo._middleware import _extract_asgi_request
+from booboo._transport import Transport
+
+SCOPE = {
+    "type": "http",
+    "method": "POST",
+    "path": "/orders",
+    "query_string": b"page=2",
+    "headers": [(b"content-type", b"application/json")] * 20,
+    "server": ("127.0.0.1", 8000),
+    "client": ("127.0.0.1", 50000),
+}
+
+
+class NullTransport(Transport):
+    def send(self, endpoint, body, headers):
+        return None
+
+
+ROWS = [{"id": i, "name": f"row {i}"} for i in range(200)]
+
+
+def _fail(n):
+    rows = ROWS  # noqa: F841 - captured local
+    if n == 0:
+        raise ValueError("bad order")
+    _fail(n - 1)
+
+
+async def failing_request(capture):
+    await asyncio.sleep(0)
+    try:
+        _fail(30)
+    except ValueError as exc:
+        capture(exc)
+
+
+async def ticker(stop, lags):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def run(capture, errors):
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(stop, lags))
+    await asyncio.sleep(0.01)
+    for _ in range(errors // 50):
+        await asyncio.gather(*(failing_request(capture) for _ in range(50)))
+        await asyncio.sleep(0.002)
+    stop.set()
+    await tick
+    lags.sort()
+    return lags[len(lags) // 2], lags[int(len(lags) * 0.99) - 1], lags[-1]
+
+
+def main():
+    errors = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    before = BoobooClient("bench", transport=NullTransport(), defer_capture=False)
+
+    def capture_before(exc):
+        request_data, user_data = _extract_asgi_request(SCOPE)
+        before._capture_and_send(exc, request_data=request_data, user_data=user_data)
+
+    after = BoobooClient("bench", transport=NullTransport())
+
+    for label, capture in (
+        ("before", capture_before),
+        ("after", lambda e: after._capture_asgi(e, SCOPE)),
+    ):
+        p50, p99, worst = asyncio.run(run(capture, errors))
+        print(
+            f"{label:6s}: loop lag p50 {p50 * 1000:6.2f} ms   "
+            f"p99 {p99 * 1000:6.2f} ms   max {worst * 1000:6.2f} ms"
+        )
+    before._flush()
+    after._flush()
+
+
+if __name__ == "__main__":
+    main()
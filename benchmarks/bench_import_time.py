@@ -0,0 +1,52 @@
+"""Time to ``import booboo`` and run ``booboo.init()``, from ``python -X importtime``.
+
+Runs a fresh interpreter a few times and reports the median cumulative
+import time of ``booboo`` and of any framework package that ended up
+imported. Integrations only activate once the app imports its framework,
+so none should be listed for a plain script.
+
+Run with ``python benchmarks/bench_import_time.py [N]``.
+"""
+
+import statistics
+import subprocess
+import sys
+
+FRAMEWORKS = ("django", "flask", "fastapi", "channels", "starlette", "werkzeug")
+
+SCRIPT = "import booboo; booboo.init('bench', endpoint='http://127.0.0.1:9/')"
+
+
+def import_times():
+    """Cumulative microseconds per top-level module for one interpreter run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    runs = [import_times() for _ in range(n)]
+    print(f"import booboo          : {statistics.median(r['booboo'] for r in runs) / 1000:7.1f} ms")
+    imported = sorted({name for r in runs for name in r if name in FRAMEWORKS})
+    for name in imported:
+        median = statistics.median(r.get(name, 0) for r in runs)
+        print(f"{name:23s}: {median / 1000:7.1f} ms")
+    if not imported:
+        print("frameworks imported    : none")
+
+
+if __name__ == "__main__":
+    main()
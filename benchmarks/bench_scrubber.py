@@ -0,0 +1,113 @@
+"""Scrubbing cost for realistic request headers and frame locals.
+
+Compares the previous functions, which ran the sensitive-key regex on every
+name of every event and decoded all ASGI headers before filtering them, with
+``Scrubber``, which caches a verdict per name, never decodes filtered header
+values, and redacts nested dict keys while the repr is built. Full frame
+scrubbing also scans values for card numbers and bearer tokens, which the old
+functions did not do at all, so it is compared for overhead rather than speed.
+
+Run with ``python benchmarks/bench_scrubber.py [N]``.
+"""
+
+import re
+import sys
+
+from bench_capture import timed
+
+from booboo._repr import BoundedRepr, bounded_repr
+from booboo._scrubber import SENSITIVE_HEADERS, SENSITIVE_PATTERN, Scrubber
+
+RAW_HEADERS = [
+    (b"host", b"api.example.com"),
+    (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"accept-language", b"en-US,en;q=0.9"),
+    (b"authorization", b"Bearer eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxMjM0In0.sig"),
+    (b"cookie", b"sessionid=abc123; csrftoken=def456"),
+    (b"x-forwarded-for", b"10.0.0.1, 10.0.0.2"),
+    (b"x-request-id", b"5f0c3c0e-8d1e-4f0a-9b7a-6d2f1c9e8a7b"),
+    (b"content-type", b"application/json"),
+]
+
+LOCALS = {
+    "self": object(),
+    "request": {"path": "/orders/42", "method": "POST", "headers": {"accept": "*/*"}},
+    "order_id": 42,
+    "items": [{"sku": f"SKU-{i}", "qty": i} for i in range(8)],
+    "api_token": "sk_live_abcdef",
+    "settings": {"db_password": "hunter2", "host": "db", "port": 5432},
+    "total": 129.99,
+    "customer": "Ada Lovelace",
+    "note": "leave at the door",
+    "retries": 3,
+}
+
+
+def old_asgi_headers(raw_headers):
+    headers = {}
+    for key, value in raw_headers:
+        try:
+            headers[key.decode("latin-1")] = value.decode("latin-1")
+        except Exception:
+            continue
+    result = {}
+    for key, value in headers.items():
+        lower = key.lower()
+        if lower in SENSITIVE_HEADERS or SENSITIVE_PATTERN.search(lower):
+            result[key] = "[filtered]"
+        else:
+            result[key] = str(value)
+    return result
+
+
+def old_scrub_vars(local_vars, repr_func=bounded_repr):
+    result = {}
+    for key, value in local_vars.items():
+        if len(result) >= 50:
+            break
+        if key.startswith("__") and key.endswith("__"):
+            continue
+        if SENSITIVE_PATTERN.search(key):
+            result[key] = "[filtered]"
+            continue
+        try:
+            r = repr_func(value)
+        except Exception:
+            r = f"<{type(value).__name__}>"
+        result[key] = r
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    scrubber = Scrubber()
+    repr_func = BoundedRepr(is_sensitive=scrubber.is_sensitive_key).repr
+    # Frames repeat the same variable names; so do events
+    frames = [LOCALS] * 50
+
+    names = list(LOCALS) * 50
+
+    results = [
+        ("old key checks", timed(lambda: [SENSITIVE_PATTERN.search(k) for k in names], n)),
+        ("cached key verdicts", timed(lambda: [scrubber.is_sensitive_key(k) for k in names], n)),
+        ("old ASGI headers", timed(lambda: old_asgi_headers(RAW_HEADERS), n)),
+        ("Scrubber raw headers", timed(lambda: scrubber.scrub_raw_headers(RAW_HEADERS), n)),
+        ("old 50 frames of vars", timed(lambda: [old_scrub_vars(f) for f in frames], n // 10)),
+        (
+            "Scrubber 50 frames",
+            timed(lambda: [scrubber.scrub_vars(f, repr_func) for f in frames], n // 10),
+        ),
+    ]
+    for label, (p50, p99) in results:
+        print(f"{label:24s}: p50 {p50 * 1e6:8.1f} us   p99 {p99 * 1e6:8.1f} us")
+
+    old = old_scrub_vars(LOCALS)["settings"]
+    new = scrubber.scrub_vars(LOCALS, repr_func)["settings"]
+    print(f"\nnested secret, old: {old}\nnested secret, new: {new}")
+    assert re.search("hunter2", old) and not re.search("hunter2", new)
+
+
+if __name__ == "__main__":
+    main()
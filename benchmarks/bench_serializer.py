@@ -0,0 +1,41 @@
+"""Serialization time for a realistic 50-frame chained event.
+
+Builds the event the worker would send for ``bench_capture.make_exception()``
+(two chained exceptions, 50+ frames each, with source context and locals)
+and times each available JSON backend on it. ujson and orjson are skipped
+when not installed.
+
+Run with ``python benchmarks/bench_serializer.py [N]``.
+"""
+
+import functools
+import sys
+
+from bench_capture import make_exception, timed
+
+from booboo._client import BoobooClient
+from booboo._serializer import resolve_serializer
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    client = BoobooClient("bench", endpoint="http://127.0.0.1:9/")
+    payloads = []
+    client._do_send = payloads.append
+    client._ensure_worker = lambda: False
+    client._capture_and_send(make_exception())
+    payload = payloads[0]
+
+    for name in ("json", "ujson", "orjson"):
+        try:
+            dumps = resolve_serializer(name)
+        except ImportError:
+            print(f"{name:8s}: not installed")
+            continue
+        size = len(dumps(payload))
+        p50, p99 = timed(functools.partial(dumps, payload), n)
+        print(f"{name:8s}: p50 {p50 * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms   {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
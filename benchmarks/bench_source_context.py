@@ -0,0 +1,56 @@
+"""Rendering cost of repeated captures from a deep stack.
+
+Renders the same 50-frame chained exception over and over, as a service
+hitting one bug would. Compares the old per-frame ``linecache`` slicing and
+stripping with the context cache, cold (cleared before each render) and warm.
+
+Run with ``python benchmarks/bench_source_context.py [N]``.
+"""
+
+import linecache
+import sys
+
+from bench_capture import make_exception, timed
+
+from booboo import _stacktrace
+from booboo._stacktrace import render_exception_chain, snapshot_exception_chain
+
+
+def old_context(snapshot):
+    """Source context as render_frames built it before the cache."""
+    for _, _, frames, _ in snapshot:
+        for filename, _, lineno, _ in frames:
+            linecache.getline(filename, lineno).rstrip("\n")
+            all_lines = linecache.getlines(filename)
+            start = max(0, lineno - 1 - _stacktrace.CONTEXT_LINES)
+            end = min(len(all_lines), lineno + _stacktrace.CONTEXT_LINES)
+            [line.rstrip("\n") for line in all_lines[start : lineno - 1]]
+            [line.rstrip("\n") for line in all_lines[lineno:end]]
+
+
+def new_context(snapshot):
+    for _, _, frames, _ in snapshot:
+        for filename, _, lineno, _ in frames:
+            _stacktrace._context_cache.get(filename, lineno)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    snapshot = snapshot_exception_chain(make_exception())
+
+    def cold():
+        _stacktrace._context_cache.clear()
+        new_context(snapshot)
+
+    results = [
+        ("old context", timed(lambda: old_context(snapshot), n)),
+        ("cache cold", timed(cold, n)),
+        ("cache warm", timed(lambda: new_context(snapshot), n)),
+        ("full render, warm", timed(lambda: render_exception_chain(snapshot), n)),
+    ]
+    for label, (p50, p99) in results:
+        print(f"{label:24s}: p50 {p50 * 1000:7.3f} ms   p99 {p99 * 1000:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Building and encoding a message event, with and without the cached context.
+
+"rebuilt" recreates the SDK/runtime context, tags and environment for
+every event and encodes them with the rest, as the client used to;
+"spliced" builds the event as the client does now and encodes it with
+``_serialize``, which splices in those parts, encoded once by the client.
+
+Run with ``python benchmarks/bench_static_context.py [N]``.
+"""
+
+import platform
+import sys
+
+from bench_capture import timed
+
+import booboo
+from booboo._client import BoobooClient
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for serializer in ("json", "orjson"):
+        try:
+            client = BoobooClient("bench", endpoint="http://127.0.0.1:9/", serializer=serializer)
+        except ImportError:
+            print(f"{serializer:8s}: not installed")
+            continue
+        client.set_user({"id": "42", "email": "user@example.com"})
+
+        def rebuilt(client=client):
+            payload = {
+                "message": "deployment complete",
+                "exception_type": "",
+                "level": "info",
+                "stacktrace": [],
+                "exceptions": [],
+                "context": {
+                    "sdk": {"name": "booboo-sdk", "version": booboo.__version__},
+                    "runtime": {"name": "Python", "version": platform.python_version()},
+                    "user": dict(client._user),
+                },
+                "tags": {"runtime": "python"},
+                "environment": client.environment,
+            }
+            return client._dumps(payload)
+
+        def spliced(client=client):
+            payload = {
+                "context": {"user": dict(client._user)},
+                "message": "deployment complete",
+                "exception_type": "",
+                "level": "info",
+                "stacktrace": [],
+                "exceptions": [],
+            }
+            return client._serialize(payload)
+
+        for name, func in (("rebuilt", rebuilt), ("spliced", spliced)):
+            p50, p99 = timed(func, n)
+            print(f"{serializer:8s} {name}: p50 {p50 * 1e6:6.2f} us   p99 {p99 * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
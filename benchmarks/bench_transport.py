@@ -0,0 +1,47 @@
+"""Events/sec through a per-event ``requests.post`` vs the pooled transport.
+
+Run with ``python benchmarks/bench_transport.py [N]``.
+"""
+
+import json
+import sys
+import time
+
+import requests
+from _server import ingest_server
+
+from booboo._transport import RequestsTransport
+
+HEADERS = {"X-Booboo-DSN": "bench", "Content-Type": "application/json"}
+BODY = json.dumps({"message": "boom", "exception_type": "ValueError"}).encode("utf-8")
+
+
+def bench_requests_post(url, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        requests.post(url, data=BODY, headers=HEADERS, timeout=5)
+    return n / (time.perf_counter() - start)
+
+
+def bench_pooled(url, n):
+    transport = RequestsTransport()
+    start = time.perf_counter()
+    for _ in range(n):
+        transport.send(url, BODY, HEADERS)
+    rate = n / (time.perf_counter() - start)
+    transport.close()
+    return rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with ingest_server() as (_, url):
+        post_rate = bench_requests_post(url, n)
+        pooled_rate = bench_pooled(url, n)
+    print(f"requests.post per event : {post_rate:8.0f} events/s")
+    print(f"pooled RequestsTransport: {pooled_rate:8.0f} events/s")
+    print(f"speedup                 : {pooled_rate / post_rate:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
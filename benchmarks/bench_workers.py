@@ -0,0 +1,44 @@
+"""Worker throughput with one sender thread and with a pool.
+
+Run with ``python benchmarks/bench_workers.py [N]``. The stand-in ingest
+server adds 20ms of latency per request, so a single worker is bound by
+the round trip.
+"""
+
+import queue
+import sys
+import time
+
+from _server import ingest_server
+
+from booboo._client import _SENTINEL, BoobooClient
+
+
+def bench(url, n, workers):
+    client = BoobooClient("bench", endpoint=url, workers=workers)
+    client._queue = queue.Queue()  # unbounded so the whole burst is queued
+    for i in range(n):
+        client._queue.put({"message": f"event {i}", "exception_type": "ValueError"})
+    for _ in range(workers):
+        client._queue.put(_SENTINEL)
+
+    start = time.perf_counter()
+    client._ensure_worker()
+    for worker in client._workers:
+        worker.join()
+    rate = n / (time.perf_counter() - start)
+    client.transport.close()
+    return rate
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with ingest_server(latency=0.02) as (_, url):
+        rates = {workers: bench(url, n, workers) for workers in (1, 4, 8)}
+    for workers, rate in rates.items():
+        print(f"{f'workers={workers}':<23}: {rate:8.0f} events/s")
+    print(f"speedup (8 vs 1)       : {rates[8] / rates[1]:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
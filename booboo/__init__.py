@@ -1,11 +1,84 @@
-from ._client import BoobooClient
+from ._client import (
+    BATCH_TIMEOUT,
+    FINGERPRINT_CACHE_SIZE,
+    MAX_PAYLOAD_SIZE,
+    MAX_RETRIES,
+    OVERFLOW_TIMEOUT,
+    QUEUE_SIZE,
+    RETRY_BACKOFF,
+    SHUTDOWN_TIMEOUT,
+    BoobooClient,
+)
+from ._repr import MAX_DEPTH, MAX_ITEMS, MAX_LENGTH
+from ._spool import MAX_SPOOL_SIZE
+from ._transport import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from ._transport import RequestsTransport as RequestsTransport
+from ._transport import Transport as Transport
 
 __version__ = "0.13.0"
 
 _client = None
 
 
-def init(dsn, app=None, environment="", ignore_errors=None, endpoint=None):
+def __getattr__(name):
+    # AsyncTransport pulls in asyncio; only import it for callers that ask
+    if name == "AsyncTransport":
+        from ._async_transport import AsyncTransport
+
+        return AsyncTransport
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def init(
+    dsn,
+    app=None,
+    environment="",
+    ignore_errors=None,
+    endpoint=None,
+    transport=None,
+    pool_size=DEFAULT_POOL_SIZE,
+    timeout=DEFAULT_TIMEOUT,
+    batch_size=1,
+    batch_timeout=BATCH_TIMEOUT,
+    compression=None,
+    max_payload_size=MAX_PAYLOAD_SIZE,
+    compact_payload=False,
+    max_repr_length=MAX_LENGTH,
+    max_repr_depth=MAX_DEPTH,
+    max_repr_items=MAX_ITEMS,
+    defer_capture=True,
+    queue_size=QUEUE_SIZE,
+    overflow_policy="drop_newest",
+    overflow_timeout=OVERFLOW_TIMEOUT,
+    aggregate_window=0,
+    fingerprint_cache_size=FINGERPRINT_CACHE_SIZE,
+    fingerprint_cache_ttl=None,
+    sample_rate=1.0,
+    rate_limit=None,
+    rate_limit_burst=None,
+    rate_limit_by="type",
+    max_retries=MAX_RETRIES,
+    retry_backoff=RETRY_BACKOFF,
+    spool_dir=None,
+    spool_max_size=MAX_SPOOL_SIZE,
+    library_context=True,
+    in_app_include=None,
+    in_app_exclude=None,
+    in_app_frames="full",
+    library_frames="full",
+    max_frames_with_locals=None,
+    max_frames=None,
+    sensitive_keys=None,
+    sensitive_headers=None,
+    sensitive_values=None,
+    serializer="auto",
+    async_mode=False,
+    async_transport=None,
+    workers=1,
+    shutdown_timeout=SHUTDOWN_TIMEOUT,
+    handle_sigterm=False,
+    integrations=None,
+):
     """Initialize booboo error tracking.
 
     ``dsn`` accepts either a bare token (``"abc123..."``) or a URL-style DSN
@@ -13,14 +86,116 @@ def init(dsn, app=None, environment="", ignore_errors=None, endpoint=None):
     URL DSN, the ingest endpoint is derived from the URL automatically; pass
     ``endpoint=`` only to override.
 
-    Always hooks sys.excepthook. Auto-detects Django, Flask, and FastAPI.
-    Pass app= to explicitly register with a specific app instance.
+    Always hooks sys.excepthook. Auto-detects Django, Flask, FastAPI and Channels when
+    the app imports them (nothing is imported just to check); pass integrations= (e.g.
+    ["flask"], or [] for none) to choose. Pass app= to explicitly register with a
+    specific app instance.
     Pass environment= to tag all events with an environment (e.g. "production").
     Pass ignore_errors= to suppress specific exception types (uses isinstance matching).
+    Pass pool_size= and timeout= to tune the keep-alive HTTP connection pool, or
+    transport= to supply your own ``booboo.Transport`` instance.
+    Pass batch_size= > 1 to let the background worker send up to that many queued
+    events in one request, waiting at most batch_timeout= seconds to fill a batch.
+    Pass compression="gzip" (or "deflate") to compress request bodies; events whose
+    encoded size exceeds max_payload_size= bytes are trimmed to fit.
+    Pass compact_payload=True to send the top-level stacktrace as a reference to
+    exception chain entry 0 ("stacktrace_ref": 0) instead of a duplicate copy.
+    Local variable reprs are bounded by max_repr_length= characters, max_repr_depth=
+    levels of nesting and max_repr_items= elements per container.
+    By default the thread that raised only snapshots frame positions and renders
+    locals to scrubbed reprs; source context and the payload are built on the
+    background worker. Pass defer_capture=False to build everything up front.
+    Pass queue_size= to size the event buffer and overflow_policy= to choose what
+    happens when it is full: "drop_newest" (default), "drop_oldest", or "block"
+    (wait up to overflow_timeout= seconds, then drop). See stats() for counters.
+    Pass aggregate_window= (seconds) to fold repeats of the same error into a single
+    follow-up event carrying an "occurrences" count. While aggregating, repeats are
+    recognised from an LRU of recent tracebacks (fingerprint_cache_size= entries, kept
+    for fingerprint_cache_ttl= seconds, default aggregate_window) before any capture
+    work is done.
+    Pass sample_rate= (0.0-1.0) to send only a random share of error events, and
+    rate_limit= (events/second, bursts up to rate_limit_burst=) to cap each exception
+    type, or each call site with rate_limit_by="fingerprint". Both are checked before
+    any capture work; dropped events are counted in stats().
+    Sends that fail with 429/502/503/504 or a network error are retried up to
+    max_retries= times with exponential backoff starting at retry_backoff= seconds
+    (or the server's Retry-After); while backed off, new events are dropped unsent.
+    Pass spool_dir= to keep events that could not be delivered (ingest down or
+    backing us off, queue full, or still queued at exit) on disk, up to
+    spool_max_size= bytes, and resend them once ingest is reachable again.
+    Pass library_context=False to skip source lines for frames outside your app.
+    Frames are in-app unless they live in site-packages or the standard library;
+    in_app_include= and in_app_exclude= take lists of path prefixes that override this.
+    in_app_frames= and library_frames= set how much each kind of frame captures:
+    "full" (source and locals), "no_vars" (source only) or "bare" (location only).
+    max_frames_with_locals= caps how many frames keep locals (innermost first), and
+    max_frames= keeps only the first and last frames of deeper stacks.
+    Locals and dict keys containing password, token, secret etc. are filtered, as are
+    sensitive headers and card numbers or bearer tokens inside values; extend these
+    with sensitive_keys= (substrings), sensitive_headers= (names) and
+    sensitive_values= (regular expressions).
+    Events are encoded with orjson or ujson when installed (pip install booboo-sdk[fast]),
+    else the standard json module; pass serializer="json" (or "orjson", "ujson", or a
+    callable returning bytes) to choose.
+    Pass async_mode=True to send events captured inside a running asyncio loop from a
+    task on that loop, over pooled non-blocking connections (async_transport= takes a
+    ``booboo.AsyncTransport`` to replace the default). BoobooASGIMiddleware drains it
+    on lifespan shutdown.
+    Pass workers= > 1 to send from several background threads sharing the queue, so
+    one slow ingest response does not hold up the events behind it.
+    At exit, queued events are sent for up to shutdown_timeout= seconds (see flush() and
+    close() to do this yourself); pass handle_sigterm=True to do the same on SIGTERM
+    before handing the signal to the previous handler.
     """
     global _client
     _client = BoobooClient(
-        dsn, environment=environment, ignore_errors=ignore_errors, endpoint=endpoint
+        dsn,
+        environment=environment,
+        ignore_errors=ignore_errors,
+        endpoint=endpoint,
+        transport=transport,
+        pool_size=pool_size,
+        timeout=timeout,
+        batch_size=batch_size,
+        batch_timeout=batch_timeout,
+        compression=compression,
+        max_payload_size=max_payload_size,
+        compact_payload=compact_payload,
+        max_repr_length=max_repr_length,
+        max_repr_depth=max_repr_depth,
+        max_repr_items=max_repr_items,
+        defer_capture=defer_capture,
+        queue_size=queue_size,
+        overflow_policy=overflow_policy,
+        overflow_timeout=overflow_timeout,
+        aggregate_window=aggregate_window,
+        fingerprint_cache_size=fingerprint_cache_size,
+        fingerprint_cache_ttl=fingerprint_cache_ttl,
+        sample_rate=sample_rate,
+        rate_limit=rate_limit,
+        rate_limit_burst=rate_limit_burst,
+        rate_limit_by=rate_limit_by,
+        max_retries=max_retries,
+        retry_backoff=retry_backoff,
+        spool_dir=spool_dir,
+        spool_max_size=spool_max_size,
+        library_context=library_context,
+        in_app_include=in_app_include,
+        in_app_exclude=in_app_exclude,
+        in_app_frames=in_app_frames,
+        library_frames=library_frames,
+        max_frames_with_locals=max_frames_with_locals,
+        max_frames=max_frames,
+        sensitive_keys=sensitive_keys,
+        sensitive_headers=sensitive_headers,
+        sensitive_values=sensitive_values,
+        serializer=serializer,
+        async_mode=async_mode,
+        async_transport=async_transport,
+        workers=workers,
+        shutdown_timeout=shutdown_timeout,
+        handle_sigterm=handle_sigterm,
+        integrations=integrations,
     )
     _client.install(app)
 
@@ -41,3 +216,24 @@ def set_user(user_data):
     """Set user context (id, email, username, ip_address, etc.) for subsequent events."""
     if _client:
         _client.set_user(user_data)
+
+
+def stats():
+    """Return event delivery counters (enqueued, sent, dropped_*, send_failed)."""
+    if _client:
+        return _client.stats()
+    return {}
+
+
+def flush(timeout=None):
+    """Wait up to timeout seconds for queued events to be sent. Returns how many are left."""
+    if _client:
+        return _client.flush(timeout)
+    return 0
+
+
+def close(timeout=None):
+    """Send queued events within timeout seconds and stop the workers. Returns how many are left."""
+    if _client:
+        return _client.close(timeout)
+    return 0
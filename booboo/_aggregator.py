@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from ._stacktrace import _is_in_app
+
+
+def fingerprint(chain_snapshot, is_in_app=_is_in_app):
+    """Identify an error by its exception type and in-app call sites.
+
+    ``chain_snapshot`` is the output of snapshot_exception_chain(). Only the
+    raised exception (chain entry 0) is used: its type name plus the
+    ``(filename, function, lineno)`` of each in-app frame, or of every frame
+    if none are in-app. Locals and messages are ignored, so the same bug
+    hit with different data gets the same fingerprint.
+    """
+    if not chain_snapshot:
+        return ""
+    type_name, _, frames, _ = chain_snapshot[0]
+    sites = [frame[:3] for frame in frames if is_in_app(frame[0])] or [
+        frame[:3] for frame in frames
+    ]
+    parts = [type_name] + [
+        f"{filename}:{function}:{lineno}" for filename, function, lineno in sites
+    ]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def fast_key(exc):
+    """Cheap stand-in for fingerprint(), read straight off the traceback.
+
+    Walks only ``tb_frame.f_code`` and ``tb_lineno`` - no snapshot of
+    locals, no filename classification - so it can be checked before any
+    capture work is done.
+    """
+    sites = []
+    tb = exc.__traceback__
+    while tb is not None:
+        sites.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return (type(exc), tuple(sites))
+
+
+class FingerprintCache:
+    """Bounded LRU mapping fast_key() results to fingerprints, with a TTL.
+
+    Entries are indexed by the key's hash, which is computed once per call;
+    hashing a tuple of code objects is the bulk of a lookup's cost.
+    """
+
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # hash(key) -> (key, fingerprint, expires_at)
+
+    def get(self, key):
+        h = hash(key)
+        with self._lock:
+            entry = self._entries.get(h)
+            if entry is None or entry[0] != key:
+                return None
+            if time.monotonic() >= entry[2]:
+                del self._entries[h]
+                return None
+            self._entries.move_to_end(h)
+            return entry[1]
+
+    def put(self, key, fp):
+        h = hash(key)
+        with self._lock:
+            self._entries[h] = (key, fp, time.monotonic() + self.ttl)
+            self._entries.move_to_end(h)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+class Aggregator:
+    """Fold repeats of the same error within a time window into one event.
+
+    The first occurrence of a fingerprint opens a window of ``window``
+    seconds and is sent as usual. Repeats inside the window only bump a
+    counter; once the window closes, one summary event (the most recent
+    captured occurrence) is released with ``"occurrences"`` set to the
+    number of repeats it stands for.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows = {}  # fingerprint -> [expires_at, repeats, latest_event]
+        self._ready = []
+
+    def record(self, fp, event):
+        """Return True if ``event`` should be sent now, False if it was folded."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._windows.get(fp)
+            if entry is not None and now < entry[0]:
+                entry[1] += 1
+                entry[2] = event
+                return False
+            if entry is not None and entry[1]:
+                self._ready.append((entry[2], entry[1]))
+            self._windows[fp] = [now + self.window, 0, event]
+            return True
+
+    def bump(self, fp):
+        """Count a repeat without a new event. Returns False if no window is open.
+
+        Used when the repeat was recognised before capturing it; the summary
+        then reuses the last event recorded for the window.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._windows.get(fp)
+            if entry is None or now >= entry[0]:
+                return False
+            entry[1] += 1
+            return True
+
+    def pop_due(self, flush_all=False):
+        """Return ``(event, repeats)`` for every closed window with repeats.
+
+        With ``flush_all`` every open window is closed, e.g. at shutdown.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due, self._ready = self._ready, []
+            for fp, (expires_at, repeats, event) in list(self._windows.items()):
+                if flush_all or now >= expires_at:
+                    del self._windows[fp]
+                    if repeats:
+                        due.append((event, repeats))
+            return due
@@ -0,0 +1,145 @@
+import asyncio
+import ssl
+from urllib.parse import urlsplit
+
+from ._transport import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+
+
+class AsyncTransport:
+    """Base class for transports used by the client's asyncio sender.
+
+    The asyncio counterpart of ``Transport``: receives an already-encoded
+    request body and delivers it without blocking the event loop. Pass an
+    instance as ``async_transport=`` to ``booboo.init()`` to replace the
+    default.
+    """
+
+    async def send(self, endpoint, body, headers):
+        """POST ``body`` (bytes) to ``endpoint``. Returns the response object."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release the running loop's pooled connections.
+
+        Called once the sender of that loop has drained.
+        """
+
+
+class AsyncResponse:
+    """Status and headers of an HTTP response. Header names are lower-cased."""
+
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class StreamsTransport(AsyncTransport):
+    """HTTP/1.1 over ``asyncio`` streams, keeping connections alive.
+
+    Up to ``pool_size`` idle connections per host and event loop are kept
+    for reuse. A request on a reused connection that the server has
+    meanwhile closed is retried once on a fresh one.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = {}  # (loop, scheme, host, port) -> [(reader, writer), ...]
+        self._ssl = None
+
+    async def send(self, endpoint, body, headers):
+        url = urlsplit(endpoint)
+        https = url.scheme == "https"
+        key = (
+            asyncio.get_running_loop(),
+            url.scheme,
+            url.hostname,
+            url.port or (443 if https else 80),
+        )
+        path = url.path or "/"
+        if url.query:
+            path += "?" + url.query
+        request = self._request(url.netloc, path, body, headers)
+
+        idle = self._idle.get(key) or []
+        while idle:
+            conn = idle.pop()
+            try:
+                return await self._roundtrip(key, conn, request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                continue  # stale keep-alive connection
+        conn = await asyncio.wait_for(self._connect(key), self.timeout)
+        return await self._roundtrip(key, conn, request)
+
+    async def _connect(self, key):
+        _, scheme, host, port = key
+        if scheme == "https" and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == "https" else None
+        )
+
+    @staticmethod
+    def _request(host, path, body, headers):
+        lines = [f"POST {path} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def _roundtrip(self, key, conn, request):
+        reader, writer = conn
+        try:
+            writer.write(request)
+            response, keep_alive = await asyncio.wait_for(self._read_response(reader), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive and len(self._idle.setdefault(key, [])) < self.pool_size:
+            self._idle[key].append(conn)
+        else:
+            writer.close()
+        return response
+
+    @staticmethod
+    async def _read_response(reader):
+        while True:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed before response")
+            version, status = status_line.split(None, 2)[:2]
+            status = int(status)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if not 100 <= status < 200:
+                break
+            # An interim response (e.g. 100 Continue) has no body; the final one follows
+
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if status in (204, 304):
+            pass  # never has a body, whatever the headers say
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        else:
+            await reader.read()
+            keep_alive = False
+        return AsyncResponse(status, headers), keep_alive
+
+    async def close(self):
+        """Close the running loop's idle connections, and forget closed loops'."""
+        loop = asyncio.get_running_loop()
+        for key in list(self._idle):
+            if key[0] is loop:
+                for _, writer in self._idle.pop(key):
+                    writer.close()
+            elif key[0].is_closed():
+                del self._idle[key]
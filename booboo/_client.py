@@ -1,19 +1,135 @@
 import atexit
 import contextlib
-import json
+import email.utils
+import functools
+import gzip
+import os
 import platform
 import queue
+import random
+import signal
 import sys
 import threading
+import time
+import weakref
+import zlib
 from urllib.parse import urlparse
 
-import requests
-
-from ._scrubber import scrub_headers
-from ._stacktrace import extract_exception_chain, extract_frames
+from ._aggregator import Aggregator, FingerprintCache, fast_key, fingerprint
+from ._inapp import InAppResolver
+from ._integrations import INTEGRATIONS, resolve_integrations, watcher
+from ._ratelimit import RateLimiter
+from ._repr import MAX_DEPTH, MAX_ITEMS, MAX_LENGTH, BoundedRepr
+from ._scrubber import Scrubber
+from ._serializer import resolve_serializer
+from ._spool import MAX_SPOOL_SIZE, Spool
+from ._stacktrace import (
+    FramePolicy,
+    _is_in_app,
+    render_exception_chain,
+    snapshot_exception_chain,
+)
+from ._transport import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, RequestsTransport
+from ._trimmer import trim_payload
 
 _SENTINEL = object()
 DEFAULT_ENDPOINT = "https://ingest.booboo.dev/"
+MAX_PAYLOAD_SIZE = 102_400
+BATCH_TIMEOUT = 0.05
+QUEUE_SIZE = 100
+OVERFLOW_TIMEOUT = 1.0
+FINGERPRINT_CACHE_SIZE = 1024
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+SHUTDOWN_TIMEOUT = 5.0
+
+# Frames per exception whose locals are rendered when capturing on an event
+# loop (innermost first). Rendering runs on the loop, so it is kept to the
+# frames closest to the error; max_frames_with_locals= can lower it further.
+LOOP_FRAMES_WITH_LOCALS = 3
+
+# Responses that mean the ingest endpoint does not understand batched
+# (newline-delimited) bodies. Seeing one switches the client back to
+# per-event requests. A 400 only does if every event of the rejected
+# batch is then accepted on its own, and a 413 splits the batch instead.
+_BATCH_UNSUPPORTED_STATUSES = frozenset({404, 405, 415})
+
+# Largest batched request body, in bytes before compression. Events are
+# split across several requests to stay under it (or max_payload_size, if
+# that is larger).
+MAX_BATCH_BYTES = 1024 * 1024
+
+# Responses that mean the ingest endpoint is overloaded or briefly
+# unavailable. The worker retries these, and network errors, with backoff.
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_BACKOFF = 60
+
+_OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+_STAT_COUNTERS = (
+    "enqueued",
+    "sent",
+    "dropped_queue_full",
+    "dropped_oversize",
+    "send_failed",
+    "aggregated",
+    "sampled_out",
+    "rate_limited",
+    "dropped_backoff",
+    "spooled",
+    "dropped_spool_full",
+)
+
+# How often an idle worker retries sending spooled events, in seconds.
+SPOOL_RETRY_INTERVAL = 30
+
+# compression= values accepted by the client, mapped to their Content-Encoding.
+_COMPRESSION = {None: None, "gzip": "gzip", "deflate": "deflate", "zlib": "deflate"}
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _json_native(value):
+    """``value`` with every leaf that is not JSON-native (UUIDs, lazy strings, ...) as a string."""
+    if isinstance(value, _JSON_SCALARS):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _json_native(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_native(item) for item in value]
+    return str(value)
+
+
+def _build(event):
+    """Return the payload for a queued event (see BoobooClient._enqueue)."""
+    return event() if callable(event) else event
+
+
+def _retry_after(resp):
+    """Seconds to wait according to a response's Retry-After header, or None."""
+    headers = getattr(resp, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _members(data):
+    """The members of an encoded JSON object, without the surrounding braces."""
+    return data.strip()[1:-1].strip()
+
+
+def _accepted(resp):
+    # Transports that return no status (or no response) are trusted
+    return getattr(resp, "status_code", None) is None or resp.status_code < 400
 
 
 def _parse_dsn(dsn):
@@ -34,22 +150,195 @@ def _parse_dsn(dsn):
 
 
 class BoobooClient:
-    def __init__(self, dsn, environment="", ignore_errors=None, endpoint=None):
+    def __init__(
+        self,
+        dsn,
+        environment="",
+        ignore_errors=None,
+        endpoint=None,
+        transport=None,
+        pool_size=DEFAULT_POOL_SIZE,
+        timeout=DEFAULT_TIMEOUT,
+        batch_size=1,
+        batch_timeout=BATCH_TIMEOUT,
+        compression=None,
+        max_payload_size=MAX_PAYLOAD_SIZE,
+        compact_payload=False,
+        max_repr_length=MAX_LENGTH,
+        max_repr_depth=MAX_DEPTH,
+        max_repr_items=MAX_ITEMS,
+        defer_capture=True,
+        queue_size=QUEUE_SIZE,
+        overflow_policy="drop_newest",
+        overflow_timeout=OVERFLOW_TIMEOUT,
+        aggregate_window=0,
+        fingerprint_cache_size=FINGERPRINT_CACHE_SIZE,
+        fingerprint_cache_ttl=None,
+        sample_rate=1.0,
+        rate_limit=None,
+        rate_limit_burst=None,
+        rate_limit_by="type",
+        max_retries=MAX_RETRIES,
+        retry_backoff=RETRY_BACKOFF,
+        spool_dir=None,
+        spool_max_size=MAX_SPOOL_SIZE,
+        library_context=True,
+        in_app_include=None,
+        in_app_exclude=None,
+        in_app_frames="full",
+        library_frames="full",
+        max_frames_with_locals=None,
+        max_frames=None,
+        sensitive_keys=None,
+        sensitive_headers=None,
+        sensitive_values=None,
+        serializer="auto",
+        async_mode=False,
+        async_transport=None,
+        workers=1,
+        shutdown_timeout=SHUTDOWN_TIMEOUT,
+        handle_sigterm=False,
+        integrations=None,
+    ):
         token, derived_endpoint = _parse_dsn(dsn)
         self.dsn = token
         self.endpoint = endpoint or derived_endpoint or DEFAULT_ENDPOINT
         self.environment = environment
         self.ignore_errors = tuple(ignore_errors) if ignore_errors else ()
+        self.workers = max(1, workers)
+        # One keep-alive connection per sender, so workers never queue for the pool
+        self.transport = transport or RequestsTransport(
+            pool_size=max(pool_size, self.workers), timeout=timeout
+        )
+        self.async_mode = async_mode
+        if async_mode and async_transport is None:
+            from ._async_transport import StreamsTransport
+
+            async_transport = StreamsTransport(pool_size=pool_size, timeout=timeout)
+        self.async_transport = async_transport
+        self._async = {}  # event loop -> (asyncio.Queue, sender task) in async mode
+        self._async_lock = threading.Lock()
+        self.batch_size = max(1, batch_size)
+        self.batch_timeout = batch_timeout
+        self._batching_supported = True
+        if compression not in _COMPRESSION:
+            raise ValueError(f"Unsupported compression {compression!r}; use 'gzip' or 'deflate'")
+        self.compression = _COMPRESSION[compression]
+        self.max_payload_size = max_payload_size
+        self._dumps = resolve_serializer(serializer)
+        from . import __version__
+
+        # Parts of every event that never change, encoded once (see _serialize)
+        self._static_context = {
+            "sdk": {"name": "booboo-sdk", "version": __version__},
+            "runtime": {"name": "Python", "version": platform.python_version()},
+        }
+        self._static_fields = {"tags": {"runtime": "python"}, "environment": environment}
+        self._context_members = _members(self._dumps(self._static_context))
+        self._field_tail = b"," + _members(self._dumps(self._static_fields)) + b"}"
+        probe = self._dumps({"context": {}})
+        self._context_prefix = probe[: probe.rindex(b"{") + 1]  # e.g. b'{"context":{'
+        self.compact_payload = compact_payload
+        self._scrubber = Scrubber(
+            keys=sensitive_keys or (),
+            headers=sensitive_headers or (),
+            values=sensitive_values or (),
+        )
+        self._repr = BoundedRepr(
+            max_length=max_repr_length,
+            max_depth=max_repr_depth,
+            max_items=max_repr_items,
+            is_sensitive=self._scrubber.is_sensitive_key,
+        ).repr
+        self._frame_policy = FramePolicy(
+            in_app=in_app_frames,
+            library=library_frames,
+            max_frames_with_locals=max_frames_with_locals,
+            max_frames=max_frames,
+            library_context=library_context,
+            is_in_app=(
+                InAppResolver(in_app_include, in_app_exclude)
+                if in_app_include or in_app_exclude
+                else _is_in_app
+            ),
+        )
+        self._loop_frame_policy = FramePolicy(
+            in_app=in_app_frames,
+            library=library_frames,
+            max_frames_with_locals=min(
+                LOOP_FRAMES_WITH_LOCALS, max_frames_with_locals or LOOP_FRAMES_WITH_LOCALS
+            ),
+            max_frames=max_frames,
+            library_context=library_context,
+            is_in_app=self._frame_policy.is_in_app,
+        )
+        self.defer_capture = defer_capture
+        if overflow_policy not in _OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unsupported overflow_policy {overflow_policy!r}; "
+                f"use one of {', '.join(_OVERFLOW_POLICIES)}"
+            )
+        self.overflow_policy = overflow_policy
+        self.overflow_timeout = overflow_timeout
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stats = dict.fromkeys(_STAT_COUNTERS, 0)
+        self._stats_lock = threading.Lock()
+        self._aggregator = None
+        self._fingerprints = None
+        if aggregate_window > 0:
+            self._aggregator = Aggregator(aggregate_window)
+            if fingerprint_cache_size > 0:
+                self._fingerprints = FingerprintCache(
+                    fingerprint_cache_size,
+                    fingerprint_cache_ttl
+                    if fingerprint_cache_ttl is not None
+                    else aggregate_window,
+                )
+        self.sample_rate = sample_rate
+        if rate_limit_by not in ("type", "fingerprint"):
+            raise ValueError(
+                f"Unsupported rate_limit_by {rate_limit_by!r}; use 'type' or 'fingerprint'"
+            )
+        self.rate_limit_by = rate_limit_by
+        self._rate_limiter = RateLimiter(rate_limit, rate_limit_burst) if rate_limit else None
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._backoff_until = 0.0
+        self._failures = 0
+        self._closing = threading.Event()
+        self._spool = Spool(spool_dir, spool_max_size) if spool_dir else None
+        self.shutdown_timeout = shutdown_timeout
+        self.handle_sigterm = handle_sigterm
+        self._previous_sigterm = None
+        self.integrations = resolve_integrations(integrations)
+        self._closed = False
         self._orig_excepthook = None
-        self._queue = queue.Queue(maxsize=100)
-        self._worker = None
+        self._workers = []
         self._worker_started = False
         self._lock = threading.Lock()
+        self._pid = os.getpid()
         self._user = None
         atexit.register(self._flush)
+        if hasattr(os, "register_at_fork"):
+            client_ref = weakref.ref(self)
+
+            def _after_fork_in_child():
+                client = client_ref()
+                if client is not None:
+                    client._reset_after_fork()
+
+            os.register_at_fork(after_in_child=_after_fork_in_child)
 
     def set_user(self, user_data):
-        """Set user context for subsequent events."""
+        """Set user context for subsequent events.
+
+        Values that are not JSON-native (ids as UUIDs, lazy strings, ...) are
+        stored as strings, so every serializer backend accepts the payload.
+        Nested dicts and lists are kept, with their leaves converted the same
+        way.
+        """
+        if user_data:
+            user_data = _json_native(user_data)
         self._user = user_data
 
     def install(self, app=None):
@@ -57,62 +346,83 @@ class BoobooClient:
         self._orig_excepthook = sys.excepthook
         sys.excepthook = self._excepthook
 
-        # Django: auto-detect -> inject middleware + patch exception handler
-        try:
-            from django.conf import settings
+        if self.handle_sigterm:
+            self._install_sigterm_handler()
 
-            mw = "booboo._middleware.BoobooDjangoMiddleware"
-            mw_list = list(settings.MIDDLEWARE)
-            if mw not in mw_list:
-                mw_list.insert(0, mw)
-                settings.MIDDLEWARE = mw_list
+        # Frameworks: hook into each one when (or if) the app imports it, so
+        # detection never imports a framework the app does not use
+        explicit = None
+        if app is not None and self._is_flask(app):
+            self._install_flask(app)
+            explicit = "flask"
+        elif app is not None and self._is_fastapi(app):
+            self._install_fastapi(app)
+            explicit = "fastapi"
+        for name in self.integrations:
+            if name != explicit:
+                watcher.watch(INTEGRATIONS[name], getattr(self, f"_activate_{name}"))
 
-            from booboo._middleware import _patch_django_exception_handler
+    def _activate_django(self, module):
+        """Patch Django's exception handler and add our middleware to its handlers.
 
-            _patch_django_exception_handler()
-        except Exception:
-            pass
+        Runs once ``django.core.handlers.base`` is imported, which can be
+        before settings are configured; the middleware is then added when a
+        handler loads its middleware.
+        """
+        from django.conf import settings
 
-        # Django Channels: auto-patch ProtocolTypeRouter
-        self._patch_channels_router()
+        from booboo._middleware import _patch_django_exception_handler
 
-        # Flask: explicit app or auto-patch constructor
-        if app is not None and self._is_flask(app):
-            self._install_flask(app)
-        else:
-            try:
-                import flask
+        _patch_django_exception_handler()
+        if settings.configured:
+            self._add_django_middleware()
 
-                self._patch_flask_class(flask.Flask)
-            except ImportError:
-                pass
+        base = module.BaseHandler
+        if getattr(base, "_booboo_patched", False):
+            return
+        client = self
+        _original_load_middleware = base.load_middleware
 
-        # FastAPI: explicit app or auto-patch constructor
-        if app is not None and self._is_fastapi(app):
-            self._install_fastapi(app)
-        else:
-            try:
-                import fastapi
+        def _load_middleware(handler, *args, **kwargs):
+            with contextlib.suppress(Exception):
+                client._add_django_middleware()
+            return _original_load_middleware(handler, *args, **kwargs)
 
-                self._patch_fastapi_class(fastapi.FastAPI)
-            except ImportError:
-                pass
+        base.load_middleware = _load_middleware
+        base._booboo_patched = True
 
-    def _is_flask(self, app):
-        try:
-            import flask
+    def _add_django_middleware(self):
+        from django.conf import settings
 
-            return isinstance(app, flask.Flask)
-        except ImportError:
-            return False
+        mw = "booboo._middleware.BoobooDjangoMiddleware"
+        mw_list = list(settings.MIDDLEWARE)
+        if mw not in mw_list:
+            mw_list.insert(0, mw)
+            settings.MIDDLEWARE = mw_list
 
-    def _is_fastapi(self, app):
-        try:
-            import fastapi
+    def _activate_channels(self, module):
+        self._patch_channels_router()
 
-            return isinstance(app, fastapi.FastAPI)
-        except ImportError:
-            return False
+    def _activate_flask(self, module):
+        self._patch_flask_class(module.Flask)
+
+    def _activate_fastapi(self, module):
+        self._patch_fastapi_class(module.FastAPI)
+
+    def _install_sigterm_handler(self):
+        """Drain events on SIGTERM (container shutdown). Main thread only."""
+        # ValueError off the main thread; AttributeError where there is no SIGTERM
+        with contextlib.suppress(ValueError, OSError, AttributeError):
+            self._previous_sigterm = signal.signal(signal.SIGTERM, self._on_sigterm)
+
+    def _is_flask(self, app):
+        # An app instance means its framework is imported already
+        flask = sys.modules.get("flask")
+        return flask is not None and isinstance(app, flask.Flask)
+
+    def _is_fastapi(self, app):
+        fastapi = sys.modules.get("fastapi")
+        return fastapi is not None and isinstance(app, fastapi.FastAPI)
 
     def _install_flask(self, app):
         client = self
@@ -131,7 +441,7 @@ class BoobooClient:
             try:
                 from flask import request
 
-                headers = scrub_headers(dict(request.headers))
+                headers = client._scrubber.scrub_headers(dict(request.headers))
                 request_data = {
                     "method": request.method,
                     "url": request.url,
@@ -195,44 +505,175 @@ class BoobooClient:
             try:
                 await _original_call(router_self, scope, receive, send)
             except Exception as exc:
-                from ._middleware import _extract_asgi_request
-
-                request_data, user_data = _extract_asgi_request(scope)
-                client._capture_and_send(exc, request_data=request_data, user_data=user_data)
+                client._capture_asgi(exc, scope)
                 raise
 
         ProtocolTypeRouter.__call__ = _wrapped_call
         ProtocolTypeRouter._booboo_patched = True
 
+    def _reset_after_fork(self):
+        """Drop worker state inherited from the parent process.
+
+        A forked child gets a copy of the queue and lock but not the worker
+        thread, so events would pile up unsent. Start over with a fresh queue
+        and lock; the next event lazily starts a worker in this process.
+        Events the parent had queued are left for the parent to send.
+        """
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(_STAT_COUNTERS, 0)
+        self._stats_lock = threading.Lock()
+        if self._aggregator is not None:
+            self._aggregator = Aggregator(self._aggregator.window)
+        if self._fingerprints is not None:
+            self._fingerprints = FingerprintCache(self._fingerprints.size, self._fingerprints.ttl)
+        if self._rate_limiter is not None:
+            self._rate_limiter = RateLimiter(self._rate_limiter.rate, self._rate_limiter.burst)
+        self._backoff_until = 0.0
+        self._failures = 0
+        self._closing = threading.Event()
+        if self._spool is not None:
+            self._spool.after_fork()
+        self._workers = []
+        self._worker_started = False
+        self._async = {}
+        self._async_lock = threading.Lock()
+        with contextlib.suppress(Exception):
+            self.transport.after_fork()
+
     def _ensure_worker(self):
-        """Lazily start the background worker thread. Returns False if thread creation fails."""
+        """Lazily start the background worker threads. Returns False if thread creation fails.
+
+        All ``workers`` threads share the queue, so a slow response holds up
+        one sender rather than every event behind it.
+        """
+        if self._pid != os.getpid():
+            # Fallback for forks that bypass os.register_at_fork hooks
+            self._reset_after_fork()
+        if self._closed:
+            return False  # closed: send synchronously
         if self._worker_started:
             return True
         with self._lock:
             if self._worker_started:
                 return True
             try:
-                self._worker = threading.Thread(target=self._worker_loop, daemon=True)
-                self._worker.start()
-                self._worker_started = True
-                return True
+                while len(self._workers) < self.workers:
+                    worker = threading.Thread(target=self._worker_loop, daemon=True)
+                    worker.start()
+                    self._workers.append(worker)
             except RuntimeError:
-                return False
+                if not self._workers:
+                    return False
+            self._worker_started = True
+            return True
 
     def _worker_loop(self):
         """Background thread: drain queue, send events, exit on sentinel."""
+        with contextlib.suppress(Exception):
+            self._maybe_replay_spool()
         while True:
             try:
-                item = self._queue.get()
+                items = self._next_batch()
+                stopping = bool(items) and items[-1] is _SENTINEL
                 try:
-                    if item is _SENTINEL:
-                        return
-                    self._do_send(item)
+                    events = self._build_events(items)
+                    if self._aggregator is not None:
+                        events += self._aggregated_events(flush_all=stopping)
+                    if events and self._holding_back():
+                        self._undelivered(self._encode_all(events))
+                    elif len(events) == 1:
+                        self._do_send(events[0])
+                    elif events:
+                        self._do_send_batch(events)
                 finally:
-                    self._queue.task_done()
+                    for _ in items:
+                        self._queue.task_done()
+                if stopping:
+                    return
+                self._maybe_replay_spool()
             except Exception:
                 pass
 
+    def _maybe_replay_spool(self):
+        """Resend spooled events, oldest first, unless ingest is still backing us off.
+
+        Stops at the first segment that cannot be delivered in full; its
+        remaining events go back to the spool.
+        """
+        if self._spool is None:
+            return
+        self._spool.refresh()
+        while time.monotonic() >= self._backoff_until and not self._closing.is_set():
+            segment = self._spool.take()
+            if segment is None:
+                return
+            claimed, lines = segment
+            undelivered = []
+            for i in range(0, len(lines), self.batch_size):
+                undelivered = self._send_encoded(lines[i : i + self.batch_size])
+                if undelivered:
+                    undelivered += lines[i + self.batch_size :]
+                    break
+            self._spool.release(claimed, undelivered)
+            if undelivered:
+                return
+
+    def _aggregated_events(self, flush_all=False):
+        """Summary events for aggregation windows that have closed."""
+        payloads = []
+        for event, repeats in self._aggregator.pop_due(flush_all):
+            with contextlib.suppress(Exception):
+                payload = _build(event)
+                payload["occurrences"] = repeats
+                payloads.append(payload)
+        return payloads
+
+    def _build_events(self, items):
+        """Build the payloads for a batch of queued items, skipping the sentinel."""
+        payloads = []
+        for item in items:
+            if item is _SENTINEL:
+                continue
+            with contextlib.suppress(Exception):
+                payloads.append(_build(item))
+        return payloads
+
+    def _next_batch(self):
+        """Block for one item, then keep draining until batch_size items are
+        collected, batch_timeout elapses, or the sentinel is seen.
+
+        With aggregation on, or a spool, waits at most one tick and may
+        return no items, so closed aggregation windows get flushed and the
+        spool retried (or rescanned) on an idle queue.
+        """
+        timeout = None
+        if self._aggregator is not None:
+            timeout = min(self._aggregator.window, 1.0)
+        if self._spool is not None:
+            timeout = min(timeout or SPOOL_RETRY_INTERVAL, SPOOL_RETRY_INTERVAL)
+        try:
+            items = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        if self.batch_size == 1 or items[0] is _SENTINEL:
+            return items
+        deadline = time.monotonic() + self.batch_timeout
+        while len(items) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            if item is _SENTINEL:
+                break
+        return items
+
     def _excepthook(self, exc_type, exc_value, exc_tb):
         self._capture_and_send(exc_value)
         if self._orig_excepthook:
@@ -247,58 +688,101 @@ class BoobooClient:
 
     def capture_message(self, message, level="info"):
         """Public API: send a plain message event."""
-        from . import __version__
-
-        context = {
-            "sdk": {"name": "booboo-sdk", "version": __version__},
-            "runtime": {"name": "Python", "version": platform.python_version()},
-        }
+        if self._backing_off():
+            return
 
+        context = {}
         if self._user:
             context["user"] = dict(self._user)
 
         payload = {
-            "message": message,
+            "context": context,
+            "message": message if isinstance(message, str) else str(message),
             "exception_type": "",
             "level": level,
             "stacktrace": [],
             "exceptions": [],
-            "context": context,
-            "tags": {"runtime": "python"},
-            "environment": self.environment,
         }
 
-        try:
-            if self._ensure_worker():
-                with contextlib.suppress(queue.Full):
-                    self._queue.put_nowait(payload)
-            else:
-                self._do_send(payload)
-        except Exception:
-            pass
+        self._enqueue(payload)
 
     def _capture_and_send(self, exc, request_data=None, user_data=None):
+        self._capture(exc, self._build_exception_payload, user_data, request_data)
+
+    def _capture_asgi(self, exc, scope):
+        """Capture an exception from inside a running event loop.
+
+        Keeps the work on the loop small: only the traceback snapshot and a
+        shallow copy of ``scope`` are taken here, and locals are rendered for
+        the innermost LOOP_FRAMES_WITH_LOCALS frames only. Header decoding
+        and scrubbing happen with the rest of the event on the worker, and if
+        no worker thread can be started the event is built and sent on the
+        loop's default executor.
+        """
+        self._capture(exc, self._build_asgi_payload, None, dict(scope), blocking=False)
+
+    def _capture(self, exc, build, user_data, request, blocking=True):
+        """Hot path shared by every exception entry point.
+
+        Only captures what may change once the handler returns: traceback
+        positions, messages, and locals rendered to scrubbed, bounded reprs.
+        Source lookup and payload assembly happen in ``build``, normally on
+        the worker thread.
+        """
         if self.ignore_errors and isinstance(exc, self.ignore_errors):
             return
+        if self._backing_off():
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self._record("sampled_out")
+            return
 
-        try:
-            frames = extract_frames(exc)
-        except Exception:
-            frames = []
+        key = None
+        if self._fingerprints is not None:
+            # A repeat of an error we just reported: count it and skip the
+            # snapshot entirely.
+            key = fast_key(exc)
+            fp = self._fingerprints.get(key)
+            if fp is not None and self._aggregator.bump(fp):
+                self._record("aggregated")
+                return
+
+        if self._rate_limiter is not None:
+            if self.rate_limit_by == "fingerprint":
+                key = key or fast_key(exc)
+                limit_key = key
+            else:
+                limit_key = type(exc)
+            if not self._rate_limiter.allow(limit_key):
+                self._record("rate_limited")
+                return
 
+        # Event loop callers (blocking=False) render fewer frames' locals
+        policy = self._frame_policy if blocking else self._loop_frame_policy
         try:
-            exceptions = extract_exception_chain(exc)
+            snapshot = snapshot_exception_chain(exc, policy, self._repr, self._scrubber)
         except Exception:
-            exceptions = []
+            snapshot = []
 
-        from . import __version__
-
-        context = {
-            "sdk": {"name": "booboo-sdk", "version": __version__},
-            "runtime": {"name": "Python", "version": platform.python_version()},
-        }
+        event = functools.partial(
+            build,
+            str(exc),
+            type(exc).__name__,
+            snapshot,
+            self._merge_user(user_data),
+            request,
+        )
+        if self._aggregator is not None:
+            fp = fingerprint(snapshot, self._frame_policy.is_in_app)
+            if key is not None:
+                self._fingerprints.put(key, fp)
+            if not self._aggregator.record(fp, event):
+                self._record("aggregated")
+                return
+        self._enqueue(event, blocking)
 
-        # Merge user: auto-captured user_data takes priority, falls back to set_user()
+    def _merge_user(self, user_data):
+        """Merge user: auto-captured user_data takes priority, falls back to set_user()."""
         user = None
         if self._user:
             user = dict(self._user)
@@ -307,51 +791,751 @@ class BoobooClient:
                 user.update(user_data)
             else:
                 user = user_data
+        return user
+
+    def _build_asgi_payload(self, message, exception_type, snapshot, user, scope):
+        from ._middleware import _extract_asgi_request
+
+        request_data, user_data = _extract_asgi_request(scope, self._scrubber)
+        if user_data:
+            user = {**user, **user_data} if user else user_data
+        return self._build_exception_payload(message, exception_type, snapshot, user, request_data)
+
+    def _build_exception_payload(self, message, exception_type, snapshot, user, request_data):
+        try:
+            exceptions = render_exception_chain(snapshot, self._frame_policy)
+        except Exception:
+            exceptions = []
+
+        # Chain entry 0 is the raised exception itself: reuse its frames
+        # rather than walking the same traceback a second time.
+        frames = exceptions[0]["stacktrace"] if exceptions else []
+
+        context = {}
         if user:
             context["user"] = user
 
         payload = {
-            "message": str(exc),
-            "exception_type": type(exc).__name__,
+            "context": context,
+            "message": message,
+            "exception_type": exception_type,
             "level": "error",
             "stacktrace": frames,
             "exceptions": exceptions,
-            "context": context,
-            "tags": {"runtime": "python"},
-            "environment": self.environment,
         }
+        if self.compact_payload and exceptions:
+            payload["stacktrace"] = []
+            payload["stacktrace_ref"] = 0
         if request_data:
             payload["request"] = request_data
+        return payload
+
+    def _enqueue(self, event, blocking=True):
+        """Hand an event to the worker, or send it right away if no worker can run.
 
+        ``event`` is a payload dict or a callable that builds one; callables
+        are built on the worker unless defer_capture is off. With
+        ``blocking=False`` (event loop callers) the event is always deferred,
+        and the no-worker fallback runs on the loop's default executor.
+        """
         try:
+            if self.async_mode and self._async_put(event):
+                return
             if self._ensure_worker():
-                with contextlib.suppress(queue.Full):
-                    self._queue.put_nowait(payload)
+                if blocking and not self.defer_capture:
+                    event = _build(event)
+                self._put(event, blocking)
+            elif blocking:
+                self._do_send(_build(event))  # sync fallback
             else:
-                self._do_send(payload)  # sync fallback
+                import asyncio
+
+                loop = asyncio.get_running_loop()
+                loop.run_in_executor(None, self._send_built, event)
         except Exception:
             pass
 
-    def _flush(self):
-        """Wait for background worker to drain (called at exit)."""
+    def _put(self, event, blocking=True):
+        """Put an event on the queue, applying overflow_policy if it is full."""
         try:
-            if not self._worker_started:
+            if blocking and self.overflow_policy == "block":
+                self._queue.put(event, timeout=self.overflow_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            if self.overflow_policy != "drop_oldest" or not self._evict_oldest(blocking):
+                self._overflow(event, blocking)
+                return
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._overflow(event, blocking)
                 return
-            self._queue.put_nowait(_SENTINEL)
-            self._worker.join(timeout=5)
+        self._record("enqueued")
+
+    def _overflow(self, event, blocking):
+        """Spool an event the queue had no room for, or count it as dropped.
+
+        Callers on an event loop (``blocking=False``) never touch the disk.
+        """
+        if self._spool is not None and blocking:
+            with contextlib.suppress(Exception):
+                data = self._serialize_within_limit(_build(event))
+                if data is not None:
+                    self._spool_events([data])
+                    return
+        self._record("dropped_queue_full")
+
+    def _evict_oldest(self, blocking=True):
+        """Drop the oldest queued event to make room. Returns False if nothing was evicted."""
+        try:
+            oldest = self._queue.get_nowait()
+        except queue.Empty:
+            return True  # the worker made room in the meantime
+        self._queue.task_done()
+        if oldest is _SENTINEL:
+            # Never lose a shutdown request; drop the new event instead
+            with contextlib.suppress(queue.Full):
+                self._queue.put_nowait(oldest)
+            return False
+        self._overflow(oldest, blocking)
+        return True
+
+    def _backing_off(self):
+        """True (and the event counted as dropped) while ingest asked us to back off.
+
+        Checked before any capture work, so nothing is snapshotted or
+        serialized for events that would only be rejected. With a spool the
+        event is captured anyway, and the sender spools it (see _holding_back).
+        """
+        if self._spool is None and self._backoff_until and time.monotonic() < self._backoff_until:
+            self._record("dropped_backoff")
+            return True
+        return False
+
+    def _holding_back(self):
+        """True while queued events should go to the spool instead of ingest.
+
+        That is while ingest asked us to back off and there is a spool to
+        keep them in; they are replayed once the backoff ends. Shutdown sends
+        what is left once instead.
+        """
+        return (
+            self._spool is not None
+            and time.monotonic() < self._backoff_until
+            and not self._closing.is_set()
+        )
+
+    def _record(self, counter, n=1):
+        with self._stats_lock:
+            self._stats[counter] += n
+
+    def stats(self):
+        """Public API: event delivery counters since the client was created.
+
+        ``enqueued`` events were accepted by the queue; they end up ``sent``,
+        ``send_failed`` (transport error or rejected after retries) or
+        ``dropped_oversize`` (could not be trimmed under max_payload_size).
+        ``dropped_queue_full`` events were lost to overflow_policy, and
+        ``dropped_backoff`` ones were captured while ingest asked us to back
+        off (with a spool_dir they are ``spooled`` instead).
+        """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _send_built(self, event):
+        with contextlib.suppress(Exception):
+            self._do_send(_build(event))
+
+    def flush(self, timeout=None):
+        """Public API: wait until queued and in-flight events are sent.
+
+        Waits at most ``timeout`` seconds (default shutdown_timeout) and
+        returns how many events were still queued or being sent when it
+        gave up, so 0 means everything was delivered. Open aggregation
+        windows are closed first and their repeat counts sent. Events on an
+        asyncio sender's queue are sent by their loop, not waited for, so
+        they count as left. The workers keep running; use close() to stop
+        them.
+        """
+        if timeout is None:
+            timeout = self.shutdown_timeout
+        deadline = time.monotonic() + timeout
+        if self._aggregator is not None:
+            for payload in self._aggregated_events(flush_all=True):
+                self._enqueue(payload)
+        left = self._wait_drained(deadline)
+        with self._async_lock:
+            left += sum(async_queue.qsize() for async_queue, _ in self._async.values())
+        return left
+
+    def close(self, timeout=None):
+        """Public API: send what is queued within ``timeout`` seconds, then stop.
+
+        Pending backoffs are not waited out and failed sends are not
+        retried. Returns how many events were left behind (moved to the
+        spool if there is one). Events captured afterwards are sent
+        synchronously. Called at exit with shutdown_timeout.
+        """
+        if timeout is None:
+            timeout = self.shutdown_timeout
+        deadline = time.monotonic() + timeout
+        left = 0
+        try:
+            self._requeue_async_leftovers()
+            if self._closed or not self._worker_started:
+                return 0
+            self._closed = True
+            self._closing.set()  # stop waiting out backoffs; send what is left once
+            left = self._wait_drained(deadline)
+            for _ in self._workers:  # one sentinel per worker
+                with contextlib.suppress(queue.Full):
+                    self._queue.put(_SENTINEL, timeout=max(0.0, deadline - time.monotonic()))
+            for worker in self._workers:
+                worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            if self._spool is not None and any(w.is_alive() for w in self._workers):
+                self._spool_leftovers()
+            self.transport.close()
         except Exception:
             pass
+        return left
 
-    def _do_send(self, payload):
+    def _wait_drained(self, deadline):
+        """Block until the worker queue has no unfinished events, or until deadline."""
+        if not self._worker_started:
+            return 0
+        tasks = self._queue
+        with tasks.all_tasks_done:
+            while tasks.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                tasks.all_tasks_done.wait(remaining)
+            return tasks.unfinished_tasks
+
+    def _flush(self):
+        """Drain and stop the workers within shutdown_timeout (called at exit)."""
+        self.close()
+
+    def _on_sigterm(self, signum, frame):
+        """SIGTERM handler: drain within shutdown_timeout, then defer to the previous handler.
+
+        The interrupted code may hold locks close() needs (the queue's, the
+        worker lock), so close() runs on its own thread and the handler only
+        waits for that thread, for at most shutdown_timeout.
+        """
+        closer = threading.Thread(target=self.close, daemon=True)
+        with contextlib.suppress(RuntimeError):
+            closer.start()
+            closer.join(self.shutdown_timeout)
+        previous = self._previous_sigterm
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    def _spool_leftovers(self):
+        """Move events the worker did not get to before exit into the spool."""
+        encoded = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _SENTINEL:
+                continue
+            with contextlib.suppress(Exception):
+                data = self._serialize_within_limit(_build(item))
+                if data is not None:
+                    encoded.append(data)
+        if encoded:
+            self._spool_events(encoded)
+
+    def _spool_events(self, encoded):
         try:
-            data = json.dumps(payload).encode("utf-8")
-            if len(data) > 102_400:
-                return  # too large, drop silently
-            requests.post(
-                self.endpoint,
-                data=data,
-                headers={"X-Booboo-DSN": self.dsn, "Content-Type": "application/json"},
-                timeout=5,
+            dropped = self._spool.write(encoded)
+        except Exception:
+            self._record("send_failed", len(encoded))
+            return
+        self._record("spooled", len(encoded))
+        if dropped:
+            self._record("dropped_spool_full", dropped)
+
+    def _serialize(self, payload):
+        """Encode a payload, splicing in the static parts encoded at construction.
+
+        Client payloads start with their own ``context`` entries (``user``);
+        the SDK and runtime context are inserted into that object and
+        ``tags`` and ``environment`` appended to the encoded bytes as-is.
+        Payloads laid out otherwise, or that set any static part
+        themselves, are merged and encoded in full instead.
+        """
+        context = payload.get("context")
+        if (
+            context is not None
+            and "tags" not in payload
+            and "environment" not in payload
+            and self._static_context.keys().isdisjoint(context)
+        ):
+            data = self._dumps(payload)
+            head = len(self._context_prefix)
+            if data.startswith(self._context_prefix) and data.endswith(b"}"):
+                members = self._context_members + b"," if context else self._context_members
+                return data[:head] + members + data[head:-1] + self._field_tail
+        return self._dumps(
+            {
+                **self._static_fields,
+                **payload,
+                "context": {**self._static_context, **(context or {})},
+            }
+        )
+
+    def _compress(self, data):
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=6)
+        if self.compression == "deflate":
+            return zlib.compress(data)
+        return data
+
+    def _wire_size(self, data):
+        """Size of serialized ``data`` once compressed for the wire.
+
+        Only payloads that are over the limit uncompressed pay for a trial
+        compression; everything else is known to fit already.
+        """
+        if len(data) <= self.max_payload_size or not self.compression:
+            return len(data)
+        return len(self._compress(data))
+
+    def _serialize_within_limit(self, payload):
+        """Serialize a payload, trimming it first if it is over max_payload_size.
+
+        Returns None if the event cannot be trimmed enough to fit.
+        """
+        data = self._serialize(payload)
+        size = self._wire_size(data)
+        if size <= self.max_payload_size:
+            return data
+        # Scale the wire budget by the observed compression ratio, with some
+        # headroom because the trimmed event may compress less well.
+        budget = len(data) * self.max_payload_size // size
+        if self.compression:
+            budget = budget * 9 // 10
+        if trim_payload(payload, len(data) - budget, self._dumps) > 0:
+            return None  # nothing left to cut, drop silently
+        data = self._serialize(payload)
+        if self._wire_size(data) > self.max_payload_size:
+            return None
+        return data
+
+    def _headers(self, content_type):
+        headers = {"X-Booboo-DSN": self.dsn, "Content-Type": content_type}
+        if self.compression:
+            headers["Content-Encoding"] = self.compression
+        return headers
+
+    def _post(self, data, content_type="application/json"):
+        return self.transport.send(self.endpoint, data, self._headers(content_type))
+
+    def _delivered(self):
+        """Clear the backoff state after a send ingest did not push back on."""
+        self._failures = 0
+        self._backoff_until = 0.0
+
+    def _push_back(self, resp):
+        """Extend the shared backoff deadline after a retryable failure."""
+        self._failures += 1
+        delay = _retry_after(resp)
+        if delay is None:
+            delay = min(MAX_BACKOFF, self.retry_backoff * 2 ** (self._failures - 1))
+            delay *= random.uniform(0.5, 1.0)
+        self._backoff_until = max(self._backoff_until, time.monotonic() + delay)
+
+    def _deliver(self, data, content_type="application/json"):
+        """POST an encoded body, retrying overload responses and network errors.
+
+        Retries happen on the workers only, up to max_retries times, with
+        exponential backoff and jitter (or the server's Retry-After). Senders
+        on other threads try once, so a caller is never put to sleep. Every
+        retryable failure pushes back the shared backoff deadline, during
+        which new events are dropped at capture time, or spooled if there
+        is a spool. Returns the last
+        response, or raises the last network error.
+        """
+        on_worker = threading.current_thread() in self._workers
+        attempt = 0
+        while True:
+            if on_worker:
+                delay = self._backoff_until - time.monotonic()
+                if delay > 0:
+                    self._closing.wait(delay)
+            try:
+                resp = self._post(data, content_type)
+                error = None
+            except Exception as exc:
+                resp, error = None, exc
+            if error is None and getattr(resp, "status_code", None) not in _RETRY_STATUSES:
+                self._delivered()
+                return resp
+            self._push_back(resp)
+            attempt += 1
+            if not on_worker or attempt > self.max_retries or self._closing.is_set():
+                if error is not None:
+                    raise error
+                return resp
+
+    def _send_encoded(self, encoded):
+        """Send serialized events, in batches when possible, and record the outcome.
+
+        Returns the events that could not be delivered because ingest was
+        unreachable or overloaded; events it rejected count as send_failed.
+        """
+        if len(encoded) == 1 or not self._batching_supported:
+            return self._send_each(encoded)[0]
+        undelivered = []
+        for batch in self._batches(encoded):
+            if undelivered:
+                # Ingest is down; don't wait out a backoff for every batch
+                undelivered += batch
+            else:
+                undelivered += self._send_batch(batch)
+        return undelivered
+
+    def _batches(self, encoded):
+        """Split events into groups whose joined body stays under MAX_BATCH_BYTES."""
+        limit = max(MAX_BATCH_BYTES, self.max_payload_size)
+        batch, size = [], 0
+        for data in encoded:
+            if batch and size + len(data) > limit:
+                yield batch
+                batch, size = [], 0
+            batch.append(data)
+            size += len(data) + 1
+        if batch:
+            yield batch
+
+    def _send_batch(self, batch):
+        if len(batch) == 1 or not self._batching_supported:
+            return self._send_each(batch)[0]
+        try:
+            resp = self._deliver(
+                self._compress(b"\n".join(batch)), content_type="application/x-ndjson"
             )
         except Exception:
-            pass
+            return batch
+        status = getattr(resp, "status_code", None)
+        if status == 413:
+            # Too large for ingest: send each half on its own
+            half = len(batch) // 2
+            undelivered = self._send_batch(batch[:half])
+            if undelivered:
+                return undelivered + batch[half:]
+            return self._send_batch(batch[half:])
+        if status != 400 and status not in _BATCH_UNSUPPORTED_STATUSES:
+            return self._settle(resp, batch)
+        undelivered, all_accepted = self._send_each(batch)
+        if status != 400 or all_accepted:
+            self._batching_supported = False
+        return undelivered
+
+    def _send_each(self, encoded):
+        """Send events one request each.
+
+        Returns the undelivered events, and whether ingest accepted all the
+        others.
+        """
+        undelivered = []
+        all_accepted = True
+        for data in encoded:
+            if undelivered:
+                # Ingest is down; don't wait out a backoff for every event
+                undelivered.append(data)
+                continue
+            try:
+                resp = self._deliver(self._compress(data))
+            except Exception:
+                undelivered.append(data)
+                continue
+            all_accepted = all_accepted and _accepted(resp)
+            undelivered += self._settle(resp, [data])
+        return undelivered, all_accepted
+
+    def _settle(self, resp, encoded):
+        if getattr(resp, "status_code", None) in _RETRY_STATUSES:
+            return encoded
+        self._record("sent" if _accepted(resp) else "send_failed", len(encoded))
+        return []
+
+    def _undelivered(self, encoded):
+        """Keep events ingest could not take in the spool, if there is one."""
+        if not encoded:
+            return
+        if self._spool is not None:
+            self._spool_events(encoded)
+        else:
+            self._record("send_failed", len(encoded))
+
+    def _do_send(self, payload):
+        try:
+            data = self._serialize_within_limit(payload)
+        except Exception:
+            self._record("send_failed")
+            return
+        if data is None:
+            self._record("dropped_oversize")
+            return
+        self._undelivered(self._send_encoded([data]))
+
+    def _do_send_batch(self, payloads):
+        """Send several events as one newline-delimited JSON request.
+
+        Falls back to one request per event (now and for the rest of the
+        process) when the endpoint rejects the batched body.
+        """
+        if not self._batching_supported:
+            for payload in payloads:
+                self._do_send(payload)
+            return
+        encoded = self._encode_all(payloads)
+        if encoded:
+            self._undelivered(self._send_encoded(encoded))
+
+    def _encode_all(self, payloads):
+        """Serialize payloads for sending, counting the ones that cannot be."""
+        encoded = []
+        for payload in payloads:
+            try:
+                data = self._serialize_within_limit(payload)
+            except Exception:
+                self._record("send_failed")
+                continue
+            if data is None:
+                self._record("dropped_oversize")
+            else:
+                encoded.append(data)
+        return encoded
+
+    # -- async_mode: an asyncio sender task on the application's event loop --
+
+    def _async_put(self, event):
+        """Queue an event for the sender task of the running event loop.
+
+        Returns False when called outside a running loop; the event then
+        goes to the worker thread as usual. Each loop gets its own queue and
+        sender task, started on first use; loops that have since been
+        closed are forgotten then, their leftovers handed to the worker.
+        """
+        import asyncio
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        state = self._async.get(loop)
+        if state is None:
+            self._requeue_async_leftovers(closed_only=True)
+            with self._async_lock:
+                async_queue = asyncio.Queue(maxsize=self._queue.maxsize)
+                task = loop.create_task(self._async_worker(async_queue))
+                state = self._async[loop] = (async_queue, task)
+        async_queue = state[0]
+        try:
+            async_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if self.overflow_policy != "drop_oldest":
+                self._overflow(event, blocking=False)
+                return True
+            oldest = async_queue.get_nowait()
+            async_queue.task_done()
+            if oldest is _SENTINEL:
+                async_queue.put_nowait(oldest)
+                self._overflow(event, blocking=False)
+                return True
+            self._overflow(oldest, blocking=False)
+            async_queue.put_nowait(event)
+        self._record("enqueued")
+        return True
+
+    async def _async_worker(self, async_queue):
+        """Sender task: drain the asyncio queue, send events, exit on sentinel.
+
+        Payloads are built and encoded on the loop's default executor, so
+        source lookup and serialization never stall the loop; only the
+        requests themselves run on it.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        timeout = None
+        if self._aggregator is not None:
+            timeout = min(self._aggregator.window, 1.0)
+        while True:
+            try:
+                try:
+                    items = [await asyncio.wait_for(async_queue.get(), timeout)]
+                except asyncio.TimeoutError:
+                    items = []
+                while (
+                    items
+                    and items[-1] is not _SENTINEL
+                    and len(items) < self.batch_size
+                    and not async_queue.empty()
+                ):
+                    items.append(async_queue.get_nowait())
+                stopping = bool(items) and items[-1] is _SENTINEL
+                try:
+                    encoded = await loop.run_in_executor(None, self._encode_items, items, stopping)
+                    if encoded and self._holding_back():
+                        undelivered = encoded
+                    else:
+                        undelivered = await self._async_send_encoded(encoded) if encoded else []
+                    if undelivered:
+                        await loop.run_in_executor(None, self._undelivered, undelivered)
+                finally:
+                    for _ in items:
+                        async_queue.task_done()
+                if stopping:
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+    def _encode_items(self, items, flush_all=False):
+        """Build and serialize a batch of queued items (runs on an executor)."""
+        payloads = self._build_events(items)
+        if self._aggregator is not None:
+            payloads += self._aggregated_events(flush_all)
+        return self._encode_all(payloads)
+
+    async def _async_deliver(self, data, content_type="application/json"):
+        """asyncio counterpart of _deliver: waits out backoffs without blocking the loop."""
+        import asyncio
+
+        if self.compression:
+            data = await asyncio.get_running_loop().run_in_executor(None, self._compress, data)
+        attempt = 0
+        while True:
+            delay = self._backoff_until - time.monotonic()
+            if delay > 0 and not self._closing.is_set():
+                await asyncio.sleep(delay)
+            try:
+                resp = await self.async_transport.send(
+                    self.endpoint, data, self._headers(content_type)
+                )
+                error = None
+            except Exception as exc:
+                resp, error = None, exc
+            if error is None and getattr(resp, "status_code", None) not in _RETRY_STATUSES:
+                self._delivered()
+                return resp
+            self._push_back(resp)
+            attempt += 1
+            if attempt > self.max_retries or self._closing.is_set():
+                if error is not None:
+                    raise error
+                return resp
+
+    async def _async_send_encoded(self, encoded):
+        """asyncio counterpart of _send_encoded."""
+        if len(encoded) == 1 or not self._batching_supported:
+            return (await self._async_send_each(encoded))[0]
+        undelivered = []
+        for batch in self._batches(encoded):
+            if undelivered:
+                undelivered += batch
+            else:
+                undelivered += await self._async_send_batch(batch)
+        return undelivered
+
+    async def _async_send_batch(self, batch):
+        """asyncio counterpart of _send_batch."""
+        if len(batch) == 1 or not self._batching_supported:
+            return (await self._async_send_each(batch))[0]
+        try:
+            resp = await self._async_deliver(b"\n".join(batch), content_type="application/x-ndjson")
+        except Exception:
+            return batch
+        status = getattr(resp, "status_code", None)
+        if status == 413:
+            half = len(batch) // 2
+            undelivered = await self._async_send_batch(batch[:half])
+            if undelivered:
+                return undelivered + batch[half:]
+            return await self._async_send_batch(batch[half:])
+        if status != 400 and status not in _BATCH_UNSUPPORTED_STATUSES:
+            return self._settle(resp, batch)
+        undelivered, all_accepted = await self._async_send_each(batch)
+        if status != 400 or all_accepted:
+            self._batching_supported = False
+        return undelivered
+
+    async def _async_send_each(self, encoded):
+        """asyncio counterpart of _send_each."""
+        undelivered = []
+        all_accepted = True
+        for data in encoded:
+            if undelivered:
+                undelivered.append(data)
+                continue
+            try:
+                resp = await self._async_deliver(data)
+            except Exception:
+                undelivered.append(data)
+                continue
+            all_accepted = all_accepted and _accepted(resp)
+            undelivered += self._settle(resp, [data])
+        return undelivered, all_accepted
+
+    async def _drain_async(self, timeout=5.0):
+        """Send what the running loop's sender task has queued, then stop it.
+
+        Called on ASGI lifespan shutdown, while the loop can still run the
+        requests. Gives up after ``timeout`` seconds; whatever is left is
+        then handed to the worker thread at exit.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        state = self._async.get(loop)
+        if state is None:
+            return
+        async_queue, task = state
+
+        async def _stop():
+            await async_queue.put(_SENTINEL)
+            await asyncio.shield(task)
+
+        try:
+            await asyncio.wait_for(_stop(), timeout)
+        except Exception:
+            return
+        with self._async_lock:
+            self._async.pop(loop, None)
+        with contextlib.suppress(Exception):
+            await self.async_transport.close()
+
+    def _requeue_async_leftovers(self, closed_only=False):
+        """Move events still on stopped loops' asyncio queues to the worker thread.
+
+        With ``closed_only`` (called from a running loop) only closed loops,
+        which can never run their sender again, are handled, and overflow
+        never touches the disk.
+        """
+        with self._async_lock:
+            stopped = [
+                loop
+                for loop in self._async
+                if (loop.is_closed() if closed_only else not loop.is_running())
+            ]
+            queues = [self._async.pop(loop)[0] for loop in stopped]
+        for async_queue in queues:
+            while not async_queue.empty():
+                item = async_queue.get_nowait()
+                if item is _SENTINEL or not self._ensure_worker():
+                    continue
+                try:
+                    self._queue.put_nowait(item)  # already counted as enqueued
+                except queue.Full:
+                    self._overflow(item, blocking=not closed_only)
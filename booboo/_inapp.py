@@ -0,0 +1,77 @@
+import os
+import re
+import site
+import sys
+import sysconfig
+
+# Fallbacks for interpreters other than this one (e.g. paths recorded on
+# another machine): anything in a site-packages/dist-packages directory, or
+# directly under a lib/pythonX.Y stdlib directory.
+_LIBRARY_PATTERN = re.compile(
+    r"[/\\](?:site|dist)-packages[/\\]|[/\\]lib(?:64)?[/\\]python\d+(?:\.\d+)?t?[/\\]"
+)
+
+
+def _prefix(path):
+    return os.path.join(os.path.normcase(os.path.abspath(path)), "")
+
+
+def library_prefixes():
+    """Directories holding third-party packages and the standard library."""
+    paths = []
+    # Some virtualenv versions ship a site module without getsitepackages()
+    paths.extend(getattr(site, "getsitepackages", list)())
+    if getattr(site, "ENABLE_USER_SITE", False):
+        paths.append(site.getusersitepackages())
+    sysconfig_paths = sysconfig.get_paths()
+    for name in ("stdlib", "platstdlib", "purelib", "platlib"):
+        if name in sysconfig_paths:
+            paths.append(sysconfig_paths[name])
+    for entry in sys.path:
+        if entry and (_LIBRARY_PATTERN.search(_prefix(entry)) or entry.endswith(".zip")):
+            paths.append(entry)
+    return tuple(dict.fromkeys(_prefix(p) for p in paths))
+
+
+class InAppResolver:
+    """Decide whether a source file belongs to the application.
+
+    A file is in-app unless it lives under a library prefix: the
+    interpreter's site-packages and standard library directories (from
+    ``site`` and ``sysconfig``) and any ``sys.path`` entry that looks like
+    one. ``include`` prefixes always count as in-app and ``exclude``
+    prefixes never do; ``include`` wins when both match.
+
+    Results are memoized per filename, so each ``co_filename`` is
+    classified once. The library prefixes are looked up on first use.
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = tuple(_prefix(p) for p in include or ())
+        self.exclude = tuple(_prefix(p) for p in exclude or ())
+        self.library = None
+        self._cache = {}
+
+    def __call__(self, filename):
+        try:
+            return self._cache[filename]
+        except KeyError:
+            pass
+        in_app = self._classify(filename)
+        self._cache[filename] = in_app
+        return in_app
+
+    def _classify(self, filename):
+        if filename.startswith("<"):
+            # <frozen importlib._bootstrap> is stdlib; <stdin>, <string> are user code
+            return not filename.startswith("<frozen")
+        path = os.path.normcase(filename)
+        if self.include and path.startswith(self.include):
+            return True
+        if self.exclude and path.startswith(self.exclude):
+            return False
+        if self.library is None:
+            self.library = library_prefixes()
+        if path.startswith(self.library):
+            return False
+        return _LIBRARY_PATTERN.search(path) is None
@@ -0,0 +1,97 @@
+import contextlib
+import sys
+
+# Framework integrations, mapped to the module whose import activates them.
+# Django hooks in once its request handler is imported, by which time its
+# settings are configured.
+INTEGRATIONS = {
+    "django": "django.core.handlers.base",
+    "channels": "channels.routing",
+    "flask": "flask",
+    "fastapi": "fastapi",
+}
+
+
+def resolve_integrations(integrations=None):
+    """Validate an ``integrations=`` value; None enables every integration."""
+    if integrations is None:
+        return tuple(INTEGRATIONS)
+    integrations = tuple(integrations)
+    unknown = [name for name in integrations if name not in INTEGRATIONS]
+    if unknown:
+        raise ValueError(
+            f"Unsupported integrations {unknown!r}; use any of {', '.join(INTEGRATIONS)}"
+        )
+    return integrations
+
+
+class _NotifyingLoader:
+    """Wraps a module's loader to run the watcher's callbacks once the module has executed."""
+
+    def __init__(self, loader, watcher):
+        self._loader = loader
+        self._watcher = watcher
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        for callback in self._watcher._pop(module.__name__):
+            with contextlib.suppress(Exception):
+                callback(module)
+
+
+class ImportWatcher:
+    """Run callbacks when modules are imported, without importing them.
+
+    A callback for a module that is already in ``sys.modules`` runs right
+    away. Otherwise the watcher sits on ``sys.meta_path`` and, when the
+    module is first imported, wraps its loader so the callback runs as soon
+    as the module body has executed. Each callback runs at most once, and
+    stays registered until then: looking a module up (``find_spec``, as
+    optional-dependency checks do) without executing it does not use it up.
+    """
+
+    def __init__(self):
+        self._callbacks = {}  # module name -> [callback, ...]
+
+    def watch(self, name, callback):
+        module = sys.modules.get(name)
+        if module is not None:
+            with contextlib.suppress(Exception):
+                callback(module)
+            return
+        self._callbacks.setdefault(name, []).append(callback)
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self._callbacks:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _NotifyingLoader(spec.loader, self)
+        return spec
+
+    def _pop(self, name):
+        """Unregister and return the callbacks for a module that has just executed."""
+        callbacks = self._callbacks.pop(name, [])
+        if not self._callbacks:
+            with contextlib.suppress(ValueError):
+                sys.meta_path.remove(self)
+        return callbacks
+
+
+watcher = ImportWatcher()
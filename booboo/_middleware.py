@@ -1,6 +1,6 @@
 import booboo
 
-from ._scrubber import scrub_headers
+from ._scrubber import DEFAULT_SCRUBBER
 
 
 def _patch_django_exception_handler():
@@ -31,12 +31,13 @@ def _patch_django_exception_handler():
         pass
 
 
-def _extract_django_request(request):
+def _extract_django_request(request, scrubber=None):
     """Extract request data and user data from a Django HttpRequest."""
     request_data = None
     user_data = None
     try:
-        headers = scrub_headers(dict(getattr(request, "headers", {})))
+        scrubber = scrubber or getattr(booboo._client, "_scrubber", DEFAULT_SCRUBBER)
+        headers = scrubber.scrub_headers(dict(getattr(request, "headers", {})))
         request_data = {
             "method": request.method,
             "url": request.get_full_path(),
@@ -63,18 +64,12 @@ def _extract_django_request(request):
     return request_data, user_data
 
 
-def _extract_asgi_request(scope):
+def _extract_asgi_request(scope, scrubber=DEFAULT_SCRUBBER):
     """Extract request data and user data from an ASGI scope dict."""
     request_data = None
     user_data = None
     try:
-        headers = {}
-        for key, value in scope.get("headers", []):
-            try:
-                headers[key.decode("latin-1")] = value.decode("latin-1")
-            except Exception:
-                continue
-        headers = scrub_headers(headers)
+        headers = scrubber.scrub_raw_headers(scope.get("headers", []))
 
         server = scope.get("server", ("localhost", 80))
         scheme = scope.get("scheme", "http")
@@ -121,14 +116,22 @@ class BoobooASGIMiddleware:
 
     async def __call__(self, scope, receive, send):
         if scope["type"] == "lifespan":
-            await self.app(scope, receive, send)
+            await self.app(scope, receive, _drain_on_shutdown(send))
             return
         try:
             await self.app(scope, receive, send)
         except Exception as exc:
             if booboo._client:
-                request_data, user_data = _extract_asgi_request(scope)
-                booboo._client._capture_and_send(
-                    exc, request_data=request_data, user_data=user_data
-                )
+                booboo._client._capture_asgi(exc, scope)
             raise
+
+
+def _drain_on_shutdown(send):
+    """Wrap a lifespan ``send`` to flush async-mode events before shutdown completes."""
+
+    async def _send(message):
+        if message.get("type") == "lifespan.shutdown.complete" and booboo._client:
+            await booboo._client._drain_async()
+        await send(message)
+
+    return _send
@@ -0,0 +1,39 @@
+import threading
+import time
+from collections import OrderedDict
+
+MAX_KEYS = 1024
+
+
+class RateLimiter:
+    """Token bucket per key: ``rate`` events per second, bursts up to ``burst``.
+
+    Buckets are created on first use and the least recently used is
+    discarded once more than ``max_keys`` exist, so memory stays bounded however many distinct
+    keys show up.
+    """
+
+    def __init__(self, rate, burst=None, max_keys=MAX_KEYS):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at), least recent first
+
+    def allow(self, key):
+        """Take a token for ``key``. Returns False if its bucket is empty."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                tokens = self.burst
+            else:
+                self._buckets.move_to_end(key)
+                tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            return True
@@ -0,0 +1,136 @@
+import builtins
+import enum
+import reprlib
+from collections import deque
+from itertools import islice
+
+MAX_LENGTH = 200
+MAX_DEPTH = 3
+MAX_ITEMS = 10
+
+
+class BoundedRepr(reprlib.Repr):
+    """``reprlib.Repr`` tuned for capturing local variables.
+
+    Containers are cut to ``max_items`` elements and ``max_depth`` levels,
+    and strings/bytes to ``max_length`` characters, *before* their repr is
+    built. Capturing a multi-million element list therefore costs about as
+    much as capturing a ten element one.
+
+    If ``is_sensitive`` is given, dict values under string keys it accepts
+    are rendered as ``'[filtered]'`` without being repr'd.
+    """
+
+    def __init__(
+        self, max_length=MAX_LENGTH, max_depth=MAX_DEPTH, max_items=MAX_ITEMS, is_sensitive=None
+    ):
+        super().__init__()
+        self.is_sensitive = is_sensitive
+        self.max_length = max_length
+        self.maxlevel = max_depth
+        self.maxtuple = self.maxlist = self.maxarray = max_items
+        self.maxdict = self.maxset = self.maxfrozenset = self.maxdeque = max_items
+        self.maxstring = self.maxlong = self.maxother = max_length
+
+    def repr(self, x):
+        return super().repr(x)[: self.max_length]
+
+    def repr1(self, x, level):
+        method = getattr(self, "repr_" + type(x).__name__.replace(" ", "_"), None)
+        if method is not None:
+            return method(x, level)
+        # Subclasses of builtin containers and strings (OrderedDict, namedtuples,
+        # SafeString, ...) would otherwise fall through to a full repr of every
+        # element, and skip the redaction of sensitive dict keys.
+        if isinstance(x, tuple) and hasattr(x, "_fields"):
+            return self._repr_namedtuple(x, level)
+        if not isinstance(x, enum.Enum):
+            for base, base_method in self._subclass_bases:
+                if isinstance(x, base):
+                    return f"{type(x).__name__}({base_method(self, x, level)})"
+        return self.repr_instance(x, level)
+
+    def _repr_namedtuple(self, x, level):
+        name = type(x).__name__
+        if level <= 0:
+            return f"{name}(...)"
+        pieces = [
+            f"{field}={self.repr1(value, level - 1)}"
+            for field, value in islice(zip(x._fields, x), self.maxtuple)
+        ]
+        if len(x) > self.maxtuple:
+            pieces.append("...")
+        return f"{name}({', '.join(pieces)})"
+
+    def _repr_deque_items(self, x, level):
+        return self._repr_iterable(x, level, "[", "]", self.maxdeque)
+
+    def _repr_sliced_subclass(self, x, level):
+        # Slice through the base type, so the subclass never builds its own repr
+        for base in (str, bytes, bytearray):
+            if isinstance(x, base):
+                return self._repr_sliced(base.__getitem__(x, slice(self.maxstring + 1)))
+
+    def repr_dict(self, x, level):
+        # reprlib sorts keys first, which is O(n log n) on the whole dict
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        pieces = []
+        for key, value in islice(x.items(), self.maxdict):
+            if self.is_sensitive is not None and isinstance(key, str) and self.is_sensitive(key):
+                value_repr = "'[filtered]'"
+            else:
+                value_repr = self.repr1(value, level - 1)
+            pieces.append(f"{self.repr1(key, level - 1)}: {value_repr}")
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+    def repr_set(self, x, level):
+        if not x:
+            return "set()"
+        return self._repr_iterable(x, level, "{", "}", self.maxset)
+
+    def repr_frozenset(self, x, level):
+        if not x:
+            return "frozenset()"
+        return self._repr_iterable(x, level, "frozenset({", "})", self.maxfrozenset)
+
+    def repr_bytes(self, x, level):
+        return self._repr_sliced(x)
+
+    def repr_bytearray(self, x, level):
+        return self._repr_sliced(x)
+
+    def repr_str(self, x, level):
+        return self._repr_sliced(x)
+
+    def _repr_sliced(self, x):
+        s = builtins.repr(x[: self.maxstring])
+        if len(x) > self.maxstring or len(s) > self.maxstring:
+            s = s[: self.maxstring - 3] + "..."
+        return s
+
+    def repr_instance(self, x, level):
+        try:
+            s = builtins.repr(x)
+        except Exception:
+            return f"<{type(x).__name__}>"
+        if len(s) > self.maxother:
+            s = s[: self.maxother - 3] + "..."
+        return s
+
+    _subclass_bases = (
+        (dict, repr_dict),
+        (list, reprlib.Repr.repr_list),
+        (tuple, reprlib.Repr.repr_tuple),
+        (set, repr_set),
+        (frozenset, repr_frozenset),
+        (deque, _repr_deque_items),
+        ((str, bytes, bytearray), _repr_sliced_subclass),
+    )
+
+
+bounded_repr = BoundedRepr().repr
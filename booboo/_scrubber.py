@@ -1,10 +1,22 @@
 import re
 
-SENSITIVE_PATTERN = re.compile(
-    r"password|passwd|secret|token|api_key|apikey|access_key|auth|credential|private",
-    re.IGNORECASE,
+from ._repr import bounded_repr
+
+SENSITIVE_KEYS = (
+    "password",
+    "passwd",
+    "secret",
+    "token",
+    "api_key",
+    "apikey",
+    "access_key",
+    "auth",
+    "credential",
+    "private",
 )
 
+SENSITIVE_PATTERN = re.compile("|".join(SENSITIVE_KEYS), re.IGNORECASE)
+
 SENSITIVE_HEADERS = frozenset(
     {
         "authorization",
@@ -16,33 +28,147 @@ SENSITIVE_HEADERS = frozenset(
     }
 )
 
+# Secrets recognised inside values, whatever their key: payment card numbers
+# (Luhn-checked) and bearer tokens.
+_CARD = r"(?P<card>\b(?:\d[ -]?){12,18}\d\b)"
+_BEARER = r"(?P<bearer>\b[Bb]earer\s+)[A-Za-z0-9\-._~+/]+=*"
+# Cheap pre-check: a value with neither "earer" nor eight digits in a row
+# (allowing separators) cannot match either pattern.
+_CARD_HINT = re.compile(r"\d(?:[ -]?\d){7}")
+
+FILTERED = "[filtered]"
+VERDICT_CACHE_SIZE = 4096
+MAX_VARS = 50
+
+
+def _luhn(digits):
+    total = 0
+    for i, char in enumerate(reversed(digits)):
+        d = int(char)
+        if i % 2:
+            d = d * 2 - 9 if d > 4 else d * 2
+        total += d
+    return total % 10 == 0
+
+
+class Scrubber:
+    """Compiled scrubbing rules for local variables and HTTP headers.
+
+    A key is sensitive if it contains one of ``SENSITIVE_KEYS`` or the
+    extra ``keys`` (case-insensitive); a header also if its name is in
+    ``SENSITIVE_HEADERS`` or the extra ``headers``. Verdicts are cached per
+    name, since the same variable and header names come up in every event;
+    each cache is cleared once it holds ``cache_size`` names. Card numbers,
+    bearer tokens and matches of the extra ``values`` patterns are replaced
+    inside otherwise unfiltered values.
+    """
+
+    def __init__(self, keys=(), headers=(), values=(), cache_size=VERDICT_CACHE_SIZE):
+        self._key_pattern = re.compile(
+            "|".join([*SENSITIVE_KEYS, *(re.escape(k) for k in keys)]), re.IGNORECASE
+        )
+        self._headers = SENSITIVE_HEADERS | {h.lower() for h in headers}
+        self._value_pattern = re.compile("|".join([_CARD, _BEARER, *(f"(?:{v})" for v in values)]))
+        self._extra_values = bool(values)
+        self.cache_size = cache_size
+        self._keys = {}
+        self._header_names = {}  # name (str or raw bytes) -> (decoded name, sensitive)
+
+    def is_sensitive_key(self, key):
+        try:
+            return self._keys[key]
+        except KeyError:
+            pass
+        if len(self._keys) >= self.cache_size:
+            self._keys.clear()
+        verdict = self._keys[key] = self._key_pattern.search(key) is not None
+        return verdict
+
+    def _header(self, name):
+        try:
+            return self._header_names[name]
+        except KeyError:
+            pass
+        decoded = name.decode("latin-1") if isinstance(name, bytes) else name
+        lower = decoded.lower()
+        entry = (decoded, lower in self._headers or self._key_pattern.search(lower) is not None)
+        if len(self._header_names) >= self.cache_size:
+            self._header_names.clear()
+        self._header_names[name] = entry
+        return entry
+
+    def scrub_value(self, value):
+        """Replace card numbers, bearer tokens and other secrets inside a string."""
+        if not self._extra_values and "earer" not in value and not _CARD_HINT.search(value):
+            return value
+        return self._value_pattern.sub(self._replace, value)
+
+    @staticmethod
+    def _replace(match):
+        if match.group("card") is not None:
+            digits = re.sub(r"[ -]", "", match.group("card"))
+            return FILTERED if _luhn(digits) else match.group(0)
+        if match.group("bearer") is not None:
+            return match.group("bearer") + FILTERED
+        return FILTERED
+
+    def scrub_headers(self, headers):
+        """Scrub sensitive values from a mapping of HTTP headers."""
+        result = {}
+        for key, value in headers.items():
+            if self._header(key)[1]:
+                result[key] = FILTERED
+            else:
+                result[key] = self.scrub_value(str(value))
+        return result
+
+    def scrub_raw_headers(self, raw_headers):
+        """Decode and scrub ASGI ``(name, value)`` byte pairs in one pass.
+
+        Values of sensitive headers are never decoded.
+        """
+        result = {}
+        for key, value in raw_headers:
+            try:
+                name, sensitive = self._header(key)
+                result[name] = FILTERED if sensitive else self.scrub_value(value.decode("latin-1"))
+            except Exception:
+                continue
+        return result
+
+    def scrub_vars(self, local_vars, repr_func=bounded_repr):
+        """Filter f_locals: skip dunders, redact sensitive keys, repr+truncate values.
+
+        ``repr_func`` must bound its own work; the default ``BoundedRepr``
+        stops descending into large containers and strings once the output
+        is full. Give it ``is_sensitive=self.is_sensitive_key`` to redact
+        sensitive keys of nested dicts while the repr is built.
+        """
+        result = {}
+        for key, value in local_vars.items():
+            if len(result) >= MAX_VARS:
+                break
+            if key.startswith("__") and key.endswith("__"):
+                continue
+            if self.is_sensitive_key(key):
+                result[key] = FILTERED
+                continue
+            try:
+                r = repr_func(value)
+            except Exception:
+                r = f"<{type(value).__name__}>"
+            result[key] = self.scrub_value(r)
+        return result
+
+
+DEFAULT_SCRUBBER = Scrubber()
+
 
 def scrub_headers(headers):
     """Scrub sensitive values from HTTP headers."""
-    result = {}
-    for key, value in headers.items():
-        lower = key.lower()
-        if lower in SENSITIVE_HEADERS or SENSITIVE_PATTERN.search(lower):
-            result[key] = "[filtered]"
-        else:
-            result[key] = str(value)
-    return result
-
-
-def scrub_vars(local_vars):
-    """Filter f_locals: skip dunders, redact sensitive keys, repr+truncate values."""
-    result = {}
-    for key, value in local_vars.items():
-        if len(result) >= 50:
-            break
-        if key.startswith("__") and key.endswith("__"):
-            continue
-        if SENSITIVE_PATTERN.search(key):
-            result[key] = "[filtered]"
-            continue
-        try:
-            r = repr(value)
-        except Exception:
-            r = f"<{type(value).__name__}>"
-        result[key] = r[:200]
-    return result
+    return DEFAULT_SCRUBBER.scrub_headers(headers)
+
+
+def scrub_vars(local_vars, repr_func=bounded_repr):
+    """Filter f_locals with the default rules; see Scrubber.scrub_vars."""
+    return DEFAULT_SCRUBBER.scrub_vars(local_vars, repr_func)
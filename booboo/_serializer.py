@@ -0,0 +1,65 @@
+import json
+
+SERIALIZERS = ("auto", "orjson", "ujson", "json")
+
+
+def _json_dumps(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+def _falling_back(dumps):
+    """Wrap a fast backend so payloads it cannot encode go through the stdlib.
+
+    orjson and ujson are stricter than ``json``: they reject lone surrogates
+    in strings (common in reprs of undecodable bytes or file names) and
+    integers wider than 64 bits, which ``json`` encodes fine.
+    """
+
+    def _dumps(payload):
+        try:
+            return dumps(payload)
+        except (TypeError, ValueError, OverflowError):
+            return _json_dumps(payload)
+
+    return _dumps
+
+
+def _load(name):
+    if name == "orjson":
+        import orjson
+
+        return _falling_back(orjson.dumps)
+    if name == "ujson":
+        import ujson
+
+        def _ujson_dumps(payload):
+            return ujson.dumps(payload).encode("utf-8")
+
+        return _falling_back(_ujson_dumps)
+    return _json_dumps
+
+
+def resolve_serializer(serializer="auto"):
+    """Return a function that turns an event payload into JSON bytes.
+
+    ``"auto"`` picks orjson, then ujson, whichever is installed first, and
+    falls back to the standard library. A name forces that backend (raising
+    ImportError if it is missing), and a callable is used as-is. Payloads
+    only ever contain JSON-native values, so no backend needs a ``default``
+    hook; the fast backends fall back to the standard library for the few
+    values they refuse.
+    """
+    if callable(serializer):
+        return serializer
+    if serializer not in SERIALIZERS:
+        raise ValueError(
+            f"Unsupported serializer {serializer!r}; use one of {', '.join(SERIALIZERS)}"
+        )
+    if serializer != "auto":
+        return _load(serializer)
+    for name in ("orjson", "ujson"):
+        try:
+            return _load(name)
+        except ImportError:
+            continue
+    return _json_dumps
@@ -0,0 +1,204 @@
+import contextlib
+import os
+import threading
+import time
+
+SEGMENT_SIZE = 256 * 1024
+MAX_SPOOL_SIZE = 10 * 1024 * 1024
+_SUFFIX = ".ndjson"
+
+# An empty spool looks for segments other processes left behind at most
+# this often, in seconds.
+RESCAN_INTERVAL = 30
+# A claimed segment whose process has exited is put back for replay once
+# it is this old, in seconds.
+STALE_CLAIM_AGE = 60
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        return True  # no cheap check; never reclaim
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class Spool:
+    """Events that could not be delivered, kept in append-only segment files.
+
+    Each segment is a newline-delimited file of serialized events, named so
+    that sorting by name gives oldest first. New events are appended to the
+    newest segment until it reaches ``segment_size`` bytes. Once the
+    directory holds more than ``max_size`` bytes of segments, whichever
+    process wrote them, the oldest are deleted.
+
+    Segments are claimed by renaming them before they are replayed, so
+    several processes can share a directory without sending an event twice.
+    Each process tracks the segments it has seen; once it has none left,
+    refresh() picks up those other processes wrote, and claims abandoned by
+    processes that have exited.
+    """
+
+    def __init__(self, directory, max_size=MAX_SPOOL_SIZE, segment_size=SEGMENT_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        self._segments = []  # [path, size, events], oldest first
+        self._size = 0
+        self._events = 0
+        self._scanned_at = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def __len__(self):
+        return self._events
+
+    def after_fork(self):
+        """Forget the segments inherited from the parent process.
+
+        Called in a forked child. The parent keeps replaying the segments it
+        knows about; the child starts an empty view of the directory without
+        reading it, and its first write creates a segment named with its own
+        pid instead of appending to the parent's newest one.
+        """
+        self._lock = threading.Lock()
+        self._segments = []
+        self._size = 0
+        self._events = 0
+        self._scanned_at = time.monotonic()
+
+    def refresh(self):
+        """Pick up segments left in the directory by other processes.
+
+        Only looks once this process has no segments of its own left, and
+        at most every RESCAN_INTERVAL seconds.
+        """
+        if self._segments or time.monotonic() - self._scanned_at < RESCAN_INTERVAL:
+            return
+        with self._lock:
+            if not self._segments:
+                self._scan()
+
+    def _scan(self):
+        """Load every unclaimed segment, first putting back stale claims."""
+        self._scanned_at = time.monotonic()
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path, _, pid = name.rpartition(".")
+            if not (path.endswith(_SUFFIX) and pid.isdigit()) or _pid_alive(int(pid)):
+                continue
+            claimed = os.path.join(self.directory, name)
+            with contextlib.suppress(OSError):
+                if now - os.stat(claimed).st_mtime >= STALE_CLAIM_AGE:
+                    os.rename(claimed, os.path.join(self.directory, path))
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(_SUFFIX):
+                self._load(os.path.join(self.directory, name))
+
+    def _load(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        self._segments.append([path, len(data), data.count(b"\n")])
+        self._size += len(data)
+        self._events += data.count(b"\n")
+
+    def _new_segment_path(self):
+        return os.path.join(self.directory, f"{time.time_ns():020d}-{os.getpid()}{_SUFFIX}")
+
+    def write(self, lines):
+        """Append serialized events.
+
+        Returns how many old events were discarded to stay under max_size.
+        """
+        data = b"".join(line + b"\n" for line in lines)
+        with self._lock:
+            if not self._segments or self._segments[-1][1] >= self.segment_size:
+                self._segments.append([self._new_segment_path(), 0, 0])
+            segment = self._segments[-1]
+            with open(segment[0], "ab") as f:
+                f.write(data)
+            segment[1] += len(data)
+            segment[2] += len(lines)
+            self._size += len(data)
+            self._events += len(lines)
+            return self._enforce_max_size()
+
+    def _enforce_max_size(self):
+        """Delete the oldest segments in the directory until it fits max_size.
+
+        Returns how many events were deleted.
+        """
+        sizes = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(_SUFFIX):
+                path = os.path.join(self.directory, name)
+                with contextlib.suppress(OSError):
+                    sizes.append((path, os.stat(path).st_size))
+        total = sum(size for _, size in sizes)
+        tracked = {segment[0]: segment for segment in self._segments}
+        dropped = 0
+        for path, size in sizes:
+            if total <= self.max_size:
+                break
+            segment = tracked.get(path)
+            try:
+                if segment is None:
+                    with open(path, "rb") as f:
+                        events = f.read().count(b"\n")
+                else:
+                    events = segment[2]
+                os.unlink(path)
+            except OSError:
+                continue  # claimed by another process, or gone
+            total -= size
+            dropped += events
+            if segment is not None:
+                self._segments.remove(segment)
+                self._size -= segment[1]
+                self._events -= segment[2]
+        return dropped
+
+    def take(self):
+        """Claim the oldest segment. Returns ``(path, lines)`` or None if the spool is empty.
+
+        The segment is removed from the spool; hand it to release() once its
+        events have been dealt with.
+        """
+        while True:
+            with self._lock:
+                if not self._segments:
+                    return None
+                path, size, events = self._segments.pop(0)
+                self._size -= size
+                self._events -= events
+            claimed = f"{path}.{os.getpid()}"
+            try:
+                os.rename(path, claimed)
+                with open(claimed, "rb") as f:
+                    return claimed, f.read().splitlines()
+            except OSError:
+                continue  # claimed by another process, or gone
+
+    def release(self, claimed, undelivered=()):
+        """Delete a claimed segment, putting back any events that were not delivered."""
+        path = claimed.rsplit(".", 1)[0]
+        if not undelivered:
+            with contextlib.suppress(OSError):
+                os.unlink(claimed)
+            return
+        data = b"".join(line + b"\n" for line in undelivered)
+        with open(claimed, "wb") as f:
+            f.write(data)
+        os.rename(claimed, path)
+        with self._lock:
+            self._segments.insert(0, [path, len(data), len(undelivered)])
+            self._size += len(data)
+            self._events += len(undelivered)
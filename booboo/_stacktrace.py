@@ -1,33 +1,175 @@
 import linecache
+import threading
+from collections import OrderedDict
 
-from ._scrubber import scrub_vars
+from ._inapp import InAppResolver
+from ._repr import bounded_repr
+from ._scrubber import DEFAULT_SCRUBBER
 
 CONTEXT_LINES = 5
+CONTEXT_CACHE_SIZE = 1024
+FRAME_DETAIL = ("full", "no_vars", "bare")
 
 
-def _is_in_app(filename):
-    return "site-packages" not in filename and "/lib/python" not in filename
+_is_in_app = InAppResolver()
 
 
-def extract_frames(exc):
-    """Walk exc.__traceback__, return list of frame dicts with rich context."""
-    frames = []
-    tb = exc.__traceback__
-    while tb is not None:
-        frame = tb.tb_frame
-        lineno = tb.tb_lineno
-        filename = frame.f_code.co_filename
-        function = frame.f_code.co_name
+class _ContextCache:
+    """Bounded LRU of source context windows, keyed by (filename, mtime, lineno).
 
-        context_line = linecache.getline(filename, lineno).rstrip("\n")
+    The mtime is the one linecache recorded when it read the file, so a
+    window is rebuilt whenever linecache reloads a changed file.
+    """
+
+    def __init__(self, size=CONTEXT_CACHE_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
 
+    def get(self, filename, lineno):
+        """Return (context_line, pre_context, post_context) as tuples of stripped lines."""
+        key = (filename, _source_mtime(filename), lineno)
+        with self._lock:
+            window = self._entries.get(key)
+            if window is not None:
+                self._entries.move_to_end(key)
+                return window
         all_lines = linecache.getlines(filename)
         start = max(0, lineno - 1 - CONTEXT_LINES)
         end = min(len(all_lines), lineno + CONTEXT_LINES)
-        pre_context = [line.rstrip("\n") for line in all_lines[start : lineno - 1]]
-        post_context = [line.rstrip("\n") for line in all_lines[lineno:end]]
+        window = (
+            all_lines[lineno - 1].rstrip("\n") if 0 < lineno <= len(all_lines) else "",
+            tuple(line.rstrip("\n") for line in all_lines[start : lineno - 1]),
+            tuple(line.rstrip("\n") for line in all_lines[lineno:end]),
+        )
+        # getlines() may have just loaded the file; key by what it read
+        key = (filename, _source_mtime(filename), lineno)
+        with self._lock:
+            self._entries[key] = window
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return window
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _source_mtime(filename):
+    entry = linecache.cache.get(filename)
+    return entry[1] if entry is not None and len(entry) > 1 else None
+
+
+_context_cache = _ContextCache()
+
+
+class FramePolicy:
+    """What to capture for each frame of a traceback.
+
+    ``in_app`` and ``library`` set the detail for each kind of frame:
+    ``"full"`` (source context and locals), ``"no_vars"`` (source context
+    only) or ``"bare"`` (location only). ``max_frames_with_locals`` caps how
+    many frames of each exception keep their locals, innermost first, and
+    ``max_frames`` keeps only that many frames of a deeper stack, half from
+    each end. ``library_context=False`` drops source context for library
+    frames whatever their detail level. ``is_in_app`` classifies filenames.
+    """
+
+    def __init__(
+        self,
+        in_app="full",
+        library="full",
+        max_frames_with_locals=None,
+        max_frames=None,
+        library_context=True,
+        is_in_app=_is_in_app,
+    ):
+        for name, value in (("in_app_frames", in_app), ("library_frames", library)):
+            if value not in FRAME_DETAIL:
+                raise ValueError(
+                    f"Unsupported {name} {value!r}; use one of {', '.join(FRAME_DETAIL)}"
+                )
+        self.in_app = in_app
+        self.library = library
+        self.max_frames_with_locals = max_frames_with_locals
+        self.max_frames = max_frames
+        self.library_context = library_context
+        self.is_in_app = is_in_app
+
+    def truncate(self, frames):
+        """Drop the middle of ``frames`` if there are more than max_frames."""
+        if self.max_frames is None or len(frames) <= self.max_frames:
+            return frames
+        head = self.max_frames // 2
+        return frames[:head] + frames[len(frames) - (self.max_frames - head) :]
 
-        local_vars = scrub_vars(frame.f_locals)
+    def plan(self, filenames):
+        """Return ``(in_app, with_context, with_vars)`` for each frame, outermost first."""
+        budget = self.max_frames_with_locals
+        plan = []
+        for filename in reversed(filenames):
+            in_app = self.is_in_app(filename)
+            detail = self.in_app if in_app else self.library
+            with_vars = detail == "full" and (budget is None or budget > 0)
+            if with_vars and budget is not None:
+                budget -= 1
+            with_context = detail != "bare" and (in_app or self.library_context)
+            plan.append((in_app, with_context, with_vars))
+        plan.reverse()
+        return plan
+
+
+DEFAULT_FRAME_POLICY = FramePolicy()
+
+
+def snapshot_frames(
+    exc, policy=DEFAULT_FRAME_POLICY, repr_func=bounded_repr, scrubber=DEFAULT_SCRUBBER
+):
+    """Copy what extract_frames needs from exc.__traceback__, and nothing more.
+
+    Meant to run on the thread that raised: it records each frame's location
+    and renders its locals to scrubbed, bounded reprs right away, so the
+    event shows the values as they were when the error was captured and no
+    ``__repr__`` runs on another thread. It reads no source. Frames
+    ``policy`` cuts are skipped, and locals are only rendered for frames that
+    will keep them (``None`` otherwise). Returns a list of
+    (filename, function, lineno, vars).
+    """
+    tracebacks = []
+    tb = exc.__traceback__
+    while tb is not None:
+        tracebacks.append(tb)
+        tb = tb.tb_next
+    tracebacks = policy.truncate(tracebacks)
+    plan = policy.plan([tb.tb_frame.f_code.co_filename for tb in tracebacks])
+
+    frames = []
+    for tb, (_, _, with_vars) in zip(tracebacks, plan):
+        frame = tb.tb_frame
+        code = frame.f_code
+        local_vars = scrubber.scrub_vars(frame.f_locals, repr_func) if with_vars else None
+        frames.append((code.co_filename, code.co_name, tb.tb_lineno, local_vars))
+    return frames
+
+
+def render_frames(snapshot, policy=DEFAULT_FRAME_POLICY):
+    """Build frame dicts with source context from a snapshot.
+
+    Context windows come from a process-wide LRU, so frames seen in earlier
+    captures cost a dict lookup. ``policy`` decides which frames are kept
+    and which get context and locals; frames it leaves bare still have
+    every key, with empty values.
+    """
+    snapshot = policy.truncate(snapshot)
+    plan = policy.plan([frame[0] for frame in snapshot])
+    frames = []
+    for (filename, function, lineno, local_vars), (in_app, with_context, with_vars) in zip(
+        snapshot, plan
+    ):
+        if with_context:
+            context_line, pre_context, post_context = _context_cache.get(filename, lineno)
+        else:
+            context_line, pre_context, post_context = "", (), ()
 
         frames.append(
             {
@@ -35,24 +177,27 @@ def extract_frames(exc):
                 "function": function,
                 "lineno": lineno,
                 "context_line": context_line,
-                "pre_context": pre_context,
-                "post_context": post_context,
-                "vars": local_vars,
-                "in_app": _is_in_app(filename),
+                "pre_context": list(pre_context),
+                "post_context": list(post_context),
+                "vars": dict(local_vars) if with_vars and local_vars else {},
+                "in_app": in_app,
             }
         )
-        tb = tb.tb_next
     return frames
 
 
-def extract_exception_chain(exc):
-    """Walk __cause__ and __context__ to build the full exception chain.
+def extract_frames(exc, repr_func=bounded_repr, policy=DEFAULT_FRAME_POLICY):
+    """Walk exc.__traceback__, return list of frame dicts with rich context."""
+    return render_frames(snapshot_frames(exc, policy, repr_func), policy)
 
-    Returns a list of dicts:
-      - Index 0: the outermost (raised) exception, chain_type=None
-      - Index 1+: causes/contexts, chain_type="cause" or "context"
 
-    The chain is ordered outermost-first so the frontend can reverse for display.
+def snapshot_exception_chain(
+    exc, policy=DEFAULT_FRAME_POLICY, repr_func=bounded_repr, scrubber=DEFAULT_SCRUBBER
+):
+    """Walk __cause__ and __context__, snapshotting each exception's frames.
+
+    Returns a list of (type_name, value, frames_snapshot, chain_type) tuples
+    in the order documented on extract_exception_chain.
     """
     chain = []
     seen = set()
@@ -63,18 +208,11 @@ def extract_exception_chain(exc):
         seen.add(id(current))
 
         try:
-            frames = extract_frames(current)
+            frames = snapshot_frames(current, policy, repr_func, scrubber)
         except Exception:
             frames = []
 
-        chain.append(
-            {
-                "type": type(current).__name__,
-                "value": str(current),
-                "stacktrace": frames,
-                "chain_type": chain_type,
-            }
-        )
+        chain.append((type(current).__name__, str(current), frames, chain_type))
 
         # Follow the chain: __cause__ takes priority (explicit `raise X from Y`)
         if current.__cause__ is not None:
@@ -89,3 +227,34 @@ def extract_exception_chain(exc):
             break
 
     return chain
+
+
+def render_exception_chain(snapshot, policy=DEFAULT_FRAME_POLICY):
+    """Build the exception chain dicts from snapshot_exception_chain() output."""
+    chain = []
+    for type_name, value, frames_snapshot, chain_type in snapshot:
+        try:
+            frames = render_frames(frames_snapshot, policy)
+        except Exception:
+            frames = []
+        chain.append(
+            {
+                "type": type_name,
+                "value": value,
+                "stacktrace": frames,
+                "chain_type": chain_type,
+            }
+        )
+    return chain
+
+
+def extract_exception_chain(exc, repr_func=bounded_repr, policy=DEFAULT_FRAME_POLICY):
+    """Walk __cause__ and __context__ to build the full exception chain.
+
+    Returns a list of dicts:
+      - Index 0: the outermost (raised) exception, chain_type=None
+      - Index 1+: causes/contexts, chain_type="cause" or "context"
+
+    The chain is ordered outermost-first so the frontend can reverse for display.
+    """
+    return render_exception_chain(snapshot_exception_chain(exc, policy, repr_func), policy)
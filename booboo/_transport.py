@@ -0,0 +1,59 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_SIZE = 2
+
+
+class Transport:
+    """Base class for event transports.
+
+    A transport receives an already-encoded request body and is responsible
+    for delivering it to the ingest endpoint. Pass an instance as
+    ``transport=`` to ``booboo.init()`` to replace the default.
+    """
+
+    def send(self, endpoint, body, headers):
+        """POST ``body`` (bytes) to ``endpoint``. Returns the response object."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release pooled connections. Called once the worker has drained."""
+
+    def after_fork(self):
+        """Called in a forked child before it sends anything.
+
+        Connections inherited from the parent must not be reused: both
+        processes would read and write the same socket.
+        """
+
+
+class RequestsTransport(Transport):
+    """Send events over a persistent ``requests.Session``.
+
+    The session keeps up to ``pool_size`` keep-alive connections per host, so
+    consecutive events reuse an open TCP/TLS connection instead of paying a
+    fresh handshake each time.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = self._new_session()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def send(self, endpoint, body, headers):
+        return self._session.post(endpoint, data=body, headers=headers, timeout=self.timeout)
+
+    def close(self):
+        self._session.close()
+
+    def after_fork(self):
+        # Start from an empty pool; the inherited connections belong to the parent.
+        self._session = self._new_session()
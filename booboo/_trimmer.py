@@ -0,0 +1,133 @@
+import json
+
+CONTEXT_KEEP = 1  # source lines kept on each side of the failing line
+FRAMES_KEEP = 10  # frames kept at each end of a collapsed deep stack
+
+
+def _json_size(value):
+    # ensure_ascii (the default) makes character count equal encoded byte count
+    return len(json.dumps(value))
+
+
+def _stacktraces(payload):
+    """Unique stacktrace lists in the payload, with how often each is serialized."""
+    traces = [payload.get("stacktrace") or []]
+    traces += [entry.get("stacktrace") or [] for entry in payload.get("exceptions") or []]
+    return _count_unique(traces)
+
+
+def _frames(payload):
+    """Unique frame dicts in the payload, with how often each is serialized."""
+    result = []
+    for trace, trace_count in _stacktraces(payload):
+        for frame, frame_count in _count_unique(trace):
+            result.append((frame, trace_count * frame_count))
+    return _merge_counts(result)
+
+
+def _count_unique(items):
+    return _merge_counts((item, 1) for item in items)
+
+
+def _merge_counts(pairs):
+    counts = {}
+    order = []
+    for item, count in pairs:
+        key = id(item)
+        if key not in counts:
+            counts[key] = 0
+            order.append(item)
+        counts[key] += count
+    return [(item, counts[id(item)]) for item in order]
+
+
+def _drop_vars(payload, excess, size, in_app):
+    saved = 0
+    for frame, count in _frames(payload):
+        if saved >= excess:
+            break
+        if bool(frame.get("in_app")) is in_app and frame.get("vars"):
+            saved += (size(frame["vars"]) - 2) * count
+            frame["vars"] = {}
+    return saved
+
+
+def _drop_library_vars(payload, excess, size):
+    return _drop_vars(payload, excess, size, in_app=False)
+
+
+def _drop_in_app_vars(payload, excess, size):
+    return _drop_vars(payload, excess, size, in_app=True)
+
+
+def _shorten_context(payload, excess, size):
+    saved = 0
+    frames = _frames(payload)
+    # Library frames lose their context before in-app frames do
+    frames.sort(key=lambda pair: bool(pair[0].get("in_app")))
+    for frame, count in frames:
+        if saved >= excess:
+            break
+        pre = frame.get("pre_context") or []
+        post = frame.get("post_context") or []
+        if len(pre) <= CONTEXT_KEEP and len(post) <= CONTEXT_KEEP:
+            continue
+        new_pre = pre[len(pre) - CONTEXT_KEEP :] if CONTEXT_KEEP else []
+        new_post = post[:CONTEXT_KEEP]
+        saved += (size(pre) + size(post) - size(new_pre) - size(new_post)) * count
+        frame["pre_context"] = new_pre
+        frame["post_context"] = new_post
+    return saved
+
+
+def _collapse_deep_stacks(payload, excess, size):
+    saved = 0
+    for trace, count in _stacktraces(payload):
+        if saved >= excess:
+            break
+        if len(trace) <= 2 * FRAMES_KEEP:
+            continue
+        middle = trace[FRAMES_KEEP:-FRAMES_KEEP]
+        # Brackets off; that also leaves out one separator, so the saving is
+        # never overstated whatever separators the serializer uses
+        saved += (size(middle) - 2) * count
+        del trace[FRAMES_KEEP:-FRAMES_KEEP]
+    return saved
+
+
+def _trim_chain(payload, excess, size):
+    saved = 0
+    chain = payload.get("exceptions") or []
+    # Index 0 is the raised exception; drop the innermost causes first
+    while len(chain) > 1 and saved < excess:
+        saved += size(chain.pop())
+    return saved
+
+
+_STEPS = (
+    _drop_library_vars,
+    _shorten_context,
+    _collapse_deep_stacks,
+    _trim_chain,
+    _drop_in_app_vars,
+)
+
+
+def trim_payload(payload, excess, dumps=None):
+    """Shrink ``payload`` in place by about ``excess`` bytes of encoded JSON.
+
+    Cuts are applied in priority order, least useful data first: library
+    frame ``vars``, then ``pre_context``/``post_context``, then the middle of
+    very deep stacks, then chained exceptions, then in-app frame ``vars``.
+    Each cut is sized on its own, so the event is never re-serialized as a
+    whole while trimming. Sizes are measured with ``dumps``, the serializer
+    the event will be encoded with, or as stdlib JSON if it is None. Returns
+    the estimated bytes still over budget (zero or less means the payload
+    now fits).
+    """
+    size = _json_size if dumps is None else lambda value: len(dumps(value))
+    for step in _STEPS:
+        if excess <= 0:
+            break
+        excess -= step(payload, excess, size)
+    return excess
@@ -0,0 +1,167 @@
+import time
+
+from booboo._aggregator import Aggregator, FingerprintCache, fast_key, fingerprint
+from booboo._stacktrace import snapshot_exception_chain
+
+
+def _snapshot(fn, *args):
+    try:
+        fn(*args)
+    except Exception as exc:
+        return snapshot_exception_chain(exc)
+
+
+def _fail(value):
+    raise ValueError(value)
+
+
+def _fail_type(value):
+    raise TypeError(value)
+
+
+# --- fingerprint ---
+
+
+def test_fingerprint_ignores_message_and_locals():
+    assert fingerprint(_snapshot(_fail, "a")) == fingerprint(_snapshot(_fail, "b"))
+
+
+def test_fingerprint_depends_on_exception_type():
+    assert fingerprint(_snapshot(_fail, "a")) != fingerprint(_snapshot(_fail_type, "a"))
+
+
+def test_fingerprint_depends_on_call_site():
+    def other_site():
+        _fail("a")
+
+    assert fingerprint(_snapshot(_fail, "a")) != fingerprint(_snapshot(other_site))
+
+
+def test_fingerprint_ignores_library_frames():
+    app = ("/app/views.py", "index", 10, {})
+    lib_a = ("/venv/lib/python3.12/site-packages/django/core.py", "handle", 50, {})
+    lib_b = ("/venv/lib/python3.12/site-packages/django/core.py", "handle", 99, {})
+    snap_a = [("ValueError", "x", [lib_a, app], None)]
+    snap_b = [("ValueError", "x", [lib_b, app], None)]
+    assert fingerprint(snap_a) == fingerprint(snap_b)
+
+
+def test_fingerprint_empty_snapshot():
+    assert fingerprint([]) == ""
+
+
+# --- fast_key ---
+
+
+def _exception(fn, *args):
+    try:
+        fn(*args)
+    except Exception as exc:
+        return exc
+
+
+def test_fast_key_equal_for_same_site():
+    assert fast_key(_exception(_fail, "a")) == fast_key(_exception(_fail, "b"))
+
+
+def test_fast_key_differs_by_type_and_site():
+    key = fast_key(_exception(_fail, "a"))
+    assert key != fast_key(_exception(_fail_type, "a"))
+
+    def other_site():
+        _fail("a")
+
+    assert key != fast_key(_exception(other_site))
+
+
+def test_fast_key_without_traceback():
+    assert fast_key(ValueError("x")) == (ValueError, ())
+
+
+# --- FingerprintCache ---
+
+
+def test_cache_get_and_put():
+    cache = FingerprintCache(size=4, ttl=60)
+    assert cache.get("k") is None
+    cache.put("k", "fp")
+    assert cache.get("k") == "fp"
+
+
+def test_cache_evicts_least_recently_used():
+    cache = FingerprintCache(size=2, ttl=60)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_cache_entries_expire():
+    cache = FingerprintCache(size=2, ttl=0.01)
+    cache.put("a", "1")
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+# --- Aggregator ---
+
+
+def test_first_occurrence_is_sent():
+    agg = Aggregator(window=60)
+    assert agg.record("fp", "event-1") is True
+    assert agg.pop_due() == []
+
+
+def test_repeats_within_window_are_folded():
+    agg = Aggregator(window=60)
+    agg.record("fp", "event-1")
+    assert agg.record("fp", "event-2") is False
+    assert agg.record("fp", "event-3") is False
+    assert agg.record("other", "event-4") is True
+
+    assert agg.pop_due() == []  # window still open
+    assert agg.pop_due(flush_all=True) == [("event-3", 2)]
+
+
+def test_closed_window_released_with_repeat_count():
+    agg = Aggregator(window=0.01)
+    agg.record("fp", "event-1")
+    agg.record("fp", "event-2")
+    time.sleep(0.02)
+    assert agg.pop_due() == [("event-2", 1)]
+    assert agg.pop_due() == []
+
+
+def test_new_window_after_expiry_keeps_pending_summary():
+    agg = Aggregator(window=0.01)
+    agg.record("fp", "event-1")
+    agg.record("fp", "event-2")
+    time.sleep(0.02)
+    assert agg.record("fp", "event-3") is True
+    assert agg.pop_due() == [("event-2", 1)]
+
+
+def test_bump_counts_repeat_and_keeps_last_event():
+    agg = Aggregator(window=60)
+    agg.record("fp", "event-1")
+    assert agg.bump("fp") is True
+    assert agg.bump("fp") is True
+    assert agg.pop_due(flush_all=True) == [("event-1", 2)]
+
+
+def test_bump_without_open_window():
+    agg = Aggregator(window=0.01)
+    assert agg.bump("fp") is False
+    agg.record("fp", "event-1")
+    time.sleep(0.02)
+    assert agg.bump("fp") is False
+
+
+def test_window_without_repeats_releases_nothing():
+    agg = Aggregator(window=0.01)
+    agg.record("fp", "event-1")
+    time.sleep(0.02)
+    assert agg.pop_due() == []
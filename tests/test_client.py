@@ -1,9 +1,25 @@
+import asyncio
+import gzip
 import json
-from unittest.mock import patch
+import os
+import queue
+import sys
+import threading
+import time
+import zlib
+from types import SimpleNamespace
 
 import pytest
 
-from booboo._client import BoobooClient
+from booboo._client import _SENTINEL, BoobooClient
+from booboo._transport import RequestsTransport, Transport
+
+
+def _raise_deep(depth):
+    big = "x" * 1_000  # noqa: F841 - captured as a local variable
+    if depth == 0:
+        raise ValueError("deep")
+    _raise_deep(depth - 1)
 
 
 @pytest.fixture
@@ -37,6 +53,31 @@ def test_set_user(client):
     assert client._user == {"id": "42", "email": "test@example.com"}
 
 
+def test_set_user_stores_json_native_values(client):
+    import uuid
+
+    user_id = uuid.uuid4()
+    client.set_user({"id": user_id, "staff": True})
+    assert client._user == {"id": str(user_id), "staff": True}
+
+    client.set_user({"roles": ["admin", user_id], "meta": {"plan": "pro", 1: ("a",)}})
+    assert client._user == {"roles": ["admin", str(user_id)], "meta": {"plan": "pro", "1": ["a"]}}
+
+
+def test_serializer_option_encodes_events():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        serializer=lambda payload: json.dumps(payload, separators=(",", ":")).encode(),
+    )
+    c._do_send({"message": "hi"})
+    body = transport.sent[0][1]
+    assert b'"message":"hi"' in body
+    assert _own(json.loads(body)) == {"message": "hi"}
+
+
 def test_set_user_none(client):
     client.set_user({"id": "42"})
     client.set_user(None)
@@ -62,12 +103,98 @@ def test_capture_and_send_payload_shape(client):
     assert p["message"] == "test error"
     assert p["exception_type"] == "ValueError"
     assert p["level"] == "error"
-    assert p["environment"] == "testing"
     assert isinstance(p["stacktrace"], list)
     assert isinstance(p["exceptions"], list)
-    assert p["tags"] == {"runtime": "python"}
-    assert "sdk" in p["context"]
-    assert "runtime" in p["context"]
+    encoded = json.loads(client._serialize(p))
+    assert encoded["environment"] == "testing"
+    assert encoded["tags"] == {"runtime": "python"}
+    assert "sdk" in encoded["context"]
+    assert "runtime" in encoded["context"]
+
+
+def test_static_context_is_encoded_once():
+    encoded = []
+
+    def dumps(payload):
+        encoded.append(payload)
+        return json.dumps(payload).encode()
+
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", serializer=dumps)
+    queued = []
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = queued.append
+    c.set_user({"id": "7"})
+    encoded.clear()
+    c.capture_message("a")
+    event = json.loads(c._serialize(queued[0]))
+
+    assert event["context"]["user"] == {"id": "7"}
+    assert event["context"]["sdk"]["name"] == "booboo-sdk"
+    assert event["message"] == "a"
+    assert all("sdk" not in p and "tags" not in p for p in encoded)
+
+
+def test_payload_overriding_static_fields_is_merged():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", environment="prod")
+    event = json.loads(
+        c._serialize({"message": "m", "tags": {"x": "1"}, "context": {"runtime": {"name": "PyPy"}}})
+    )
+
+    assert event["tags"] == {"x": "1"}
+    assert event["environment"] == "prod"
+    assert event["context"]["runtime"] == {"name": "PyPy"}
+    assert event["context"]["sdk"]["name"] == "booboo-sdk"
+
+
+def test_in_app_exclude_applies_to_captured_frames():
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", in_app_exclude=[os.path.dirname(__file__)]
+    )
+    payloads = []
+    c._do_send = lambda p: payloads.append(p)
+    c._ensure_worker = lambda: False
+
+    try:
+        raise ValueError("x")
+    except ValueError as exc:
+        c._capture_and_send(exc)
+
+    assert [f["in_app"] for f in payloads[0]["stacktrace"]] == [False]
+
+
+def test_frame_policy_applies_to_captured_frames():
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", in_app_frames="no_vars", max_frames=1
+    )
+    payloads = []
+    c._do_send = lambda p: payloads.append(p)
+    c._ensure_worker = lambda: False
+
+    try:
+        _raise_deep(3)
+    except ValueError as exc:
+        c._capture_and_send(exc)
+
+    (frame,) = payloads[0]["stacktrace"]
+    assert frame["function"] == "_raise_deep"
+    assert frame["vars"] == {}
+    assert "raise ValueError" in frame["context_line"]
+
+
+def test_nested_sensitive_keys_scrubbed_in_captured_locals():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", sensitive_keys=["ssn"])
+    payloads = []
+    c._do_send = lambda p: payloads.append(p)
+    c._ensure_worker = lambda: False
+
+    settings = {"api_token": "t0k", "user": {"ssn": "123-45-6789"}}  # noqa: F841
+    try:
+        raise ValueError("x")
+    except ValueError as exc:
+        c._capture_and_send(exc)
+
+    frame_vars = payloads[0]["stacktrace"][-1]["vars"]
+    assert frame_vars["settings"] == "{'api_token': '[filtered]', 'user': {'ssn': '[filtered]'}}"
 
 
 def test_capture_and_send_sdk_context(client):
@@ -80,11 +207,433 @@ def test_capture_and_send_sdk_context(client):
     except Exception as exc:
         client._capture_and_send(exc)
 
-    ctx = payloads[0]["context"]
+    ctx = json.loads(client._serialize(payloads[0]))["context"]
     assert ctx["sdk"]["name"] == "booboo-sdk"
     assert ctx["runtime"]["name"] == "Python"
 
 
+def test_capture_and_send_extracts_primary_frames_once(client, monkeypatch):
+    from booboo import _stacktrace
+
+    calls = []
+    original = _stacktrace.snapshot_frames
+    monkeypatch.setattr(
+        _stacktrace, "snapshot_frames", lambda e, *args: calls.append(e) or original(e, *args)
+    )
+    payloads = []
+    client._do_send = lambda p: payloads.append(p)
+    client._ensure_worker = lambda: False
+
+    try:
+        raise ValueError("x")
+    except Exception as exc:
+        client._capture_and_send(exc)
+
+    assert len(calls) == 1
+    p = payloads[0]
+    assert p["stacktrace"] is p["exceptions"][0]["stacktrace"]
+    assert p["stacktrace"][-1]["function"] == "test_capture_and_send_extracts_primary_frames_once"
+
+
+def test_capture_and_send_compact_payload():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", compact_payload=True)
+    payloads = []
+    c._do_send = lambda p: payloads.append(p)
+    c._ensure_worker = lambda: False
+
+    try:
+        raise ValueError("x")
+    except Exception as exc:
+        c._capture_and_send(exc)
+
+    p = payloads[0]
+    assert p["stacktrace"] == []
+    assert p["stacktrace_ref"] == 0
+    assert len(p["exceptions"][0]["stacktrace"]) >= 1
+
+
+def test_capture_and_send_uses_configured_repr_limits():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", max_repr_length=20)
+    payloads = []
+    c._do_send = lambda p: payloads.append(p)
+    c._ensure_worker = lambda: False
+
+    big = list(range(1_000_000))  # noqa: F841 - captured local
+    try:
+        raise ValueError("x")
+    except Exception as exc:
+        c._capture_and_send(exc)
+
+    frame_vars = payloads[0]["stacktrace"][-1]["vars"]
+    assert len(frame_vars["big"]) <= 20
+    assert frame_vars["big"].startswith("[0, 1, 2")
+
+
+def test_capture_defers_rendering_to_worker(client):
+    queued = []
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = queued.append
+
+    def bad():
+        items = [1, 2]  # noqa: F841 - captured local
+        raise ValueError("deferred")
+
+    try:
+        bad()
+    except Exception as exc:
+        client._capture_and_send(exc)
+
+    assert len(queued) == 1
+    assert callable(queued[0])
+    payload = queued[0]()
+    assert payload["message"] == "deferred"
+    assert payload["stacktrace"][-1]["vars"]["items"] == "[1, 2]"
+    assert "raise ValueError" in payload["stacktrace"][-1]["context_line"]
+
+
+def test_deferred_capture_snapshots_locals(client):
+    queued = []
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = queued.append
+
+    value = "before"
+    try:
+        raise ValueError("x")
+    except Exception as exc:
+        client._capture_and_send(exc)
+    value = "after"  # noqa: F841 - rebinding after capture must not leak into the event
+
+    assert queued[0]()["stacktrace"][-1]["vars"]["value"] == "'before'"
+
+
+def test_deferred_capture_renders_locals_before_mutation(client):
+    queued = []
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = queued.append
+
+    items = [1, 2]
+    try:
+        raise ValueError("x")
+    except Exception as exc:
+        client._capture_and_send(exc)
+    items.append(3)
+
+    assert queued[0]()["stacktrace"][-1]["vars"]["items"] == "[1, 2]"
+
+
+def test_defer_capture_false_builds_on_calling_thread():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", defer_capture=False)
+    queued = []
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = queued.append
+
+    try:
+        raise ValueError("eager")
+    except Exception as exc:
+        c._capture_and_send(exc)
+
+    assert isinstance(queued[0], dict)
+    assert queued[0]["message"] == "eager"
+
+
+def test_worker_builds_deferred_events():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    try:
+        raise ValueError("via worker")
+    except Exception as exc:
+        c._capture_and_send(exc)
+    c._flush()
+
+    assert len(transport.sent) == 1
+    assert json.loads(transport.sent[0][1])["message"] == "via worker"
+
+
+# --- _capture_asgi ---
+
+
+_SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/boom",
+    "query_string": b"a=1",
+    "headers": [(b"authorization", b"Bearer x"), (b"accept", b"text/html")],
+    "server": ("example.com", 443),
+    "scheme": "https",
+    "client": ("10.0.0.1", 5000),
+}
+
+
+def test_capture_asgi_defers_request_extraction(client):
+    queued = []
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = queued.append
+    client.set_user({"id": "7"})
+
+    async def handler():
+        try:
+            raise ValueError("async boom")
+        except Exception as exc:
+            client._capture_asgi(exc, _SCOPE)
+
+    asyncio.run(handler())
+
+    assert callable(queued[0])
+    payload = queued[0]()
+    assert payload["message"] == "async boom"
+    assert payload["request"]["url"] == "https://example.com:443/boom?a=1"
+    assert payload["request"]["headers"]["authorization"] == "[filtered]"
+    assert payload["context"]["user"] == {"id": "7", "ip_address": "10.0.0.1"}
+
+
+def test_capture_asgi_renders_only_innermost_locals(client):
+    queued = []
+    client._ensure_worker = lambda: True
+    client._queue.put_nowait = queued.append
+    try:
+        _raise_deep(10)
+    except ValueError as exc:
+        client._capture_asgi(exc, _SCOPE)
+
+    frames = queued[0]()["stacktrace"]
+    client_module = sys.modules["booboo._client"]
+    with_vars = [bool(frame["vars"]) for frame in frames]
+    assert with_vars[-client_module.LOOP_FRAMES_WITH_LOCALS :] == [True] * 3
+    assert not any(with_vars[: -client_module.LOOP_FRAMES_WITH_LOCALS])
+
+
+def test_capture_asgi_defers_even_when_defer_capture_off():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", defer_capture=False)
+    queued = []
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = queued.append
+
+    async def handler():
+        try:
+            raise ValueError("x")
+        except Exception as exc:
+            c._capture_asgi(exc, _SCOPE)
+
+    asyncio.run(handler())
+    assert callable(queued[0])
+
+
+def test_capture_asgi_without_worker_sends_on_executor(client):
+    payloads = []
+    client._ensure_worker = lambda: False
+    loop_thread = []
+
+    def fake_send(payload):
+        loop_thread.append(threading.current_thread())
+        payloads.append(payload)
+
+    client._do_send = fake_send
+
+    async def handler():
+        try:
+            raise ValueError("x")
+        except Exception as exc:
+            client._capture_asgi(exc, _SCOPE)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(handler())
+    assert len(payloads) == 1
+    assert loop_thread[0] is not threading.main_thread()
+
+
+def test_capture_asgi_respects_ignore_errors():
+    c = BoobooClient("dsn", ignore_errors=[ValueError], endpoint="https://example.com/ingest/")
+    queued = []
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = queued.append
+    c._capture_asgi(ValueError("ignored"), _SCOPE)
+    assert queued == []
+
+
+# --- async_mode ---
+
+
+class FakeAsyncTransport:
+    def __init__(self, *statuses):
+        self.sent = []
+        self.statuses = list(statuses)
+        self.closed = False
+
+    async def send(self, endpoint, body, headers):
+        self.sent.append((endpoint, body, headers))
+        status = self.statuses.pop(0) if self.statuses else 202
+        return SimpleNamespace(status_code=status, headers={})
+
+    async def close(self):
+        self.closed = True
+
+
+def _async_client(transport, **kwargs):
+    return BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=FakeTransport(),
+        async_mode=True,
+        async_transport=transport,
+        **kwargs,
+    )
+
+
+def test_async_mode_sends_from_the_running_loop():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport)
+
+    async def handler():
+        try:
+            raise ValueError("async boom")
+        except Exception as exc:
+            c._capture_asgi(exc, _SCOPE)
+        c.capture_message("hello")
+        await c._drain_async()
+
+    asyncio.run(handler())
+
+    assert not c._worker_started
+    assert [json.loads(body)["message"] for _, body, _ in transport.sent] == [
+        "async boom",
+        "hello",
+    ]
+    assert transport.sent[0][2]["X-Booboo-DSN"] == "dsn"
+    assert transport.closed
+    assert c.stats()["sent"] == 2
+
+
+def test_async_mode_batches_queued_events():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport, batch_size=10)
+
+    async def handler():
+        for i in range(3):
+            c.capture_message(f"m{i}")
+        await c._drain_async()
+
+    asyncio.run(handler())
+
+    assert len(transport.sent) == 1
+    assert transport.sent[0][2]["Content-Type"] == "application/x-ndjson"
+    assert c.stats()["sent"] == 3
+
+
+def test_async_mode_retries_overload():
+    transport = FakeAsyncTransport(503, 202)
+    c = _async_client(transport, retry_backoff=0.001)
+
+    async def handler():
+        c.capture_message("hello")
+        await c._drain_async()
+
+    asyncio.run(handler())
+
+    assert len(transport.sent) == 2
+    assert c.stats()["sent"] == 1
+
+
+def test_async_mode_keeps_a_sender_per_loop():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport)
+    both_started = threading.Barrier(2)
+    senders = []
+
+    async def handler(name):
+        for i in range(5):
+            c.capture_message(f"{name} {i}")
+        senders.append(c._async[asyncio.get_running_loop()][1])
+        both_started.wait()
+        await c._drain_async()
+
+    threads = [threading.Thread(target=asyncio.run, args=(handler(name),)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(senders)) == 2
+    assert all(sender.done() for sender in senders)
+    assert c._async == {}
+    assert c.stats()["sent"] == 10
+
+
+def test_async_mode_hands_closed_loops_leftovers_to_the_worker():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport)
+
+    async def stalled():
+        c._async_worker = lambda q: asyncio.sleep(0)  # sender never runs
+        c.capture_message("left behind")
+
+    asyncio.run(stalled())
+    del c._async_worker
+
+    async def handler():
+        c.capture_message("next loop")
+        await c._drain_async()
+
+    asyncio.run(handler())
+    _wait_for(lambda: c.transport.sent)
+    c._flush()
+
+    assert c._async == {}
+    assert json.loads(c.transport.sent[0][1])["message"] == "left behind"
+    assert json.loads(transport.sent[0][1])["message"] == "next loop"
+
+
+def test_async_mode_outside_a_loop_uses_the_worker_thread():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport)
+    c.capture_message("sync")
+    _wait_for(lambda: c.transport.sent)
+    c._flush()
+
+    assert transport.sent == []
+    assert json.loads(c.transport.sent[0][1])["message"] == "sync"
+
+
+def test_async_mode_leftovers_go_to_the_worker_at_exit():
+    transport = FakeAsyncTransport()
+    c = _async_client(transport)
+
+    async def handler():
+        c._async_worker = lambda q: asyncio.sleep(0)  # sender never runs
+        c.capture_message("late")
+
+    asyncio.run(handler())
+    c._flush()
+
+    assert json.loads(c.transport.sent[0][1])["message"] == "late"
+    assert c.stats()["enqueued"] == 1
+
+
+def test_asgi_lifespan_shutdown_drains_async_sender():
+    import booboo
+    from booboo._middleware import BoobooASGIMiddleware
+
+    transport = FakeAsyncTransport()
+    booboo._client = _async_client(transport)
+    sent_messages = []
+
+    async def app(scope, receive, send):
+        booboo._client.capture_message("during shutdown")
+        await send({"type": "lifespan.shutdown.complete"})
+
+    async def send(message):
+        sent_messages.append((message["type"], len(transport.sent)))
+
+    async def receive():
+        return {"type": "lifespan.shutdown"}
+
+    try:
+        asyncio.run(BoobooASGIMiddleware(app)({"type": "lifespan"}, receive, send))
+    finally:
+        booboo._client = None
+
+    assert sent_messages == [("lifespan.shutdown.complete", 1)]
+
+
 def test_capture_and_send_with_request_data(client):
     payloads = []
     client._do_send = lambda p: payloads.append(p)
@@ -145,33 +694,1096 @@ def test_capture_and_send_no_user(client):
 # --- _do_send ---
 
 
-@patch("requests.post")
-def test_do_send_correct_headers(mock_post, client):
+def _own(event):
+    """An encoded event without the static context, tags and environment."""
+    event = dict(event)
+    del event["tags"], event["environment"]
+    context = {k: v for k, v in event.pop("context").items() if k not in ("sdk", "runtime")}
+    if context:
+        event["context"] = context
+    return event
+
+
+class FakeTransport(Transport):
+    def __init__(self, error=None, status=202, batch_status=None):
+        self.sent = []
+        self.error = error
+        self.status = status
+        self.batch_status = batch_status
+        self.closed = False
+
+    def send(self, endpoint, body, headers):
+        if self.error:
+            raise self.error
+        self.sent.append((endpoint, body, headers))
+        status = self.status
+        if self.batch_status and headers["Content-Type"] == "application/x-ndjson":
+            status = self.batch_status
+        return SimpleNamespace(status_code=status)
+
+    def close(self):
+        self.closed = True
+
+
+def test_do_send_correct_headers(client):
+    client.transport = FakeTransport()
     payload = {"message": "test", "level": "error"}
     client._do_send(payload)
 
-    mock_post.assert_called_once()
-    call_kwargs = mock_post.call_args
-    assert call_kwargs.kwargs["headers"] == {
+    assert len(client.transport.sent) == 1
+    endpoint, body, headers = client.transport.sent[0]
+    assert endpoint == "https://example.com/ingest/"
+    assert headers == {
         "X-Booboo-DSN": "test-dsn-123",
         "Content-Type": "application/json",
     }
-    assert json.loads(call_kwargs.kwargs["data"]) == payload
+    assert _own(json.loads(body)) == payload
 
 
-@patch("requests.post")
-def test_do_send_drops_oversized(mock_post, client):
+def test_do_send_drops_oversized(client):
+    client.transport = FakeTransport()
     payload = {"message": "x" * 200_000}
     client._do_send(payload)
-    mock_post.assert_not_called()
+    assert client.transport.sent == []
 
 
-@patch("requests.post", side_effect=ConnectionError("fail"))
-def test_do_send_swallows_errors(mock_post, client):
+def test_do_send_trims_oversized_event_instead_of_dropping():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, max_payload_size=20_000
+    )
+    c._ensure_worker = lambda: False
+    try:
+        _raise_deep(60)
+    except ValueError as exc:
+        c._capture_and_send(exc)
+
+    assert len(transport.sent) == 1
+    _, body, _ = transport.sent[0]
+    assert len(body) <= 20_000
+    assert json.loads(body)["message"] == "deep"
+
+
+def test_non_ascii_event_trimmed_to_fit_with_orjson():
+    pytest.importorskip("orjson")
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        serializer="orjson",
+        max_payload_size=30_000,
+    )
+    frames = [
+        {"filename": f"/app/m{i}.py", "function": "f", "lineno": 1, "vars": {"v": "é" * 1000}}
+        for i in range(20)
+    ]
+    c._do_send({"context": {}, "message": "m", "stacktrace": frames, "exceptions": []})
+
+    assert len(transport.sent) == 1
+    assert len(transport.sent[0][1]) <= 30_000
+
+
+def test_do_send_swallows_errors(client):
+    client.transport = FakeTransport(error=ConnectionError("fail"))
     # Should not raise
     client._do_send({"message": "test"})
 
 
+# --- transport ---
+
+
+def test_default_transport_is_pooled_session():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", pool_size=7, timeout=2)
+    assert isinstance(c.transport, RequestsTransport)
+    assert c.transport.pool_size == 7
+    assert c.transport.timeout == 2
+    c._flush()
+
+
+def test_custom_transport_is_used():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    assert c.transport is transport
+    c._do_send({"message": "hi"})
+    assert len(transport.sent) == 1
+    c._flush()
+
+
+def test_flush_closes_transport():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    c._do_send = lambda p: None
+    c.capture_message("hi")
+    c._flush()
+    assert transport.closed is True
+
+
+# --- fork safety ---
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_worker_restarts_in_forked_child():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    c.capture_message("parent")
+    _wait_for(lambda: transport.sent)
+    assert c._worker_started
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        try:
+            os.close(read_fd)
+            transport.sent.clear()
+            c.capture_message("child")
+            c._flush()
+            messages = [json.loads(body)["message"] for _, body, _ in transport.sent]
+            os.write(write_fd, json.dumps(messages).encode("utf-8"))
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        output = pipe.read()
+    os.waitpid(pid, 0)
+    c._flush()
+
+    assert json.loads(output) == ["child"]
+
+
+def test_pid_change_resets_worker_state(client):
+    client._ensure_worker()
+    old_queue, old_lock, old_workers = client._queue, client._lock, client._workers
+    old_queue.put_nowait({"message": "parent event"})
+    client._pid = -1  # simulate running in a forked child
+
+    assert client._ensure_worker() is True
+    assert client._pid == os.getpid()
+    assert client._queue is not old_queue
+    assert client._queue.maxsize == old_queue.maxsize
+    assert client._queue.empty()
+    assert client._lock is not old_lock
+    assert client._workers != old_workers
+    old_queue.put_nowait(_SENTINEL)
+
+
+def test_requests_transport_gets_fresh_session_after_fork():
+    transport = RequestsTransport()
+    session = transport._session
+    transport.after_fork()
+    assert transport._session is not session
+
+
+# --- queue overflow and stats ---
+
+
+def _stalled_client(**kwargs):
+    """A client whose worker is considered running but never drains the queue."""
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", **kwargs)
+    c._ensure_worker = lambda: True
+    return c
+
+
+def _queued_messages(c):
+    return [c._queue.get_nowait()["message"] for _ in range(c._queue.qsize())]
+
+
+def test_queue_size_is_configurable():
+    c = _stalled_client(queue_size=3)
+    assert c._queue.maxsize == 3
+
+
+def test_drop_newest_policy():
+    c = _stalled_client(queue_size=2)
+    for i in range(4):
+        c.capture_message(str(i))
+    assert _queued_messages(c) == ["0", "1"]
+    assert c.stats()["enqueued"] == 2
+    assert c.stats()["dropped_queue_full"] == 2
+
+
+def test_drop_oldest_policy():
+    c = _stalled_client(queue_size=2, overflow_policy="drop_oldest")
+    for i in range(4):
+        c.capture_message(str(i))
+    assert _queued_messages(c) == ["2", "3"]
+    assert c.stats()["enqueued"] == 4
+    assert c.stats()["dropped_queue_full"] == 2
+
+
+def test_drop_oldest_never_evicts_sentinel():
+    c = _stalled_client(queue_size=1, overflow_policy="drop_oldest")
+    c._queue.put_nowait(_SENTINEL)
+    c.capture_message("late")
+    assert c._queue.get_nowait() is _SENTINEL
+    assert c.stats()["dropped_queue_full"] == 1
+
+
+def test_block_policy_waits_then_drops():
+    c = _stalled_client(queue_size=1, overflow_policy="block", overflow_timeout=0.05)
+    c.capture_message("first")
+    start = time.monotonic()
+    c.capture_message("second")
+    assert time.monotonic() - start >= 0.05
+    assert _queued_messages(c) == ["first"]
+    assert c.stats()["dropped_queue_full"] == 1
+
+
+def test_block_policy_succeeds_when_worker_drains():
+    c = _stalled_client(queue_size=1, overflow_policy="block", overflow_timeout=2)
+    c.capture_message("first")
+    threading.Timer(0.05, c._queue.get_nowait).start()
+    c.capture_message("second")
+    assert _queued_messages(c) == ["second"]
+    assert c.stats()["dropped_queue_full"] == 0
+
+
+def test_block_policy_does_not_block_event_loop_callers():
+    c = _stalled_client(queue_size=1, overflow_policy="block", overflow_timeout=5)
+    c.capture_message("first")
+    start = time.monotonic()
+    c._capture_asgi(ValueError("x"), {"type": "http"})
+    assert time.monotonic() - start < 1
+    assert c.stats()["dropped_queue_full"] == 1
+
+
+def test_unknown_overflow_policy_rejected():
+    with pytest.raises(ValueError):
+        BoobooClient("dsn", endpoint="https://example.com/ingest/", overflow_policy="spill")
+
+
+def test_stats_count_sent_failed_and_oversize():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    c._do_send({"message": "ok"})
+    c._do_send({"message": "x" * 200_000})
+    transport.error = ConnectionError("down")
+    c._do_send({"message": "fails"})
+
+    stats = c.stats()
+    assert stats["sent"] == 1
+    assert stats["dropped_oversize"] == 1
+    assert stats["send_failed"] == 1
+
+
+def test_stats_count_batches():
+    transport = FakeTransport()
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": "a"}, {"message": "b"}, {"message": "x" * 200_000}])
+    assert c.stats()["sent"] == 2
+    assert c.stats()["dropped_oversize"] == 1
+
+    transport.error = ConnectionError("down")
+    c._do_send_batch([{"message": "a"}, {"message": "b"}])
+    assert c.stats()["send_failed"] == 2
+
+
+def test_stats_returns_copy(client):
+    client.stats()["sent"] = 99
+    assert client.stats()["sent"] == 0
+
+
+# --- retries and backoff ---
+
+
+class ScriptedTransport(FakeTransport):
+    """Answers with the given statuses (or raises given exceptions) in turn."""
+
+    def __init__(self, *responses, headers=None):
+        super().__init__()
+        self.responses = list(responses)
+        self.headers = headers or {}
+        self.attempts = 0
+
+    def send(self, endpoint, body, headers):
+        self.attempts += 1
+        response = self.responses.pop(0) if self.responses else 202
+        if isinstance(response, Exception):
+            raise response
+        self.sent.append((endpoint, body, headers))
+        return SimpleNamespace(status_code=response, headers=self.headers)
+
+
+def _retrying_client(transport, **kwargs):
+    kwargs.setdefault("retry_backoff", 0.001)
+    return BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, **kwargs
+    )
+
+
+def test_worker_retries_overload_until_accepted():
+    transport = ScriptedTransport(503, ConnectionError("reset"), 429, 202)
+    c = _retrying_client(transport)
+    c.capture_message("hello")
+    _wait_for(lambda: c.stats()["sent"] == 1)
+    c._flush()
+
+    assert transport.attempts == 4
+    assert c.stats()["send_failed"] == 0
+    assert c._backoff_until == 0.0
+
+
+def test_worker_gives_up_after_max_retries():
+    transport = ScriptedTransport(*[ConnectionError("down")] * 10)
+    c = _retrying_client(transport, max_retries=2)
+    c.capture_message("hello")
+    _wait_for(lambda: c.stats()["send_failed"] == 1)
+    c._flush()
+
+    assert transport.attempts == 3
+
+
+def test_client_errors_are_not_retried():
+    transport = ScriptedTransport(400)
+    c = _retrying_client(transport)
+    c.capture_message("bad")
+    _wait_for(lambda: c.stats()["send_failed"] == 1)
+    c._flush()
+
+    assert transport.attempts == 1
+    assert c._backoff_until == 0.0
+
+
+def test_retry_after_sets_backoff_and_drops_new_events(monkeypatch):
+    transport = ScriptedTransport(429, headers={"Retry-After": "30"})
+    c = _retrying_client(transport)
+    c._do_send({"message": "throttled"})  # off the worker: one attempt, no sleep
+
+    assert transport.attempts == 1
+    assert c.stats()["send_failed"] == 1
+    assert 25 < c._backoff_until - time.monotonic() <= 30
+
+    client_module = sys.modules["booboo._client"]
+    monkeypatch.setattr(
+        client_module, "snapshot_exception_chain", lambda *args: pytest.fail("captured")
+    )
+    try:
+        _raise_same("x")
+    except ValueError as exc:
+        c._capture_and_send(exc)
+    c.capture_message("also dropped")
+    assert c.stats()["dropped_backoff"] == 2
+    assert c.stats()["enqueued"] == 0
+
+
+def test_retry_after_parsing():
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    retry_after = sys.modules["booboo._client"]._retry_after
+
+    def resp(value):
+        return SimpleNamespace(headers={"Retry-After": value})
+
+    assert retry_after(resp("2")) == 2.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 < retry_after(resp(later)) <= 60
+    assert retry_after(resp("soon")) is None
+    assert retry_after(SimpleNamespace(status_code=503)) is None
+
+
+def test_flush_interrupts_backoff_wait():
+    transport = ScriptedTransport(503, headers={"Retry-After": "3600"})
+    c = _retrying_client(transport)
+    c.capture_message("hello")
+    _wait_for(lambda: transport.attempts == 1)
+    started = time.monotonic()
+    c._flush()
+
+    assert time.monotonic() - started < 2
+    assert not any(w.is_alive() for w in c._workers)
+
+
+# --- flush / close ---
+
+
+def test_flush_waits_for_queued_events():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    for i in range(5):
+        c.capture_message(f"m{i}")
+
+    assert c.flush(2) == 0
+    assert len(transport.sent) == 5
+    assert c._workers[0].is_alive()  # flush does not stop the worker
+    c._flush()
+
+
+def test_flush_returns_events_left_at_deadline():
+    release = threading.Event()
+
+    class BlockedTransport(FakeTransport):
+        def send(self, endpoint, body, headers):
+            release.wait(2)
+            return super().send(endpoint, body, headers)
+
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=BlockedTransport())
+    for i in range(3):
+        c.capture_message(f"m{i}")
+
+    started = time.monotonic()
+    assert c.flush(0.05) == 3  # one in flight, two queued
+    assert time.monotonic() - started < 1
+    release.set()
+    c._flush()
+
+
+def test_flush_sends_open_aggregation_windows():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, aggregate_window=60
+    )
+    for i in range(3):
+        try:
+            _raise_same(f"attempt {i}")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+
+    assert c.flush(2) == 0
+    assert [json.loads(body).get("occurrences") for _, body, _ in transport.sent] == [None, 2]
+    c._flush()
+
+
+def test_flush_counts_events_on_asyncio_queues():
+    c = _async_client(FakeAsyncTransport())
+
+    async def handler():
+        c._async_worker = lambda q: asyncio.sleep(0)  # sender never runs
+        c.capture_message("queued on the loop")
+        assert c.flush(0) == 1
+
+    asyncio.run(handler())
+
+
+def test_flush_without_worker_returns_zero(client):
+    assert client.flush(0) == 0
+
+
+def test_close_stops_workers_and_later_events_send_synchronously():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport, workers=2)
+    c.capture_message("before")
+    workers = list(c._workers)
+
+    assert c.close(2) == 0
+    assert not any(w.is_alive() for w in workers)
+    assert transport.closed
+
+    c.capture_message("after")
+    assert [json.loads(body)["message"] for _, body, _ in transport.sent] == ["before", "after"]
+    assert c.close() == 0  # idempotent, e.g. from atexit
+
+
+def test_close_does_not_wait_out_backoff():
+    transport = ScriptedTransport(503, headers={"Retry-After": "3600"})
+    c = _retrying_client(transport)
+    c.capture_message("first")
+    _wait_for(lambda: transport.attempts == 1)
+    c.capture_message("second")  # dropped: backing off
+
+    started = time.monotonic()
+    c.close(5)
+    assert time.monotonic() - started < 2
+
+
+def test_sigterm_handler_closes_then_chains():
+    import signal
+
+    calls = []
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: calls.append("previous"))
+    try:
+        c = BoobooClient(
+            "dsn",
+            endpoint="https://example.com/ingest/",
+            transport=FakeTransport(),
+            handle_sigterm=True,
+        )
+        c.close = lambda timeout=None: calls.append(threading.current_thread())
+        c._install_sigterm_handler()
+        assert signal.getsignal(signal.SIGTERM) == c._on_sigterm
+
+        c._on_sigterm(signal.SIGTERM, None)
+        assert len(calls) == 2
+        assert calls[0] is not threading.current_thread()  # close() runs off the handler
+        assert calls[1] == "previous"
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+# --- worker pool ---
+
+
+def test_workers_share_the_queue_and_stop_on_flush():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport, workers=3)
+    for i in range(10):
+        c.capture_message(f"m{i}")
+    workers = list(c._workers)
+    c._flush()
+
+    assert len(workers) == 3
+    assert not any(w.is_alive() for w in workers)
+    assert sorted(json.loads(body)["message"] for _, body, _ in transport.sent) == sorted(
+        f"m{i}" for i in range(10)
+    )
+
+
+def test_slow_response_does_not_block_other_workers():
+    release = threading.Event()
+
+    class SlowFirstTransport(FakeTransport):
+        def send(self, endpoint, body, headers):
+            if b"slow" in body:
+                release.wait(2)
+            return super().send(endpoint, body, headers)
+
+    transport = SlowFirstTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport, workers=2)
+    c.capture_message("slow")
+    c.capture_message("fast")
+    _wait_for(lambda: transport.sent)
+    release.set()
+    c._flush()
+
+    assert json.loads(transport.sent[0][1])["message"] == "fast"
+    assert len(transport.sent) == 2
+
+
+def test_default_transport_pools_a_connection_per_worker():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", workers=4)
+    assert c.transport.pool_size == 4
+    c._flush()
+
+
+# --- spool ---
+
+
+def _spool_lines(directory):
+    lines = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "rb") as f:
+            lines += f.read().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_undeliverable_events_are_spooled(tmp_path):
+    transport = ScriptedTransport(*[ConnectionError("down")] * 3)
+    c = _retrying_client(transport, spool_dir=str(tmp_path))
+    c._do_send({"message": "lost?"})
+
+    assert c.stats()["spooled"] == 1
+    assert c.stats()["send_failed"] == 0
+    assert [_own(e) for e in _spool_lines(tmp_path)] == [{"message": "lost?"}]
+
+
+def test_rejected_events_are_not_spooled(tmp_path):
+    c = _retrying_client(ScriptedTransport(400), spool_dir=str(tmp_path))
+    c._do_send({"message": "bad"})
+
+    assert c.stats()["send_failed"] == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_spool_replayed_when_worker_starts(tmp_path):
+    _retrying_client(ScriptedTransport(503), spool_dir=str(tmp_path))._do_send(
+        {"message": "from last run"}
+    )
+
+    transport = ScriptedTransport()
+    c = _retrying_client(transport, spool_dir=str(tmp_path))
+    c.capture_message("new")
+    _wait_for(lambda: c.stats()["sent"] == 2)
+    c._flush()
+
+    messages = [json.loads(body)["message"] for _, body, _ in transport.sent]
+    assert sorted(messages) == ["from last run", "new"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_spool_replayed_in_batches(tmp_path):
+    c = _retrying_client(ScriptedTransport(), spool_dir=str(tmp_path), batch_size=10)
+    c._spool.write([json.dumps({"message": str(i)}).encode() for i in range(15)])
+    c._maybe_replay_spool()
+
+    assert [h["Content-Type"] for _, _, h in c.transport.sent] == ["application/x-ndjson"] * 2
+    assert c.stats()["sent"] == 15
+    assert len(c._spool) == 0
+
+
+def test_queue_overflow_spills_to_spool(tmp_path):
+    c = _retrying_client(FakeTransport(), spool_dir=str(tmp_path), queue_size=1)
+    c._ensure_worker = lambda: True
+    c._enqueue({"message": "queued"})
+    c._enqueue({"message": "spilled"})
+
+    assert c.stats()["spooled"] == 1
+    assert c.stats()["dropped_queue_full"] == 0
+    assert [_own(e) for e in _spool_lines(tmp_path)] == [{"message": "spilled"}]
+
+
+def test_events_captured_during_outage_are_spooled(tmp_path):
+    transport = ScriptedTransport(429, headers={"Retry-After": "30"})
+    c = _retrying_client(transport, spool_dir=str(tmp_path))
+    c._do_send({"message": "throttled"})  # starts a 30s backoff
+
+    for i in range(10):
+        try:
+            _raise_same(str(i))
+        except ValueError as exc:
+            c._capture_and_send(exc)
+        c.capture_message(f"message {i}")
+    _wait_for(lambda: c.stats()["spooled"] == 21)
+    c._flush()
+
+    assert transport.attempts == 1
+    assert c.stats()["dropped_backoff"] == 0
+    assert len(_spool_lines(tmp_path)) == 21
+
+
+def test_no_disk_writes_when_sends_succeed(tmp_path):
+    transport = FakeTransport()
+    c = _retrying_client(transport, spool_dir=str(tmp_path))
+    for i in range(5):
+        c.capture_message(str(i))
+    _wait_for(lambda: c.stats()["sent"] == 5)
+    c._flush()
+
+    assert os.listdir(tmp_path) == []
+
+
+# --- aggregation ---
+
+
+def _raise_same(value):
+    raise ValueError(value)
+
+
+def test_aggregation_sends_first_and_summarizes_repeats():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, aggregate_window=60
+    )
+    for i in range(50):
+        try:
+            _raise_same(f"attempt {i}")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+    c._flush()
+
+    sent = [json.loads(body) for _, body, _ in transport.sent]
+    assert len(sent) == 2
+    assert sent[0]["message"] == "attempt 0"
+    assert "occurrences" not in sent[0]
+    # Repeats were recognised before capture, so the summary reuses the first event
+    assert sent[1]["message"] == "attempt 0"
+    assert sent[1]["occurrences"] == 49
+    assert c.stats()["aggregated"] == 49
+
+
+def test_aggregation_without_fingerprint_cache_summarizes_latest():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        aggregate_window=60,
+        fingerprint_cache_size=0,
+    )
+    assert c._fingerprints is None
+    for i in range(5):
+        try:
+            _raise_same(f"attempt {i}")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+    c._flush()
+
+    sent = [json.loads(body) for _, body, _ in transport.sent]
+    assert sent[1]["message"] == "attempt 4"
+    assert sent[1]["occurrences"] == 4
+
+
+def test_fingerprint_cache_skips_snapshot_for_repeats(monkeypatch):
+    # booboo._client the attribute is the global client; fetch the module itself
+    client_module = sys.modules["booboo._client"]
+    calls = []
+    original = client_module.snapshot_exception_chain
+    monkeypatch.setattr(
+        client_module,
+        "snapshot_exception_chain",
+        lambda e, *args: calls.append(e) or original(e, *args),
+    )
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=FakeTransport(),
+        aggregate_window=60,
+    )
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = lambda event: None
+    for _ in range(10):
+        try:
+            _raise_same("x")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+
+    assert len(calls) == 1
+    assert c.stats()["aggregated"] == 9
+
+
+def test_fingerprint_cache_ttl_defaults_to_window():
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", aggregate_window=30)
+    assert c._fingerprints.ttl == 30
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        aggregate_window=30,
+        fingerprint_cache_size=8,
+        fingerprint_cache_ttl=5,
+    )
+    assert (c._fingerprints.size, c._fingerprints.ttl) == (8, 5)
+
+
+def test_aggregation_flushes_closed_windows_while_idle():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, aggregate_window=0.05
+    )
+    for _ in range(3):
+        try:
+            _raise_same("x")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+    _wait_for(lambda: len(transport.sent) == 2)
+    assert json.loads(transport.sent[1][1])["occurrences"] == 2
+    c._flush()
+
+
+def test_aggregation_off_by_default(client):
+    assert client._aggregator is None
+
+
+# --- sampling and rate limiting ---
+
+
+def _counting_client(monkeypatch, **kwargs):
+    """Client whose enqueued events and snapshots are counted, not sent."""
+    client_module = sys.modules["booboo._client"]
+    snapshots = []
+    original = client_module.snapshot_exception_chain
+    monkeypatch.setattr(
+        client_module,
+        "snapshot_exception_chain",
+        lambda e, *args: snapshots.append(e) or original(e, *args),
+    )
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", **kwargs)
+    c._ensure_worker = lambda: True
+    c._queue.put_nowait = lambda event: None
+    return c, snapshots
+
+
+def test_sample_rate_zero_skips_capture(monkeypatch):
+    c, snapshots = _counting_client(monkeypatch, sample_rate=0.0)
+    for _ in range(5):
+        try:
+            _raise_same("x")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+
+    assert snapshots == []
+    assert c.stats()["sampled_out"] == 5
+    assert c.stats()["enqueued"] == 0
+
+
+def test_sample_rate_keeps_a_share(monkeypatch):
+    client_module = sys.modules["booboo._client"]
+    rolls = iter([0.1, 0.9, 0.2, 0.8])
+    monkeypatch.setattr(client_module.random, "random", lambda: next(rolls))
+    c, snapshots = _counting_client(monkeypatch, sample_rate=0.5)
+    for _ in range(4):
+        try:
+            _raise_same("x")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+
+    assert len(snapshots) == 2
+    assert c.stats()["sampled_out"] == 2
+
+
+def test_rate_limit_per_exception_type(monkeypatch):
+    c, snapshots = _counting_client(monkeypatch, rate_limit=0.001, rate_limit_burst=2)
+    for exc in [ValueError("a"), ValueError("b"), ValueError("c"), KeyError("d")]:
+        c._capture_and_send(exc)
+
+    assert [type(e) for e in snapshots] == [ValueError, ValueError, KeyError]
+    assert c.stats()["rate_limited"] == 1
+
+
+def test_rate_limit_by_fingerprint_separates_call_sites(monkeypatch):
+    def other_site(value):
+        raise ValueError(value)
+
+    c, snapshots = _counting_client(
+        monkeypatch, rate_limit=0.001, rate_limit_burst=1, rate_limit_by="fingerprint"
+    )
+    for fn in (_raise_same, _raise_same, other_site):
+        try:
+            fn("x")
+        except ValueError as exc:
+            c._capture_and_send(exc)
+
+    assert len(snapshots) == 2
+    assert c.stats()["rate_limited"] == 1
+
+
+def test_rate_limit_by_rejects_unknown_value():
+    with pytest.raises(ValueError, match="rate_limit_by"):
+        BoobooClient("dsn", endpoint="https://example.com/ingest/", rate_limit_by="path")
+
+
+def test_rate_limit_off_by_default(client):
+    assert client._rate_limiter is None
+    assert client.sample_rate == 1.0
+
+
+# --- compression ---
+
+
+def _incompressible(n):
+    return "".join(chr(0x4E00 + (i * 7919) % 20000) for i in range(n))
+
+
+def test_gzip_compression_sets_content_encoding():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, compression="gzip"
+    )
+    c._do_send({"message": "hello"})
+
+    _, body, headers = transport.sent[0]
+    assert headers["Content-Encoding"] == "gzip"
+    assert _own(json.loads(gzip.decompress(body))) == {"message": "hello"}
+
+
+def test_zlib_compression_is_sent_as_deflate():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, compression="zlib"
+    )
+    c._do_send({"message": "hello"})
+
+    _, body, headers = transport.sent[0]
+    assert headers["Content-Encoding"] == "deflate"
+    assert _own(json.loads(zlib.decompress(body))) == {"message": "hello"}
+
+
+def test_no_content_encoding_by_default(client):
+    client.transport = FakeTransport()
+    client._do_send({"message": "hello"})
+    _, _, headers = client.transport.sent[0]
+    assert "Content-Encoding" not in headers
+
+
+def test_unknown_compression_rejected():
+    with pytest.raises(ValueError):
+        BoobooClient("dsn", endpoint="https://example.com/ingest/", compression="brotli")
+
+
+def test_size_limit_applies_to_compressed_body():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, compression="gzip"
+    )
+    # 200KB of repetitive text compresses far below the limit
+    c._do_send({"message": "x" * 200_000})
+    assert len(transport.sent) == 1
+
+
+def test_compressed_body_over_limit_is_dropped():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        compression="gzip",
+        max_payload_size=1_000,
+    )
+    c._do_send({"message": _incompressible(2_000)})
+    assert transport.sent == []
+
+
+def test_max_payload_size_is_configurable():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn", endpoint="https://example.com/ingest/", transport=transport, max_payload_size=500_000
+    )
+    c._do_send({"message": "x" * 200_000})
+    assert len(transport.sent) == 1
+
+
+def test_batch_body_is_compressed_once():
+    transport = FakeTransport()
+    c = BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        batch_size=10,
+        compression="gzip",
+    )
+    c._do_send_batch([{"message": "a"}, {"message": "b"}])
+
+    _, body, headers = transport.sent[0]
+    assert headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(body).split(b"\n")
+    assert [_own(json.loads(line)) for line in lines] == [{"message": "a"}, {"message": "b"}]
+
+
+# --- batching ---
+
+
+def _batching_client(transport, batch_size=10):
+    return BoobooClient(
+        "dsn",
+        endpoint="https://example.com/ingest/",
+        transport=transport,
+        batch_size=batch_size,
+        batch_timeout=0.01,
+    )
+
+
+def test_worker_sends_one_request_per_event_by_default():
+    transport = FakeTransport()
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", transport=transport)
+    for i in range(3):
+        c._queue.put_nowait({"message": str(i)})
+    c._ensure_worker()
+    c._flush()
+    assert len(transport.sent) == 3
+    assert all(h["Content-Type"] == "application/json" for _, _, h in transport.sent)
+
+
+def test_worker_batches_queued_events():
+    transport = FakeTransport()
+    c = _batching_client(transport)
+    for i in range(5):
+        c._queue.put_nowait({"message": str(i)})
+    c._ensure_worker()
+    c._flush()
+
+    assert len(transport.sent) == 1
+    _, body, headers = transport.sent[0]
+    assert headers["Content-Type"] == "application/x-ndjson"
+    messages = [json.loads(line)["message"] for line in body.split(b"\n")]
+    assert messages == ["0", "1", "2", "3", "4"]
+
+
+def test_next_batch_respects_batch_size():
+    c = _batching_client(FakeTransport(), batch_size=3)
+    for i in range(5):
+        c._queue.put_nowait({"message": str(i)})
+    assert len(c._next_batch()) == 3
+    assert len(c._next_batch()) == 2
+
+
+def test_next_batch_stops_at_sentinel():
+    c = _batching_client(FakeTransport())
+    c._queue.put_nowait({"message": "a"})
+    c._queue.put_nowait(_SENTINEL)
+    c._queue.put_nowait({"message": "b"})
+    assert c._next_batch() == [{"message": "a"}, _SENTINEL]
+
+
+def test_next_batch_waits_at_most_batch_timeout():
+    c = _batching_client(FakeTransport())
+    c._queue.put_nowait({"message": "a"})
+    assert c._next_batch() == [{"message": "a"}]
+    with pytest.raises(queue.Empty):
+        c._queue.get_nowait()
+
+
+def test_batch_falls_back_to_per_event_when_unsupported():
+    transport = FakeTransport(batch_status=415)
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": "a"}, {"message": "b"}])
+
+    content_types = [h["Content-Type"] for _, _, h in transport.sent]
+    assert content_types == ["application/x-ndjson", "application/json", "application/json"]
+    assert c._batching_supported is False
+
+    # Subsequent batches go straight to per-event requests
+    transport.sent.clear()
+    c._do_send_batch([{"message": "c"}, {"message": "d"}])
+    assert [h["Content-Type"] for _, _, h in transport.sent] == ["application/json"] * 2
+
+
+def test_batches_are_split_to_stay_under_the_body_limit(monkeypatch):
+    monkeypatch.setattr(sys.modules["booboo._client"], "MAX_BATCH_BYTES", 1000)
+    transport = FakeTransport()
+    c = _batching_client(transport)
+    c.max_payload_size = 1000
+    c._do_send_batch([{"message": "x" * 300} for _ in range(6)])
+
+    assert len(transport.sent) == 3
+    assert all(len(body) <= 1000 for _, body, _ in transport.sent)
+    assert c.stats()["sent"] == 6
+
+
+class _StatusByBody(FakeTransport):
+    """Answers batches with ``batch_status`` and single events by their message."""
+
+    def send(self, endpoint, body, headers):
+        self.sent.append((endpoint, body, headers))
+        if headers["Content-Type"] == "application/x-ndjson":
+            status = self.batch_status(body) if callable(self.batch_status) else self.batch_status
+        else:
+            status = 400 if b"bad" in body else 202
+        return SimpleNamespace(status_code=status)
+
+
+def test_batch_too_large_is_halved_without_disabling_batching():
+    transport = _StatusByBody(batch_status=lambda body: 413 if body.count(b"\n") >= 2 else 202)
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": str(i)} for i in range(4)])
+
+    sizes = [body.count(b"\n") + 1 for _, body, _ in transport.sent]
+    assert sizes == [4, 2, 2]
+    assert c.stats()["sent"] == 4
+    assert c._batching_supported is True
+
+
+def test_batch_rejected_for_one_bad_event_keeps_batching():
+    transport = _StatusByBody(batch_status=400)
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": "good"}, {"message": "bad"}])
+
+    assert c.stats()["sent"] == 1
+    assert c.stats()["send_failed"] == 1
+    assert c._batching_supported is True
+
+
+def test_batch_rejected_but_every_event_accepted_disables_batching():
+    transport = _StatusByBody(batch_status=400)
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": "a"}, {"message": "b"}])
+
+    assert c.stats()["sent"] == 2
+    assert c._batching_supported is False
+
+
+def test_batch_skips_oversized_events():
+    transport = FakeTransport()
+    c = _batching_client(transport)
+    c._do_send_batch([{"message": "x" * 200_000}, {"message": "ok"}])
+    _, body, _ = transport.sent[0]
+    assert _own(json.loads(body)) == {"message": "ok"}
+
+
 # --- capture_exception ---
 
 
@@ -228,10 +1840,11 @@ def test_capture_message_payload_shape(client):
     assert p["level"] == "info"
     assert p["stacktrace"] == []
     assert p["exceptions"] == []
-    assert p["environment"] == "testing"
-    assert p["tags"] == {"runtime": "python"}
-    assert "sdk" in p["context"]
-    assert "runtime" in p["context"]
+    encoded = json.loads(client._serialize(p))
+    assert encoded["environment"] == "testing"
+    assert encoded["tags"] == {"runtime": "python"}
+    assert "sdk" in encoded["context"]
+    assert "runtime" in encoded["context"]
 
 
 def test_capture_message_custom_level(client):
@@ -0,0 +1,46 @@
+import json
+
+import requests
+
+from booboo._inapp import InAppResolver
+
+
+def test_installed_packages_are_not_in_app():
+    resolver = InAppResolver()
+    assert resolver(requests.__file__) is False
+    assert resolver("/srv/app/.venv/lib/python3.12/site-packages/django/core/handlers.py") is False
+    assert resolver("/usr/lib/python3/dist-packages/yaml/__init__.py") is False
+
+
+def test_stdlib_is_not_in_app():
+    resolver = InAppResolver()
+    assert resolver(json.__file__) is False
+    assert resolver("/opt/python/lib/python3.11/asyncio/events.py") is False
+    assert resolver("<frozen importlib._bootstrap>") is False
+
+
+def test_application_code_is_in_app():
+    resolver = InAppResolver()
+    assert resolver(__file__) is True
+    assert resolver("/home/user/myproject/app.py") is True
+    assert resolver("/home/user/lib/pythonic/app.py") is True
+    assert resolver("<stdin>") is True
+
+
+def test_include_and_exclude_prefixes():
+    resolver = InAppResolver(
+        include=["/srv/app/.venv/lib/python3.12/site-packages/mycompany"],
+        exclude=["/home/user/myproject/vendor"],
+    )
+    assert resolver("/srv/app/.venv/lib/python3.12/site-packages/mycompany/models.py") is True
+    assert resolver("/srv/app/.venv/lib/python3.12/site-packages/mycompany_other/x.py") is False
+    assert resolver("/home/user/myproject/vendor/lib.py") is False
+    assert resolver("/home/user/myproject/app.py") is True
+
+
+def test_results_memoized_per_filename():
+    resolver = InAppResolver()
+    resolver("/home/user/myproject/app.py")
+    resolver._classify = lambda filename: False
+    assert resolver("/home/user/myproject/app.py") is True
+    assert resolver("/home/user/myproject/other.py") is False
@@ -0,0 +1,110 @@
+import importlib.util
+import sys
+
+import pytest
+
+from booboo._client import BoobooClient
+from booboo._integrations import INTEGRATIONS, ImportWatcher, resolve_integrations, watcher
+
+
+@pytest.fixture
+def package_dir(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in [m for m in sys.modules if m.startswith("booboo_fake")]:
+        del sys.modules[name]
+
+
+def test_watch_runs_callback_after_module_import(package_dir):
+    (package_dir / "booboo_fake_a.py").write_text("VALUE = 42\n")
+    watcher = ImportWatcher()
+    seen = []
+    watcher.watch("booboo_fake_a", lambda module: seen.append(module.VALUE))
+
+    assert seen == []
+    assert watcher in sys.meta_path
+    import booboo_fake_a  # noqa: F401
+
+    assert seen == [42]
+    assert watcher not in sys.meta_path
+
+
+def test_find_spec_probe_does_not_use_up_the_callback(package_dir):
+    (package_dir / "booboo_fake_probe.py").write_text("VALUE = 7\n")
+    watcher = ImportWatcher()
+    seen = []
+    watcher.watch("booboo_fake_probe", lambda module: seen.append(module.VALUE))
+
+    assert importlib.util.find_spec("booboo_fake_probe") is not None
+    assert seen == []
+    assert watcher in sys.meta_path
+    import booboo_fake_probe  # noqa: F401
+
+    assert seen == [7]
+    assert watcher not in sys.meta_path
+
+
+def test_watch_runs_callback_now_for_imported_module():
+    watcher = ImportWatcher()
+    seen = []
+    watcher.watch("json", seen.append)
+
+    assert seen == [sys.modules["json"]]
+    assert watcher not in sys.meta_path
+
+
+def test_watch_never_imports_the_module(package_dir):
+    (package_dir / "booboo_fake_b.py").write_text("")
+    watcher = ImportWatcher()
+    watcher.watch("booboo_fake_b", lambda module: None)
+
+    assert "booboo_fake_b" not in sys.modules
+    sys.meta_path.remove(watcher)
+
+
+def test_failing_callback_does_not_break_the_import(package_dir):
+    (package_dir / "booboo_fake_c.py").write_text("VALUE = 1\n")
+    watcher = ImportWatcher()
+    watcher.watch("booboo_fake_c", lambda module: 1 / 0)
+
+    import booboo_fake_c
+
+    assert booboo_fake_c.VALUE == 1
+
+
+def test_resolve_integrations():
+    assert resolve_integrations() == tuple(INTEGRATIONS)
+    assert resolve_integrations(["flask"]) == ("flask",)
+    assert resolve_integrations([]) == ()
+    with pytest.raises(ValueError, match="bottle"):
+        resolve_integrations(["bottle"])
+
+
+def test_install_patches_flask_once_it_is_imported(package_dir, monkeypatch):
+    monkeypatch.setitem(INTEGRATIONS, "flask", "booboo_fake_flask")
+    (package_dir / "booboo_fake_flask.py").write_text(
+        "class Flask:\n    def __init__(self, name):\n        self.name = name\n"
+    )
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", integrations=["flask"])
+    installed = []
+    c._install_flask = installed.append
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    c.install()
+
+    assert "booboo_fake_flask" not in sys.modules
+    import booboo_fake_flask
+
+    app = booboo_fake_flask.Flask("app")
+    assert installed == [app]
+    c._flush()
+
+
+def test_install_skips_integrations_not_selected(monkeypatch):
+    watched = []
+    monkeypatch.setattr(watcher, "watch", lambda name, callback: watched.append(name))
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    c = BoobooClient("dsn", endpoint="https://example.com/ingest/", integrations=["fastapi"])
+    c.install()
+
+    assert watched == ["fastapi"]
+    c._flush()
@@ -84,3 +84,47 @@ def test_capture_message_delegates():
 def test_capture_message_noop_when_uninitialized():
     # Should not raise
     booboo.capture_message("hello")
+
+
+# --- stats ---
+
+
+def test_stats_delegates():
+    booboo.init("dsn", endpoint="https://example.com/ingest/", queue_size=5)
+    assert booboo._client._queue.maxsize == 5
+    assert booboo.stats() == booboo._client.stats()
+    assert booboo.stats()["enqueued"] == 0
+
+
+def test_stats_empty_when_uninitialized():
+    assert booboo.stats() == {}
+
+
+# --- flush / close ---
+
+
+def test_flush_and_close_delegate():
+    booboo.init("dsn", endpoint="https://example.com/ingest/")
+    booboo._client.flush = lambda timeout=None: ("flush", timeout)
+    booboo._client.close = lambda timeout=None: ("close", timeout)
+    assert booboo.flush(2) == ("flush", 2)
+    assert booboo.close() == ("close", None)
+
+
+def test_flush_and_close_noop_when_uninitialized():
+    assert booboo.flush() == 0
+    assert booboo.close() == 0
+
+
+def test_async_transport_is_exported():
+    from booboo._async_transport import AsyncTransport
+
+    assert booboo.AsyncTransport is AsyncTransport
+
+
+def test_init_defaults_match_client():
+    import inspect
+
+    init_params = inspect.signature(booboo.init).parameters
+    for name, param in inspect.signature(BoobooClient).parameters.items():
+        assert init_params[name].default == param.default, name
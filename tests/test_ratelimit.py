@@ -0,0 +1,47 @@
+from booboo import _ratelimit
+from booboo._ratelimit import RateLimiter
+
+
+def test_allows_burst_then_limits():
+    limiter = RateLimiter(rate=1, burst=3)
+    assert [limiter.allow("a") for _ in range(4)] == [True, True, True, False]
+
+
+def test_keys_have_separate_buckets():
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.allow("a")
+    assert not limiter.allow("a")
+    assert limiter.allow("b")
+
+
+def test_tokens_refill_over_time(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(_ratelimit.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter(rate=2, burst=1)
+    assert limiter.allow("a")
+    assert not limiter.allow("a")
+    now[0] += 0.5
+    assert limiter.allow("a")
+
+
+def test_burst_defaults_to_rate():
+    assert RateLimiter(rate=5).burst == 5
+    assert RateLimiter(rate=0.1).burst == 1
+
+
+def test_number_of_buckets_is_bounded():
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    for key in "abc":
+        limiter.allow(key)
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def test_busy_bucket_is_not_evicted():
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    assert limiter.allow("hot")
+    limiter.allow("a")
+    assert not limiter.allow("hot")  # touched again, so "a" is now the oldest
+    limiter.allow("b")
+
+    assert list(limiter._buckets) == ["hot", "b"]
+    assert not limiter.allow("hot")  # still rate limited, no fresh burst
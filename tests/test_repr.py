@@ -0,0 +1,114 @@
+from collections import OrderedDict, defaultdict, deque, namedtuple
+
+from booboo._repr import BoundedRepr, bounded_repr
+
+
+def test_small_values_match_builtin_repr():
+    for value in (42, "tom", 1.5, None, [1, 2], {"a": 1}, (1,), {1, 2}, b"ab"):
+        assert bounded_repr(value) == repr(value)
+
+
+def test_output_capped_at_max_length():
+    assert len(bounded_repr("x" * 10_000)) <= 200
+    assert len(BoundedRepr(max_length=50).repr(list(range(100)))) <= 50
+
+
+def test_long_string_keeps_prefix():
+    r = bounded_repr("abc" + "x" * 10_000)
+    assert r.startswith("'abcxxx")
+    assert r.endswith("...")
+
+
+def test_large_bytes_sliced_before_repr():
+    r = bounded_repr(b"\x00" * 10_000_000)
+    assert r.startswith("b'\\x00")
+    assert len(r) <= 200
+
+
+def test_large_list_truncated_to_max_items():
+    r = BoundedRepr(max_items=3).repr(list(range(1_000_000)))
+    assert r == "[0, 1, 2, ...]"
+
+
+def test_large_dict_not_sorted_and_truncated():
+    d = {i: i for i in range(100_000, 0, -1)}
+    r = BoundedRepr(max_items=2).repr(d)
+    assert r == "{100000: 100000, 99999: 99999, ...}"
+
+
+def test_depth_limited():
+    nested = [[[[[1]]]]]
+    assert BoundedRepr(max_depth=2).repr(nested) == "[[[...]]]"
+
+
+def test_large_dict_subclass_is_bounded():
+    r = BoundedRepr(max_items=2).repr(OrderedDict((i, i) for i in range(1_000)))
+    assert r == "OrderedDict({0: 0, 1: 1, ...})"
+    r = BoundedRepr(max_items=2).repr(defaultdict(list, {i: [] for i in range(1_000)}))
+    assert r == "defaultdict({0: [], 1: [], ...})"
+
+
+def test_small_container_subclass_is_bounded():
+    assert bounded_repr(OrderedDict(a=1)) == "OrderedDict({'a': 1})"
+    r = BoundedRepr(max_items=2).repr(defaultdict(list, rows=list(range(3_000_000))))
+    assert r == "defaultdict({'rows': [0, 1, ...]})"
+
+
+def test_namedtuple_rendered_field_by_field():
+    Row = namedtuple("Row", "id items")
+    r = BoundedRepr(max_items=2).repr(Row(1, list(range(3_000_000))))
+    assert r == "Row(id=1, items=[0, 1, ...])"
+
+
+def test_tuple_and_deque_subclasses_are_bounded():
+    class Pair(tuple):
+        pass
+
+    class Window(deque):
+        pass
+
+    assert BoundedRepr(max_items=2).repr(Pair(range(1_000))) == "Pair((0, 1, ...))"
+    assert BoundedRepr(max_items=2).repr(Window(range(1_000))) == "Window([0, 1, ...])"
+
+
+def test_str_and_bytes_subclasses_are_sliced():
+    class SafeString(str):
+        def __repr__(self):
+            raise AssertionError("full repr built")
+
+    class Blob(bytes):
+        pass
+
+    r = BoundedRepr(max_length=20).repr(SafeString("x" * 10_000_000))
+    assert r.startswith("SafeString('xxx")
+    assert len(r) <= 20
+    assert bounded_repr(Blob(b"ab")) == "Blob(b'ab')"
+
+
+def test_failing_repr_nested_in_container():
+    class BadRepr:
+        def __repr__(self):
+            raise RuntimeError("boom")
+
+    assert bounded_repr([1, BadRepr()]) == "[1, <BadRepr>]"
+
+
+def test_long_custom_repr_truncated():
+    class Chatty:
+        def __repr__(self):
+            return "c" * 1_000
+
+    r = bounded_repr(Chatty())
+    assert len(r) == 200
+    assert r.endswith("...")
+
+
+def test_sensitive_dict_values_not_rendered():
+    class Exploding:
+        def __repr__(self):
+            raise AssertionError("sensitive value repr'd")
+
+    r = BoundedRepr(is_sensitive=lambda key: key == "token").repr(
+        {"token": Exploding(), 1: "a", "user": {"token": "x"}}
+    )
+    assert r == "{'token': '[filtered]', 1: 'a', 'user': {'token': '[filtered]'}}"
@@ -1,4 +1,7 @@
-from booboo._scrubber import scrub_headers, scrub_vars
+from collections import OrderedDict, defaultdict
+
+from booboo._repr import BoundedRepr
+from booboo._scrubber import Scrubber, scrub_headers, scrub_vars
 
 # --- scrub_headers ---
 
@@ -80,3 +83,80 @@ def test_scrub_vars_sensitive_pattern_case_insensitive():
     result = scrub_vars({"SECRET_TOKEN": "abc", "Password": "xyz"})
     assert result["SECRET_TOKEN"] == "[filtered]"
     assert result["Password"] == "[filtered]"
+
+
+# --- Scrubber ---
+
+
+def test_scrubber_extra_keys_and_headers():
+    scrubber = Scrubber(keys=["ssn"], headers=["X-Internal"])
+    assert scrubber.scrub_vars({"user_ssn": "1", "name": "tom"}) == {
+        "user_ssn": "[filtered]",
+        "name": "'tom'",
+    }
+    assert scrubber.scrub_headers({"X-Internal": "1", "Accept": "*/*"}) == {
+        "X-Internal": "[filtered]",
+        "Accept": "*/*",
+    }
+
+
+def test_scrubber_caches_key_verdicts():
+    scrubber = Scrubber()
+    scrubber.is_sensitive_key("password")
+    scrubber._key_pattern = None  # a cached verdict never reaches the pattern
+    assert scrubber.is_sensitive_key("password") is True
+
+
+def test_scrubber_verdict_cache_is_bounded():
+    scrubber = Scrubber(cache_size=2)
+    for key in ("a", "b", "c"):
+        scrubber.is_sensitive_key(key)
+    assert len(scrubber._keys) <= 2
+
+
+def test_scrub_values_card_numbers_with_luhn_check():
+    result = scrub_vars({"note": "card 4111 1111 1111 1111 declined", "order": 4111111111111112})
+    assert result["note"] == "'card [filtered] declined'"
+    assert result["order"] == "4111111111111112"
+
+
+def test_scrub_values_bearer_tokens():
+    result = scrub_headers({"X-Upstream": "Bearer abc.def-123"})
+    assert result == {"X-Upstream": "Bearer [filtered]"}
+
+
+def test_scrubber_extra_value_patterns():
+    scrubber = Scrubber(values=[r"sk_live_\w+"])
+    assert scrubber.scrub_vars({"msg": "key sk_live_abc"}) == {"msg": "'key [filtered]'"}
+
+
+def test_scrub_raw_headers_skips_decoding_sensitive_values():
+    class Undecodable(bytes):
+        def decode(self, *args):
+            raise AssertionError("sensitive value decoded")
+
+    result = Scrubber().scrub_raw_headers(
+        [(b"authorization", Undecodable(b"Bearer x")), (b"accept", b"text/html")]
+    )
+    assert result == {"authorization": "[filtered]", "accept": "text/html"}
+
+
+def test_nested_dict_keys_scrubbed_during_repr():
+    scrubber = Scrubber()
+    repr_func = BoundedRepr(is_sensitive=scrubber.is_sensitive_key).repr
+    result = scrubber.scrub_vars({"config": {"db_password": "hunter2", "host": "db"}}, repr_func)
+    assert result["config"] == "{'db_password': '[filtered]', 'host': 'db'}"
+
+
+def test_nested_keys_scrubbed_in_dict_subclasses():
+    scrubber = Scrubber()
+    repr_func = BoundedRepr(is_sensitive=scrubber.is_sensitive_key).repr
+    result = scrubber.scrub_vars(
+        {
+            "ordered": OrderedDict(db_password="hunter2"),
+            "default": defaultdict(str, db_password="hunter2"),
+        },
+        repr_func,
+    )
+    assert result["ordered"] == "OrderedDict({'db_password': '[filtered]'})"
+    assert result["default"] == "defaultdict({'db_password': '[filtered]'})"
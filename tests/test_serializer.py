@@ -0,0 +1,60 @@
+import json
+import sys
+
+import pytest
+
+from booboo._serializer import _json_dumps, resolve_serializer
+
+
+def _event():
+    return {
+        "message": "café closed",
+        "level": "error",
+        "stacktrace": [{"lineno": 3, "vars": {"x": "[1, 2]"}, "in_app": True}],
+        "context": {"user": None},
+        "occurrences": 2,
+    }
+
+
+@pytest.mark.parametrize("name", ["auto", "json", "orjson"])
+def test_backends_produce_equivalent_json(name):
+    if name == "orjson":
+        pytest.importorskip("orjson")
+    data = resolve_serializer(name)(_event())
+    assert isinstance(data, bytes)
+    assert json.loads(data) == _event()
+
+
+def test_auto_prefers_orjson():
+    orjson = pytest.importorskip("orjson")
+    assert resolve_serializer()({"a": 1}) == orjson.dumps({"a": 1})
+
+
+def test_fast_backend_falls_back_on_values_it_rejects():
+    pytest.importorskip("orjson")
+    payload = {"vars": {"name": "'\udcff.txt'"}, "id": 2**70}
+    assert json.loads(resolve_serializer("orjson")(payload)) == payload
+
+
+def test_auto_falls_back_to_stdlib(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "ujson", None)
+    assert resolve_serializer() is _json_dumps
+
+
+def test_missing_named_backend_raises(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ujson", None)
+    with pytest.raises(ImportError):
+        resolve_serializer("ujson")
+
+
+def test_callable_used_as_is():
+    def dumps(payload):
+        return b"{}"
+
+    assert resolve_serializer(dumps) is dumps
+
+
+def test_unknown_serializer_rejected():
+    with pytest.raises(ValueError, match="serializer"):
+        resolve_serializer("pickle")
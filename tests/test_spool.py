@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from booboo import _spool
+from booboo._spool import Spool
+
+
+def test_write_and_take_roundtrip(tmp_path):
+    spool = Spool(str(tmp_path))
+    spool.write([b'{"a": 1}', b'{"b": 2}'])
+    assert len(spool) == 2
+
+    claimed, lines = spool.take()
+    assert lines == [b'{"a": 1}', b'{"b": 2}']
+    assert len(spool) == 0
+    spool.release(claimed)
+    assert os.listdir(tmp_path) == []
+    assert spool.take() is None
+
+
+def test_segments_rotate_and_are_taken_oldest_first(tmp_path):
+    spool = Spool(str(tmp_path), segment_size=10)
+    spool.write([b"first-event"])
+    spool.write([b"second-event"])
+    assert len(os.listdir(tmp_path)) == 2
+
+    assert spool.take()[1] == [b"first-event"]
+    assert spool.take()[1] == [b"second-event"]
+
+
+def test_oldest_segments_dropped_over_max_size(tmp_path):
+    spool = Spool(str(tmp_path), max_size=30, segment_size=10)
+    assert spool.write([b"a" * 12]) == 0
+    assert spool.write([b"b" * 12]) == 0
+    assert spool.write([b"c" * 12]) == 1
+    assert len(spool) == 2
+    assert spool.take()[1] == [b"b" * 12]
+
+
+def test_release_puts_undelivered_back(tmp_path):
+    spool = Spool(str(tmp_path))
+    spool.write([b"1", b"2", b"3"])
+    claimed, lines = spool.take()
+    spool.release(claimed, lines[1:])
+
+    assert len(spool) == 2
+    assert spool.take()[1] == [b"2", b"3"]
+
+
+def test_existing_segments_loaded_on_start(tmp_path):
+    Spool(str(tmp_path)).write([b"1", b"2"])
+    spool = Spool(str(tmp_path))
+    assert len(spool) == 2
+    assert spool.take()[1] == [b"1", b"2"]
+
+
+def test_segment_claimed_elsewhere_is_skipped(tmp_path):
+    first = Spool(str(tmp_path))
+    first.write([b"1"])
+    second = Spool(str(tmp_path))
+
+    assert first.take() is not None
+    assert second.take() is None
+
+
+def test_after_fork_starts_empty_and_writes_own_segment(tmp_path, monkeypatch):
+    spool = Spool(str(tmp_path))
+    spool.write([b"parent"])
+    (parent_segment,) = os.listdir(tmp_path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "listdir", lambda path: pytest.fail("directory rescanned"))
+        spool.after_fork()
+    assert len(spool) == 0
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "getpid", lambda: 424242)
+        spool.write([b"child"])
+
+    child_segment = (set(os.listdir(tmp_path)) - {parent_segment}).pop()
+    assert child_segment.endswith("-424242.ndjson")
+    assert (tmp_path / parent_segment).read_bytes() == b"parent\n"
+    assert spool.take()[1] == [b"child"]
+
+
+def test_max_size_applies_to_the_whole_directory(tmp_path, monkeypatch):
+    spools = []
+    for pid in range(5):
+        monkeypatch.setattr(os, "getpid", lambda pid=pid: 1000 + pid)
+        spool = Spool(str(tmp_path), max_size=1000)
+        spool.after_fork()  # each process only knows its own segments
+        spool.write([b"x" * 99] * 5)
+        spools.append(spool)
+
+    sizes = [os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)]
+    assert sum(sizes) <= 1000
+    assert len(spools[-1]) == 5
+
+
+def test_refresh_picks_up_other_processes_segments(tmp_path, monkeypatch):
+    parent = Spool(str(tmp_path))
+    parent.after_fork()
+    Spool(str(tmp_path)).write([b"from a child"])
+
+    parent.refresh()
+    assert len(parent) == 0  # scanned too recently
+    monkeypatch.setattr(_spool, "RESCAN_INTERVAL", 0)
+    parent.refresh()
+    assert parent.take()[1] == [b"from a child"]
+
+
+def test_stale_claims_are_put_back(tmp_path, monkeypatch):
+    Spool(str(tmp_path)).write([b"abandoned"])
+    (name,) = os.listdir(tmp_path)
+    claimed = tmp_path / f"{name}.999999"
+    os.rename(tmp_path / name, claimed)
+    os.utime(claimed, (0, 0))
+    monkeypatch.setattr(_spool, "_pid_alive", lambda pid: False)
+
+    spool = Spool(str(tmp_path))
+    assert spool.take()[1] == [b"abandoned"]
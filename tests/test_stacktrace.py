@@ -1,6 +1,18 @@
+import linecache
+import os
+
 import pytest
 
-from booboo._stacktrace import _is_in_app, extract_exception_chain, extract_frames
+from booboo._stacktrace import (
+    FramePolicy,
+    _is_in_app,
+    extract_exception_chain,
+    extract_frames,
+    render_exception_chain,
+    render_frames,
+    snapshot_exception_chain,
+    snapshot_frames,
+)
 
 # --- _is_in_app ---
 
@@ -109,6 +121,156 @@ def test_extract_frames_nested_calls():
     assert "inner" in funcs
 
 
+# --- snapshot_frames / render_frames ---
+
+
+def test_snapshot_frames_renders_locals():
+    def bad():
+        data = [1]
+        raise ValueError(data)
+
+    try:
+        bad()
+    except Exception as exc:
+        snapshot = snapshot_frames(exc)
+
+    filename, function, lineno, local_vars = snapshot[-1]
+    assert function == "bad"
+    assert filename == __file__
+    assert isinstance(lineno, int)
+    assert local_vars == {"data": "[1]"}
+
+
+def test_render_frames_matches_extract_frames():
+    def bad():
+        x = 42  # noqa: F841 - captured local
+        raise ValueError("same")
+
+    try:
+        bad()
+    except Exception as exc:
+        assert render_frames(snapshot_frames(exc))[-1] == extract_frames(exc)[-1]
+
+
+def test_snapshot_exception_chain_shape():
+    try:
+        try:
+            raise KeyError("original")
+        except KeyError as orig:
+            raise ValueError("wrapper") from orig
+    except Exception as exc:
+        snapshot = snapshot_exception_chain(exc)
+
+    assert [(t, v, c) for t, v, _, c in snapshot] == [
+        ("ValueError", "wrapper", None),
+        ("KeyError", "'original'", "cause"),
+    ]
+    chain = render_exception_chain(snapshot)
+    assert [entry["type"] for entry in chain] == ["ValueError", "KeyError"]
+    assert chain[0]["stacktrace"][-1]["function"] == "test_snapshot_exception_chain_shape"
+
+
+# --- source context cache ---
+
+
+def _write_source(tmp_path, lines):
+    path = tmp_path / "module.py"
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return str(path)
+
+
+def test_context_cache_reuses_windows(tmp_path, monkeypatch):
+    filename = _write_source(tmp_path, [f"line {i}" for i in range(1, 21)])
+    snapshot = [(filename, "fn", 10, {})]
+    first = render_frames(snapshot)[0]
+
+    calls = []
+    original = linecache.getlines
+    monkeypatch.setattr(linecache, "getlines", lambda *a: calls.append(a) or original(*a))
+    second = render_frames(snapshot)[0]
+
+    assert calls == []
+    assert second["context_line"] == "line 10"
+    assert second["pre_context"] == [f"line {i}" for i in range(5, 10)]
+    assert second["post_context"] == [f"line {i}" for i in range(11, 16)]
+    assert second == first
+    assert second["pre_context"] is not first["pre_context"]
+
+
+def test_context_cache_rebuilt_when_linecache_reloads(tmp_path):
+    filename = _write_source(tmp_path, ["old"] * 3)
+    assert render_frames([(filename, "fn", 2, {})])[0]["context_line"] == "old"
+
+    _write_source(tmp_path, ["new"] * 3)
+    os.utime(filename, (0, 12345))
+    linecache.checkcache(filename)
+    assert render_frames([(filename, "fn", 2, {})])[0]["context_line"] == "new"
+
+
+def test_library_context_can_be_skipped():
+    library = "/venv/lib/python3.12/site-packages/lib/mod.py"
+    snapshot = [(library, "fn", 1, {}), (__file__, "test", 1, {})]
+    frames = render_frames(snapshot, policy=FramePolicy(library_context=False))
+
+    assert (frames[0]["context_line"], frames[0]["pre_context"]) == ("", [])
+    assert frames[1]["context_line"] == "import linecache"
+
+
+# --- frame policies ---
+
+_LIB = "/venv/lib/python3.12/site-packages/lib/mod.py"
+
+
+def _recurse(n):
+    local = n  # noqa: F841 - captured local
+    if n == 0:
+        raise ValueError("deep")
+    _recurse(n - 1)
+
+
+def _deep_exception(depth):
+    try:
+        _recurse(depth)
+    except ValueError as exc:
+        return exc
+
+
+def test_policy_detail_per_kind_of_frame():
+    snapshot = [(_LIB, "lib", 1, {"a": 1}), (__file__, "app", 1, {"b": 2})]
+    frames = render_frames(snapshot, policy=FramePolicy(in_app="no_vars", library="bare"))
+
+    assert (frames[0]["vars"], frames[0]["context_line"], frames[0]["pre_context"]) == ({}, "", [])
+    assert frames[1]["vars"] == {}
+    assert frames[1]["context_line"] == "import linecache"
+
+
+def test_policy_rejects_unknown_detail():
+    with pytest.raises(ValueError, match="library_frames"):
+        FramePolicy(library="some")
+
+
+def test_max_frames_with_locals_keeps_innermost():
+    policy = FramePolicy(max_frames_with_locals=2)
+    frames = extract_frames(_deep_exception(5), policy=policy)
+
+    assert [bool(f["vars"]) for f in frames] == [False] * 5 + [True] * 2
+    assert frames[-1]["vars"]["local"] == "0"
+
+
+def test_max_frames_keeps_head_and_tail():
+    frames = extract_frames(_deep_exception(20), policy=FramePolicy(max_frames=5))
+
+    assert len(frames) == 5
+    assert frames[0]["function"] == "_deep_exception"
+    assert [f["vars"]["local"] for f in frames[1:]] == ["20", "2", "1", "0"]
+
+
+def test_snapshot_skips_locals_the_policy_drops():
+    policy = FramePolicy(in_app="bare")
+    snapshot = snapshot_frames(_deep_exception(3), policy)
+    assert [f[3] for f in snapshot] == [None] * 5
+
+
 # --- extract_exception_chain ---
 
 
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from booboo._async_transport import StreamsTransport
+from booboo._transport import RequestsTransport, Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.received.append((self.client_address, dict(self.headers), body))
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _NoContentHandler(_Handler):
+    """Answers 100 Continue, then 204 with no Content-Length."""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.received.append((self.client_address, dict(self.headers), body))
+        self.send_response_only(100)
+        self.end_headers()
+        self.send_response(204)
+        self.end_headers()
+
+
+def _serve(handler):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    srv.received = []
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def server():
+    yield from _serve(_Handler)
+
+
+@pytest.fixture
+def no_content_server():
+    yield from _serve(_NoContentHandler)
+
+
+def _url(srv):
+    return f"http://127.0.0.1:{srv.server_address[1]}/"
+
+
+def test_base_transport_send_not_implemented():
+    with pytest.raises(NotImplementedError):
+        Transport().send("http://example.com/", b"{}", {})
+
+
+def test_requests_transport_posts_body_and_headers(server):
+    transport = RequestsTransport()
+    resp = transport.send(_url(server), b'{"a": 1}', {"X-Booboo-DSN": "tok"})
+    transport.close()
+
+    assert resp.status_code == 202
+    assert len(server.received) == 1
+    _, headers, body = server.received[0]
+    assert body == b'{"a": 1}'
+    assert headers["X-Booboo-DSN"] == "tok"
+
+
+def test_requests_transport_reuses_connection(server):
+    transport = RequestsTransport(pool_size=1)
+    for _ in range(5):
+        transport.send(_url(server), b"{}", {})
+    transport.close()
+
+    client_addresses = {addr for addr, _, _ in server.received}
+    assert len(server.received) == 5
+    assert len(client_addresses) == 1
+
+
+def test_streams_transport_posts_body_and_headers(server):
+    transport = StreamsTransport()
+
+    async def send():
+        resp = await transport.send(_url(server), b'{"a": 1}', {"X-Booboo-DSN": "tok"})
+        await transport.close()
+        return resp
+
+    resp = asyncio.run(send())
+
+    assert resp.status_code == 202
+    _, headers, body = server.received[0]
+    assert body == b'{"a": 1}'
+    assert headers["X-Booboo-DSN"] == "tok"
+
+
+def test_streams_transport_reuses_connection(server):
+    transport = StreamsTransport(pool_size=1)
+
+    async def send():
+        for _ in range(5):
+            await transport.send(_url(server), b"{}", {})
+        await transport.close()
+
+    asyncio.run(send())
+
+    client_addresses = {addr for addr, _, _ in server.received}
+    assert len(server.received) == 5
+    assert len(client_addresses) == 1
+
+
+def test_streams_transport_reads_bodyless_responses(no_content_server):
+    transport = StreamsTransport(pool_size=1, timeout=5)
+
+    async def send():
+        statuses = []
+        for _ in range(2):
+            resp = await transport.send(_url(no_content_server), b"{}", {})
+            statuses.append(resp.status_code)
+        await transport.close()
+        return statuses
+
+    start = time.monotonic()
+    assert asyncio.run(send()) == [204, 204]
+    assert time.monotonic() - start < 1
+    assert len({addr for addr, _, _ in no_content_server.received}) == 1
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from booboo._trimmer import CONTEXT_KEEP, FRAMES_KEEP, trim_payload
+
+
+def _frame(i, in_app=True, nvars=5):
+    return {
+        "filename": f"/app/mod{i}.py",
+        "function": f"fn{i}",
+        "lineno": i,
+        "context_line": "x = 1",
+        "pre_context": [f"pre {n}" for n in range(5)],
+        "post_context": [f"post {n}" for n in range(5)],
+        "vars": {f"v{n}": "x" * 100 for n in range(nvars)},
+        "in_app": in_app,
+    }
+
+
+def _payload(frames, chain_len=1):
+    exceptions = [{"type": "ValueError", "value": "boom", "stacktrace": frames, "chain_type": None}]
+    for _ in range(chain_len - 1):
+        exceptions.append(
+            {
+                "type": "KeyError",
+                "value": "inner",
+                "stacktrace": [_frame(99)],
+                "chain_type": "context",
+            }
+        )
+    return {"message": "boom", "stacktrace": frames, "exceptions": exceptions}
+
+
+def _encoded_size(payload):
+    return len(json.dumps(payload))
+
+
+def test_noop_when_not_over_budget():
+    payload = _payload([_frame(1)])
+    before = json.dumps(payload)
+    assert trim_payload(payload, 0) <= 0
+    assert json.dumps(payload) == before
+
+
+def test_library_vars_dropped_first():
+    frames = [_frame(1, in_app=True), _frame(2, in_app=False)]
+    payload = _payload(frames)
+
+    assert trim_payload(payload, 100) <= 0
+    assert frames[1]["vars"] == {}
+    assert frames[0]["vars"] != {}
+    assert len(frames[0]["pre_context"]) == 5
+
+
+def test_context_shortened_after_vars():
+    frames = [_frame(1, in_app=False, nvars=0), _frame(2, in_app=True, nvars=0)]
+    payload = _payload(frames)
+
+    assert trim_payload(payload, 50) <= 0
+    assert len(frames[0]["pre_context"]) == CONTEXT_KEEP
+    assert len(frames[0]["post_context"]) == CONTEXT_KEEP
+    assert frames[0]["pre_context"] == ["pre 4"]
+    assert frames[0]["post_context"] == ["post 0"]
+
+
+def test_deep_stack_middle_collapsed():
+    frames = [_frame(i, nvars=0) for i in range(100)]
+    payload = _payload(frames)
+
+    trim_payload(payload, 30_000)
+    assert len(frames) == 2 * FRAMES_KEEP
+    assert frames[0]["function"] == "fn0"
+    assert frames[-1]["function"] == "fn99"
+
+
+def test_chain_trimmed_from_innermost():
+    payload = _payload([_frame(1, nvars=0)], chain_len=5)
+    payload["exceptions"][1]["value"] = "keep me"
+
+    trim_payload(payload, _encoded_size(payload["exceptions"][2:]))
+    values = [entry["value"] for entry in payload["exceptions"]]
+    assert values[:2] == ["boom", "keep me"]
+    assert len(values) < 5
+
+
+def test_in_app_vars_dropped_last():
+    frames = [_frame(1, in_app=True)]
+    payload = _payload(frames)
+    trim_payload(payload, _encoded_size(payload) - 300)
+    assert frames[0]["vars"] == {}
+
+
+def test_estimate_matches_actual_savings():
+    frames = [_frame(i, in_app=i % 2 == 0) for i in range(40)]
+    payload = _payload(frames, chain_len=3)
+    before = _encoded_size(payload)
+    excess = before // 2
+
+    remaining = trim_payload(payload, excess)
+    assert remaining <= 0
+    assert _encoded_size(payload) <= before - excess
+
+
+def test_shared_stacktrace_savings_counted_twice():
+    # The top-level stacktrace and chain entry 0 may be the same list object
+    frames = [_frame(1, in_app=False)]
+    payload = _payload(frames)
+    vars_size = _encoded_size(frames[0]["vars"]) - 2
+    before = _encoded_size(payload)
+
+    trim_payload(payload, 1)
+    assert _encoded_size(payload) == before - 2 * vars_size
+
+
+def test_returns_positive_when_cannot_fit():
+    payload = {"message": "x" * 1000, "stacktrace": [], "exceptions": []}
+    assert trim_payload(payload, 500) > 0
+
+
+def test_sizes_measured_with_given_serializer():
+    orjson = pytest.importorskip("orjson")
+    frames = [dict(_frame(i, in_app=False), vars={"v": "é" * 1000}) for i in range(10)]
+    payload = _payload(frames)
+    before = len(orjson.dumps(payload))
+    excess = before // 2
+
+    assert trim_payload(payload, excess, orjson.dumps) <= 0
+    assert len(orjson.dumps(payload)) <= before - excess